@@ -0,0 +1,36 @@
+from geometria import COLUMNAS, MASCARA_COLUMNA, columna_de, celdas_ganadoras, jugadas_posibles
+
+
+def jugadas_tacticas(propias, rivales):
+    """
+    Clasifica las jugadas posibles de quien mueve (fichas propias) a partir
+    de las celdas ganadoras de cada jugador. Devuelve dos bitboards con las
+    celdas jugables (ganadoras, candidatas):
+    - ganadoras: completan un 4 en línea en esta jugada.
+    - candidatas: las que vale la pena explorar. Si el rival amenaza ganar
+      en su próxima jugada solo sirven los bloqueos, y nunca se juega justo
+      debajo de una celda ganadora del rival (salvo que no quede otra).
+    """
+    mascara = propias | rivales
+    posibles = jugadas_posibles(mascara)
+    ganadoras = celdas_ganadoras(propias, mascara) & posibles
+    if ganadoras:
+        return ganadoras, ganadoras
+
+    amenazas = celdas_ganadoras(rivales, mascara)
+    forzadas = posibles & amenazas
+    if forzadas:
+        # Con dos amenazas la partida está perdida: basta explorar un bloqueo
+        return 0, forzadas & -forzadas
+    candidatas = posibles & ~(amenazas >> 1)
+    return 0, candidatas or posibles
+
+
+def columnas(jugadas):
+    """Columnas de las celdas de un bitboard de jugadas (a lo más una por columna)."""
+    return [col for col in range(COLUMNAS) if jugadas & MASCARA_COLUMNA[col]]
+
+
+def primera_columna(jugadas):
+    """Columna de la celda más baja del bitboard (la de menor índice de columna)."""
+    return columna_de(jugadas & -jugadas)
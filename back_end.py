@@ -1,22 +1,176 @@
 import numpy as np 
 import random
 import math
-import copy
 import time
+import threading
+from transposicion import TablaTransposicion, TablaTransposicionPersistente, BYTES_TT_POR_DEFECTO, EXACTA, INFERIOR, SUPERIOR, \
+    PUNTAJE_VICTORIA
+from ordenamiento import OrdenadorJugadas
+from geometria import FILAS, COLUMNAS, VACIO, ALTO, FONDO, MASCARA_TABLERO, bit_celda, hay_cuatro_en_linea
+from evaluador import ConteoVentanas, evaluar_grid, evaluar_bitboard
+from libro_aperturas import LibroAperturas
+from amenazas import jugadas_tacticas, columnas, primera_columna
+from estadisticas import EstadisticasBusqueda
+from reportes import REPORTERO_CONSOLA
+from mcts import ArbolMCTS, ITERACIONES_POR_DEFECTO
 
-FILAS = 6
-COLUMNAS = 7
 JUGADOR_HUMANO = "H"
 JUGADOR_IA = "AI"
 JUGADOR_RANDOM = "R" 
-VACIO = " "
+JUGADOR_SOLVER = "S" # Juego perfecto con el solucionador exacto (solver.py)
+JUGADOR_MCTS = "M" # Búsqueda Monte Carlo en árbol (mcts.py)
+
+# Cada cuánto buscar_mcts informa el progreso (cada lote de hojas dura unos pocos ms)
+INTERVALO_PROGRESO_MCTS_MS = 100
+
+# Modos de búsqueda paralela (con trabajadores > 1)
+PARALELO_RAIZ = "raiz" # Se reparten las jugadas de la raíz
+PARALELO_SMP = "smp" # Lazy SMP: todos buscan la misma posición con una TT compartida
+
+# Motores de tablero disponibles
+MOTOR_ARREGLO = "arreglo"
+MOTOR_BITBOARD = "bitboard"
+MOTORES = (MOTOR_ARREGLO, MOTOR_BITBOARD)
+
+# Codificación de las celdas de Tablero: un byte por celda (0 vacía, 1 X, 2 O)
+FICHA_DE_CODIGO = (VACIO, "X", "O")
+CODIGO_DE_FICHA = {ficha: codigo for codigo, ficha in enumerate(FICHA_DE_CODIGO)}
+_GRILLA_DE_CODIGO = np.array(FICHA_DE_CODIGO)
+# Bit de los bitboards que corresponde a cada índice de celdas (fila * COLUMNAS + col)
+_BIT_DE_INDICE = tuple(bit_celda(*divmod(i, COLUMNAS)) for i in range(FILAS * COLUMNAS))
+
+
+# --- Claves Zobrist ---
+# Semilla fija: la misma posición tiene la misma clave en todos los procesos.
+_rng_zobrist = random.Random(4203)
+ZOBRIST = {
+    ficha: [[_rng_zobrist.getrandbits(64) for _ in range(COLUMNAS)] for _ in range(FILAS)]
+    for ficha in ("X", "O")
+}
+# Se combina con la clave del tablero para distinguir quién busca y quién mueve
+ZOBRIST_BUSQUEDA = {
+    (ficha, maximizando): _rng_zobrist.getrandbits(64)
+    for ficha in ("X", "O") for maximizando in (True, False)
+}
+
+
+class TiempoAgotado(Exception):
+    """Se lanza dentro de minimax cuando se acaba el tiempo de la jugada."""
+
+
+class ResultadoBusqueda:
+    """Resultado de una búsqueda con profundización iterativa."""
+    def __init__(self, columna, puntaje, profundidad, nodos, tiempo_ms, variacion, estadisticas=None, exacto=False):
+        self.columna = columna
+        self.puntaje = puntaje
+        self.profundidad = profundidad # Última profundidad completada
+        self.nodos = nodos
+        self.tiempo_ms = tiempo_ms
+        self.variacion = variacion # Variación principal (lista de columnas)
+        self.estadisticas = estadisticas # EstadisticasBusqueda (solo si el jugador instrumenta)
+        self.exacto = exacto # El puntaje es el valor exacto del solver, no una estimación heurística
 
 
 class Jugador:
-    """Representa a un jugador (humano o agente)."""
-    def __init__(self, tipo_jugador, ficha):
+    """
+    Representa a un jugador (humano o agente). Con __slots__: una partida
+    viva son dos jugadores y un tablero, y se mantienen miles a la vez.
+    Las tablas de búsqueda (TT, ordenador) solo existen en la IA y el solver.
+    """
+    __slots__ = (
+        # Configuración
+        "tipo_jugador", "ficha", "reportero", "profundidad", "tiempo_ms", "analisis_amenazas", "trabajadores",
+        "modo_paralelo", "libro", "ponderacion", "iteraciones_mcts", "instrumentar", "reportar_estadisticas",
+        "compartido",
+        # Tablas y motores de búsqueda
+        "tt", "ordenador", "_solucionador", "_mcts", "_paralelo",
+        # Estado de la búsqueda en curso y entre jugadas
+        "nodos", "ultima_busqueda", "_limite", "_detener", "_estadisticas", "_prevision",
+        "_hilo_ponderacion", "_detener_ponderacion", "_respuestas",
+    )
+
+    def __init__(self, tipo_jugador, ficha, bytes_tt=BYTES_TT_POR_DEFECTO, profundidad=4, tiempo_ms=None,
+                 ordenador=None, trabajadores=1, modo_paralelo=PARALELO_RAIZ, libro=None, analisis_amenazas=True,
+                 ponderacion=False, cache_tt=None, instrumentar=False, reportar_estadisticas=None, reportero=None,
+                 iteraciones_mcts=ITERACIONES_POR_DEFECTO, compartido=False):
         self.tipo_jugador = tipo_jugador 
         self.ficha = ficha 
+        # Destino de los mensajes de cada jugada (REPORTERO_NULO en simulaciones sin consola)
+        self.reportero = reportero if reportero is not None else REPORTERO_CONSOLA
+        self.profundidad = profundidad # Profundidad fija cuando no hay presupuesto de tiempo
+        self.tiempo_ms = tiempo_ms # Presupuesto por jugada (None = profundidad fija)
+        self.nodos = 0 # Nodos visitados por minimax (acumulado)
+        self.ultima_busqueda = None
+        self._limite = None # Instante (perf_counter) en que se corta la búsqueda
+        self._detener = None # Evento (threading o multiprocessing) que corta la búsqueda
+        # Tabla de transposición de memoria acotada (solo la usan la IA y el solver),
+        # opcionalmente respaldada por un caché en disco (ruta cache_tt). El
+        # solver la comparte con su búsqueda heurística de respaldo
+        self.tt = None
+        if tipo_jugador in (JUGADOR_IA, JUGADOR_SOLVER):
+            self.tt = TablaTransposicion(bytes_tt) if cache_tt is None else TablaTransposicionPersistente(cache_tt, bytes_tt)
+        self._solucionador = None
+        # MCTS: hojas por jugada sin presupuesto de tiempo; el árbol se crea en la
+        # primera búsqueda y se reutiliza entre jugadas
+        self.iteraciones_mcts = iteraciones_mcts
+        self._mcts = None
+        # Ordenamiento de jugadas de minimax (intercambiable)
+        self.ordenador = ordenador
+        if ordenador is None and tipo_jugador in (JUGADOR_IA, JUGADOR_SOLVER):
+            self.ordenador = OrdenadorJugadas(COLUMNAS)
+        # Poda táctica con las celdas ganadoras de cada jugador
+        self.analisis_amenazas = analisis_amenazas
+        # Con más de un trabajador la IA reparte la raíz entre procesos
+        self.trabajadores = trabajadores
+        self.modo_paralelo = modo_paralelo
+        self._paralelo = None
+        # Libro de aperturas opcional (LibroAperturas o ruta al archivo)
+        self.libro = LibroAperturas(libro) if isinstance(libro, str) else libro
+        # Ponderación: buscar en el turno del rival (ver ponderar)
+        self.ponderacion = ponderacion
+        self._hilo_ponderacion = None
+        self._detener_ponderacion = None
+        self._respuestas = {} # Clave Zobrist -> ResultadoBusqueda de las respuestas ponderadas
+        # Arranque en caliente: (clave Zobrist esperada en la próxima jugada según la
+        # variación principal, profundidad alcanzada) de la última búsqueda
+        self._prevision = None
+        # Instrumentación de buscar: reportar_estadisticas recibe las
+        # EstadisticasBusqueda de cada búsqueda terminada (y la activa)
+        self.instrumentar = instrumentar or reportar_estadisticas is not None
+        self.reportar_estadisticas = reportar_estadisticas
+        self._estadisticas = None # Las de la búsqueda en curso (None = sin instrumentar)
+        # Jugador que atiende varias partidas intercaladas (servidor): la TT no se
+        # poda entre jugadas, porque guarda posiciones de otras partidas, y el árbol
+        # de MCTS empieza de cero en cada jugada
+        self.compartido = compartido
+
+    def nueva_partida(self):
+        """Descarta lo aprendido en la partida anterior."""
+        self.detener_ponderacion()
+        self._respuestas = {}
+        self._prevision = None
+        if isinstance(self.tt, TablaTransposicionPersistente):
+            self.tt.volcar() # Lo de la partida anterior queda en el caché en disco
+        if self.tt is not None and self.tipo_jugador != JUGADOR_SOLVER:
+            self.tt.limpiar() # Los valores exactos del solver sirven en cualquier partida
+        if self._mcts is not None:
+            self._mcts.limpiar()
+
+    def cerrar(self):
+        """
+        Libera los procesos de la búsqueda paralela, si se crearon, y vuelca
+        lo aprendido al caché en disco, si lo hay, antes de soltar su mapeo.
+        """
+        self.detener_ponderacion()
+        if isinstance(self.tt, TablaTransposicionPersistente):
+            self.tt.volcar()
+            self.tt.cerrar()
+        if self._paralelo is not None:
+            if self.modo_paralelo == PARALELO_SMP:
+                # La TT compartida deja de existir: volvemos a una local
+                self.tt = TablaTransposicion(self.tt.bytes_usados)
+            self._paralelo.cerrar()
+            self._paralelo = None
 
     def evaluar_ventana(self, ventana, ficha):
         """Asigna un puntaje a una ventana de 4 celdas"""
@@ -35,7 +189,18 @@ class Jugador:
         return score
 
     def evaluar_posicion(self, tablero, ficha):
-        """Calcula el puntaje total del tablero actual."""
+        """
+        Calcula el puntaje total del tablero actual. Usa los conteos incrementales
+        del tablero si están activos y si no, una pasada sobre las 69 ventanas.
+        """
+        if tablero.conteo is not None:
+            return tablero.conteo.evaluar(ficha, self.ficha)
+        if tablero.motor == MOTOR_BITBOARD:
+            return evaluar_bitboard(tablero.bits, ficha, self.ficha)
+        return evaluar_grid(tablero.grid, ficha, self.ficha)
+
+    def evaluar_posicion_referencia(self, tablero, ficha):
+        """Implementación original con listas, celda por celda (referencia para verificar paridad)."""
         score = 0
         grid = tablero.grid
         
@@ -63,53 +228,125 @@ class Jugador:
         return score
     
     def es_nodo_terminal(self, tablero):
-        """ Revisa si alguien ganó o si el tablero está lleno
+        """ Revisa si alguien ganó o si el tablero está lleno (O(1), el tablero
+        mantiene el resultado de la partida en cada jugada)
         """
-        return tablero.detectar_victoria("X", 0, 0) or \
-               tablero.detectar_victoria("O", 0, 0) or \
-               len(tablero.obtener_columnas_validas()) == 0
+        return tablero.ganador is not None or tablero.movimientos == FILAS * COLUMNAS
 
-    def minimax(self, tablero, profundidad, alpha, beta, maximizando):
-        estado_hash = (str(tablero.grid), maximizando)
-        
-        if hasattr(self, 'memo') and estado_hash in self.memo:
-            return self.memo[estado_hash]
+    def guardar_en_tt(self, clave, profundidad, valor, columna, alpha, beta, fichas=0):
+        """
+        Guarda un resultado indicando si es exacto o una cota de la ventana (alpha, beta).
+        fichas: las del tablero de la posición (la TT poda las que ya no pueden repetirse).
+        """
+        if valor <= alpha:
+            bandera = SUPERIOR
+        elif valor >= beta:
+            bandera = INFERIOR
+        else:
+            bandera = EXACTA
+        self.tt.guardar(clave, profundidad, valor, bandera, columna, fichas)
+        if self._estadisticas is not None:
+            self._estadisticas.tt_guardados += 1
+
+    def minimax(self, tablero, profundidad, alpha, beta, maximizando, ply=0):
+        """
+        Minimax con poda alpha-beta. Trabaja sobre un único tablero:
+        cada jugada se simula con insertar_ficha y se revierte con deshacer_ficha.
+        ply: distancia a la raíz (la usan las jugadas killer).
+        """
+        self.nodos += 1
+        if not self.nodos & 255 and (self._limite is not None or self._detener is not None) \
+                and self._debe_detenerse():
+            raise TiempoAgotado()
+        clave = tablero.hash ^ ZOBRIST_BUSQUEDA[(self.ficha, maximizando)]
+        alpha_original, beta_original = alpha, beta
+        jugada_tt = None
+        estadisticas = self._estadisticas
+        if estadisticas is not None:
+            estadisticas.tt_consultas += 1
+
+        # Solo se reutilizan resultados de búsquedas al menos igual de profundas,
+        # respetando si el valor guardado es exacto o solo una cota.
+        entrada = self.tt.buscar(clave)
+        if entrada is not None:
+            profundidad_tt, valor_tt, bandera_tt, jugada_tt = entrada
+            if estadisticas is not None:
+                estadisticas.tt_aciertos += 1
+            if profundidad_tt >= profundidad:
+                if bandera_tt == EXACTA:
+                    if estadisticas is not None:
+                        estadisticas.tt_cortes += 1
+                    return jugada_tt, valor_tt
+                elif bandera_tt == INFERIOR:
+                    alpha = max(alpha, valor_tt)
+                else:
+                    beta = min(beta, valor_tt)
+                if alpha >= beta:
+                    if estadisticas is not None:
+                        estadisticas.tt_cortes += 1
+                    return jugada_tt, valor_tt
 
-        valid_locations = tablero.obtener_columnas_validas()
         es_terminal = self.es_nodo_terminal(tablero) 
 
         if profundidad == 0 or es_terminal:
+            if estadisticas is not None:
+                return self._hoja_instrumentada(tablero, profundidad, es_terminal, estadisticas)
             if es_terminal:
-                if tablero.detectar_victoria(self.ficha, 0, 0): # IA Gana
+                if tablero.ganador == self.ficha: # IA Gana
                     # PREMIO POR GANAR RÁPIDO: Sumamos la profundidad restante
-                    return (None, 100000000000000 + profundidad) 
+                    return (None, PUNTAJE_VICTORIA + profundidad) 
                 
-                elif tablero.detectar_victoria("O" if self.ficha=="X" else "X", 0, 0): # IA Pierde
+                elif tablero.ganador is not None: # IA Pierde
                     # CASTIGO POR PERDER: Restamos profundidad para intentar "alargar" la derrota
                     # (Preferimos perder en 5 turnos que en 1)
-                    return (None, -100000000000000 - profundidad) 
+                    return (None, -PUNTAJE_VICTORIA - profundidad) 
                 else: # Empate
                     return (None, 0)
             else: # Profundidad 0
                 return (None, self.evaluar_posicion(tablero, self.ficha))
 
         # 3. Parte Recursiva
+        # Primero la mejor jugada de la TT (variación principal), luego killers e historia
+        if estadisticas is not None:
+            inicio_generacion = time.perf_counter_ns()
+        ficha_turno = self.ficha if maximizando else ("O" if self.ficha == "X" else "X")
+        validas = tablero.obtener_columnas_validas()
+        if self.analisis_amenazas:
+            # Una victoria inmediata corta el nodo; si el rival amenaza ganar solo
+            # se exploran los bloqueos, y nunca se juega debajo de su celda ganadora.
+            # El motor de arreglo arma los bitboards en el momento
+            rival = "O" if ficha_turno == "X" else "X"
+            bits = tablero.bits if tablero.motor == MOTOR_BITBOARD else tablero.bitboards()
+            ganadoras, candidatas = jugadas_tacticas(bits[ficha_turno], bits[rival])
+            if ganadoras:
+                column = primera_columna(ganadoras)
+                value = PUNTAJE_VICTORIA + profundidad if maximizando else -PUNTAJE_VICTORIA - profundidad
+                self.guardar_en_tt(clave, profundidad, value, column, alpha_original, beta_original, tablero.movimientos)
+                if estadisticas is not None:
+                    estadisticas.terminales += 1
+                    estadisticas.tiempo_generacion_ns += time.perf_counter_ns() - inicio_generacion
+                return column, value
+            validas = columnas(candidatas)
+        valid_locations = self.ordenador.ordenar(validas, ply, ficha_turno, jugada_tt)
+        column = valid_locations[0]
+        if estadisticas is not None:
+            estadisticas.tiempo_generacion_ns += time.perf_counter_ns() - inicio_generacion
+
         if maximizando:
             value = -math.inf
-            column = random.choice(valid_locations)
-            for col in valid_locations:
-                # Simular jugada
-                temp_tablero = copy.deepcopy(tablero)
-                fila = temp_tablero.insertar_ficha(col, self.ficha)
+            for indice, col in enumerate(valid_locations):
+                # Simular jugada (se deshace antes de pasar a la siguiente)
+                fila = tablero.insertar_ficha(col, self.ficha)
                 
                 # Verificar victoria in-situ para el caso base correcto arriba
-                if temp_tablero.detectar_victoria(self.ficha, fila, col):
+                if tablero.ganador == self.ficha:
                     # AQUÍ TAMBIÉN: Sumar profundidad
                     # Nota: Aquí la profundidad es la actual, no profundidad-1
-                    score = 100000000000000 + profundidad 
+                    score = PUNTAJE_VICTORIA + profundidad 
                 else:
-                    new_score = self.minimax(temp_tablero, profundidad-1, alpha, beta, False)[1]
+                    new_score = self.minimax(tablero, profundidad-1, alpha, beta, False, ply+1)[1]
                     score = new_score
+                tablero.deshacer_ficha(col)
 
                 if score > value:
                     value = score
@@ -117,27 +354,27 @@ class Jugador:
                 
                 alpha = max(alpha, value)
                 if alpha >= beta:
+                    self.ordenador.registrar_corte(col, indice, ply, ficha_turno, profundidad)
+                    if estadisticas is not None:
+                        estadisticas.cortes_por_ply[ply] += 1
                     break
             
-            # Guardar en Memo
-            if not hasattr(self, 'memo'): self.memo = {}
-            self.memo[estado_hash] = (column, value)
+            # Guardar en la tabla de transposición
+            self.guardar_en_tt(clave, profundidad, value, column, alpha_original, beta_original, tablero.movimientos)
             return column, value
 
         else: # Minimizando (Turno del oponente)
             value = math.inf
-            column = random.choice(valid_locations)
-            oponente = "O" if self.ficha == "X" else "X"
             
-            for col in valid_locations:
-                temp_tablero = copy.deepcopy(tablero)
-                fila = temp_tablero.insertar_ficha(col, oponente)
+            for indice, col in enumerate(valid_locations):
+                fila = tablero.insertar_ficha(col, ficha_turno)
 
-                if temp_tablero.detectar_victoria(oponente, fila, col):
-                    score = -100000000000000 - profundidad
+                if tablero.ganador == ficha_turno:
+                    score = -PUNTAJE_VICTORIA - profundidad
                 else:
-                    new_score = self.minimax(temp_tablero, profundidad-1, alpha, beta, True)[1]
+                    new_score = self.minimax(tablero, profundidad-1, alpha, beta, True, ply+1)[1]
                     score = new_score
+                tablero.deshacer_ficha(col)
 
                 if score < value:
                     value = score
@@ -145,15 +382,292 @@ class Jugador:
                 
                 beta = min(beta, value)
                 if alpha >= beta:
+                    self.ordenador.registrar_corte(col, indice, ply, ficha_turno, profundidad)
+                    if estadisticas is not None:
+                        estadisticas.cortes_por_ply[ply] += 1
                     break
             
-            if not hasattr(self, 'memo'): self.memo = {}
-            self.memo[estado_hash] = (column, value)
+            self.guardar_en_tt(clave, profundidad, value, column, alpha_original, beta_original, tablero.movimientos)
             return column, value
 
-    def elegir_columna(self, tablero):
+    def _hoja_instrumentada(self, tablero, profundidad, es_terminal, estadisticas):
+        """Caso base de minimax cuando se instrumenta: el mismo valor, contando hojas y tiempo de evaluación."""
+        if es_terminal:
+            estadisticas.terminales += 1
+            if tablero.ganador == self.ficha:
+                return (None, PUNTAJE_VICTORIA + profundidad)
+            elif tablero.ganador is not None:
+                return (None, -PUNTAJE_VICTORIA - profundidad)
+            return (None, 0)
+        estadisticas.hojas += 1
+        inicio = time.perf_counter_ns()
+        valor = self.evaluar_posicion(tablero, self.ficha)
+        estadisticas.tiempo_evaluacion_ns += time.perf_counter_ns() - inicio
+        return (None, valor)
+
+    def _debe_detenerse(self):
+        return (self._limite is not None and time.perf_counter() > self._limite) or \
+               (self._detener is not None and self._detener.is_set())
+
+    def variacion_principal(self, tablero, largo):
+        """Reconstruye la variación principal siguiendo las mejores jugadas de la TT."""
+        variacion = []
+        maximizando = True
+        oponente = "O" if self.ficha == "X" else "X"
+        for _ in range(largo):
+            entrada = self.tt.buscar(tablero.hash ^ ZOBRIST_BUSQUEDA[(self.ficha, maximizando)])
+            if entrada is None or entrada[3] is None or not tablero.es_columna_valida(entrada[3]):
+                break
+            col = entrada[3]
+            tablero.insertar_ficha(col, self.ficha if maximizando else oponente)
+            variacion.append(col)
+            if self.es_nodo_terminal(tablero):
+                break
+            maximizando = not maximizando
+        for col in reversed(variacion):
+            tablero.deshacer_ficha(col)
+        return variacion
+
+    def buscar(self, tablero, tiempo_ms=None, profundidad_max=None, detener=None, profundidad_inicial=1,
+               progreso=None):
+        """
+        Profundización iterativa: busca a profundidad_inicial, +1, ... hasta
+        profundidad_max, hasta que se acabe tiempo_ms o se active el evento
+        detener. Devuelve el resultado de la última profundidad completada
+        (ResultadoBusqueda). Si se da progreso, se llama con el resultado
+        parcial al completar cada profundidad. Con self.instrumentar el
+        resultado trae sus EstadisticasBusqueda, que también se pasan a
+        self.reportar_estadisticas.
+
+        Si la partida siguió la variación principal de la búsqueda anterior
+        (la jugada propia y la respuesta prevista), se arranca en caliente:
+        las killers se corren dos plies y, a profundidad fija, se empieza
+        dos niveles por debajo de la profundidad anterior, donde la TT ya
+        tiene la línea.
+        """
+        casillas_vacias = FILAS * COLUMNAS - tablero.movimientos
+        if profundidad_max is None:
+            profundidad_max = self.profundidad if tiempo_ms is None else casillas_vacias
+        profundidad_max = max(1, min(profundidad_max, casillas_vacias))
+
+        # Se busca sobre una copia: si se corta por tiempo, la copia queda a medio simular
+        copia = tablero.copiar()
+        copia.activar_conteo()
+        caliente = self._prevision is not None and self._prevision[0] == tablero.hash
+        self.ordenador.nueva_busqueda(2 if caliente else 0)
+        if caliente and tiempo_ms is None:
+            profundidad_inicial = max(profundidad_inicial, self._prevision[1] - 2)
+        inicio = time.perf_counter()
+        nodos_inicio = self.nodos
+        columna, puntaje, profundidad_completa = None, None, 0
+        estadisticas = EstadisticasBusqueda() if self.instrumentar else None
+        self._estadisticas = estadisticas
+        # El evento rige desde el primer nodo; el plazo, recién cuando termina la primera iteración
+        self._detener = detener
+
+        try:
+            for profundidad in range(min(profundidad_inicial, profundidad_max), profundidad_max + 1):
+                columna, puntaje = self.minimax(copia, profundidad, -math.inf, math.inf, True)
+                profundidad_completa = profundidad
+                if tiempo_ms is not None and self._limite is None:
+                    self._limite = inicio + tiempo_ms / 1000
+                if estadisticas is not None:
+                    estadisticas.nodos = self.nodos - nodos_inicio
+                    estadisticas.profundidad = profundidad
+                if progreso is not None:
+                    progreso(ResultadoBusqueda(columna, puntaje, profundidad, self.nodos - nodos_inicio,
+                                               (time.perf_counter() - inicio) * 1000,
+                                               self.variacion_principal(copia, profundidad), estadisticas))
+                # Victoria o derrota forzada: buscar más profundo no cambia la decisión
+                if abs(puntaje) >= PUNTAJE_VICTORIA or self._debe_detenerse():
+                    break
+        except TiempoAgotado:
+            pass
+        finally:
+            self._limite = None
+            self._detener = None
+            self._estadisticas = None
+        if columna is None:
+            # Cancelada antes de completar una profundidad: la jugada del libro o la primera del orden
+            columna = self._jugada_de_respaldo(tablero)
+
+        resultado = ResultadoBusqueda(
+            columna, puntaje, profundidad_completa, self.nodos - nodos_inicio,
+            (time.perf_counter() - inicio) * 1000,
+            self.variacion_principal(tablero, profundidad_completa) if profundidad_completa else [],
+            estadisticas,
+        )
+        self._prevision = self._prever(tablero, resultado)
+        if estadisticas is not None:
+            estadisticas.nodos = resultado.nodos
+            estadisticas.profundidad = resultado.profundidad
+            estadisticas.tiempo_ms = resultado.tiempo_ms
+            estadisticas.variacion = resultado.variacion
+            if self.reportar_estadisticas is not None:
+                self.reportar_estadisticas(estadisticas)
+        return resultado
+
+    def _jugada_de_respaldo(self, tablero):
+        """Jugada sin buscar: la del libro si la hay, si no la que el ordenamiento pone primero."""
+        if self.libro is not None:
+            jugada_libro = self.libro.buscar(tablero, self.ficha)
+            if jugada_libro is not None:
+                return jugada_libro[0]
+        entrada = self.tt.buscar(tablero.hash ^ ZOBRIST_BUSQUEDA[(self.ficha, True)])
+        jugada_tt = entrada[3] if entrada is not None else None
+        return self.ordenador.ordenar(tablero.obtener_columnas_validas(), 0, self.ficha, jugada_tt)[0]
+
+    def _prever(self, tablero, resultado):
+        """(clave Zobrist tras la jugada y la respuesta de la variación principal, profundidad) o None."""
+        if len(resultado.variacion) < 2:
+            return None
+        siguiente = tablero.copiar()
+        siguiente.insertar_ficha(resultado.variacion[0], self.ficha)
+        siguiente.insertar_ficha(resultado.variacion[1], "O" if self.ficha == "X" else "X")
+        return siguiente.hash, resultado.profundidad
+
+    def buscar_paralelo(self, tablero, tiempo_ms=None, detener=None, progreso=None):
+        """Igual que buscar, pero usando self.trabajadores procesos según self.modo_paralelo."""
+        # Import diferido: paralelo importa back_end
+        from paralelo import BusquedaRaizParalela, BusquedaLazySMP, configuracion_de
+        profundidad_max = self.profundidad if tiempo_ms is None else FILAS * COLUMNAS
+        if self.modo_paralelo == PARALELO_SMP:
+            if self._paralelo is None:
+                self._paralelo = BusquedaLazySMP(self.trabajadores, configuracion=configuracion_de(self))
+                self.tt = self._paralelo.tt # La TT propia pasa a ser la compartida
+            return self._paralelo.buscar(self, tablero, tiempo_ms, profundidad_max, detener, progreso)
+        if self._paralelo is None:
+            self._paralelo = BusquedaRaizParalela(self.trabajadores, configuracion=configuracion_de(self))
+        resultado = self._paralelo.buscar(tablero, self.ficha, profundidad_max, tiempo_ms, detener, progreso)
+        if resultado.estadisticas is not None and self.reportar_estadisticas is not None:
+            self.reportar_estadisticas(resultado.estadisticas)
+        return resultado
+
+    def ponderar(self, tablero):
+        """
+        Empieza a buscar en un hilo mientras el rival piensa su jugada: para
+        cada respuesta posible del rival (desde tablero, donde mueve el
+        rival) guarda la mejor contestación, profundizando de a un nivel
+        para todas. Llena la TT, así la búsqueda real parte con la tabla
+        caliente, y si la respuesta ya está a la profundidad pedida se juega
+        al instante. Comparte el GIL: conviene contra un humano, no contra
+        otra IA del mismo proceso.
+        """
+        if self.tipo_jugador != JUGADOR_IA:
+            return
+        self.detener_ponderacion()
+        self._respuestas = {}
+        self._detener_ponderacion = threading.Event()
+        self._hilo_ponderacion = threading.Thread(
+            target=self._ponderar, args=(tablero.copiar(), self._detener_ponderacion), daemon=True)
+        self._hilo_ponderacion.start()
+
+    def detener_ponderacion(self):
+        """Corta la ponderación en curso y espera a que el hilo termine."""
+        if self._hilo_ponderacion is not None:
+            self._detener_ponderacion.set()
+            self._hilo_ponderacion.join()
+            self._hilo_ponderacion = None
+
+    def _ponderar(self, tablero, detener):
+        rival = "O" if self.ficha == "X" else "X"
+        tablero.activar_conteo()
+        respuestas = self.ordenador.ordenar(tablero.obtener_columnas_validas(), 0, rival)
+        self.ordenador.nueva_busqueda()
+        # A diferencia de buscar, el evento rige desde el primer nodo
+        self._detener = detener
+        try:
+            for profundidad in range(1, FILAS * COLUMNAS - tablero.movimientos):
+                for col in respuestas:
+                    tablero.insertar_ficha(col, rival)
+                    if not self.es_nodo_terminal(tablero):
+                        inicio = time.perf_counter()
+                        nodos_inicio = self.nodos
+                        columna, puntaje = self.minimax(tablero, profundidad, -math.inf, math.inf, True)
+                        self._respuestas[tablero.hash] = ResultadoBusqueda(
+                            columna, puntaje, profundidad, self.nodos - nodos_inicio,
+                            (time.perf_counter() - inicio) * 1000, [columna])
+                    tablero.deshacer_ficha(col)
+        except TiempoAgotado:
+            pass # El tablero quedó a medio simular, pero es una copia
+        finally:
+            self._detener = None
+
+    def resolver(self, tablero, tiempo_ms=None, detener=None, progreso=None):
+        """
+        Busca una jugada óptima con el solucionador exacto. Si no termina en
+        tiempo_ms (por defecto TIEMPO_SOLVER_POR_DEFECTO_MS) o se activa
+        detener, recurre a la búsqueda heurística a profundidad self.profundidad.
+        """
+        # Import diferido: solver importa back_end
+        from solver import Solucionador, TIEMPO_SOLVER_POR_DEFECTO_MS, puntaje_minimax
+        if self._solucionador is None:
+            self._solucionador = Solucionador(tt=self.tt)
+        inicio = time.perf_counter()
+        nodos_inicio = self._solucionador.nodos
+        try:
+            columna, puntaje = self._solucionador.mejor_jugada(
+                tablero, self.ficha, tiempo_ms if tiempo_ms is not None else TIEMPO_SOLVER_POR_DEFECTO_MS, detener)
+        except TiempoAgotado:
+            # El resultado queda con exacto=False: el puntaje es heurístico
+            self.reportero.aviso(self, "el solver no resolvió la posición a tiempo, usando búsqueda heurística")
+            return self.buscar(tablero, detener=detener, progreso=progreso)
+        return ResultadoBusqueda(columna, puntaje_minimax(puntaje), FILAS * COLUMNAS - tablero.movimientos,
+                                 self._solucionador.nodos - nodos_inicio,
+                                 (time.perf_counter() - inicio) * 1000, [columna], exacto=True)
+
+    def _preparar_tablas(self, tablero):
+        """
+        Antes de cada jugada real: la TT abre una generación nueva y descarta
+        las posiciones con menos fichas que el tablero (no pueden repetirse).
+        La del solver no se poda (sus valores exactos no caducan) ni la de un
+        jugador compartido (las otras partidas pueden tener menos fichas).
+        """
+        if self.tt is not None:
+            self.tt.nueva_generacion()
+            if self.tipo_jugador != JUGADOR_SOLVER and not self.compartido:
+                self.tt.podar(tablero.movimientos)
+
+    def buscar_mcts(self, tablero, tiempo_ms=None, detener=None, progreso=None):
+        """
+        Busca con MCTS: self.iteraciones_mcts hojas, o hasta tiempo_ms si se
+        da, o hasta que se active detener. El puntaje es el valor medio de
+        la jugada elegida (entre -1 y 1), la profundidad la del camino más
+        largo explorado y los nodos las partidas simuladas.
+        """
+        bits = tablero.bitboards()
+        actual = bits.get(self.ficha, 0)
+        mascara = actual | bits.get("O" if self.ficha == "X" else "X", 0)
+        if self._mcts is None:
+            # La semilla sale de random: con random.seed, MCTS también es reproducible
+            self._mcts = ArbolMCTS(semilla=random.getrandbits(64))
+        elif self.compartido:
+            self._mcts.limpiar()
+        simulaciones_inicio = self._mcts.simulaciones
+        proximo_informe = [INTERVALO_PROGRESO_MCTS_MS / 1000]
+
+        def informar(hojas, segundos):
+            if segundos >= proximo_informe[0]:
+                proximo_informe[0] = segundos + INTERVALO_PROGRESO_MCTS_MS / 1000
+                progreso(self._resultado_mcts(simulaciones_inicio, segundos * 1000))
+
+        inicio = time.perf_counter()
+        self._mcts.buscar(actual, mascara, None if tiempo_ms is not None else self.iteraciones_mcts,
+                          tiempo_ms, detener, informar if progreso is not None else None)
+        return self._resultado_mcts(simulaciones_inicio, (time.perf_counter() - inicio) * 1000)
+
+    def _resultado_mcts(self, simulaciones_inicio, tiempo_ms):
+        columna, valor = self._mcts.mejor_columna()
+        return ResultadoBusqueda(columna, valor, self._mcts.profundidad_maxima,
+                                 self._mcts.simulaciones - simulaciones_inicio, tiempo_ms,
+                                 self._mcts.variacion_principal())
+
+    def elegir_columna(self, tablero, tiempo_ms=None, detener=None, progreso=None):
         """
         El jugador decide en qué columna soltar la ficha.
+        tiempo_ms: presupuesto de la IA para esta jugada (por defecto self.tiempo_ms).
+        detener: evento que corta la búsqueda y juega lo mejor encontrado hasta ahí.
+        progreso: función que recibe el resultado parcial de cada profundidad.
         """
         if self.tipo_jugador == JUGADOR_HUMANO:
             # Lógica para que el jugador humano  elija
@@ -171,32 +685,117 @@ class Jugador:
             # Lógica para el jugador aleatorio 
             # (Esta es tu baseline 1)
             col = random.choice(tablero.obtener_columnas_validas())
-            print(f"Jugador Aleatorio ({self.ficha}) eligió columna {col}")
+            self.reportero.jugada(self, col)
             return col
 
-        elif self.tipo_jugador == JUGADOR_IA:
-            print(f"Agente IA ({self.ficha}) está pensando...")
+        elif self.tipo_jugador in (JUGADOR_IA, JUGADOR_SOLVER, JUGADOR_MCTS):
+            self.reportero.pensando(self)
             
-            profundidad = 4
-            inicio = time.time()
-            columna_elegida, minimax_score = self.minimax(tablero, profundidad, -math.inf, math.inf, True)
+            if tiempo_ms is None:
+                tiempo_ms = self.tiempo_ms
+            inicio = time.perf_counter()
+            self.detener_ponderacion()
+            self._preparar_tablas(tablero)
+            respuesta = self._respuestas.get(tablero.hash)
+            jugada_libro = self.libro.buscar(tablero, self.ficha) if self.libro is not None else None
+            if jugada_libro is not None:
+                col, puntaje = jugada_libro
+                resultado = ResultadoBusqueda(col, puntaje, self.libro.profundidad, 0,
+                                              (time.perf_counter() - inicio) * 1000, [col])
+            elif respuesta is not None and tiempo_ms is None and respuesta.profundidad >= self.profundidad:
+                # Ya se buscó esta posición durante el turno del rival
+                self.reportero.aviso(self, "usa la respuesta ponderada")
+                resultado = ResultadoBusqueda(respuesta.columna, respuesta.puntaje, respuesta.profundidad, 0,
+                                              (time.perf_counter() - inicio) * 1000, respuesta.variacion)
+            elif self.tipo_jugador == JUGADOR_SOLVER:
+                resultado = self.resolver(tablero, tiempo_ms, detener, progreso)
+            elif self.tipo_jugador == JUGADOR_MCTS:
+                resultado = self.buscar_mcts(tablero, tiempo_ms, detener, progreso)
+            elif self.trabajadores > 1:
+                resultado = self.buscar_paralelo(tablero, tiempo_ms, detener, progreso)
+            else:
+                resultado = self.buscar(tablero, tiempo_ms, detener=detener, progreso=progreso)
+            self.ultima_busqueda = resultado
+            columna_elegida = resultado.columna
             if columna_elegida is None:
                 # Fallback por si acaso falla
-                print("Fallback: IA no encontró columna, eligiendo aleatoriamente.")
+                self.reportero.aviso(self, "no encontró columna, eligiendo aleatoriamente")
                 columna_elegida = random.choice(tablero.obtener_columnas_validas())
             
-            fin = time.time() 
-            print(f"IA ({self.ficha})eligió columna {columna_elegida} con puntaje {minimax_score}")
-            print(f'IA se demoró {(fin-inicio)*1000:.3f} ms en calcular su jugada')
+            self.reportero.jugada(self, columna_elegida, resultado)
             return columna_elegida
 
 
 # --- Clase Tablero (Requerida ) ---
 class Tablero:
-    """Maneja el estado y la lógica del tablero 6x7."""
-    def __init__(self):
-        # Creamos un tablero de 6 filas x 7 columnas
-        self.grid = np.full((FILAS, COLUMNAS), VACIO)
+    """
+    Maneja el estado y la lógica del tablero 6x7. Las celdas son un
+    bytearray de 42 bytes (fila por fila, con CODIGO_DE_FICHA); grid las
+    muestra como la grilla de strings de siempre, para dibujar o imprimir.
+    """
+    __slots__ = ("motor", "celdas", "hash", "conteo", "movimientos", "ganador", "_jugada_ganadora")
+
+    # Tableros creados (incluye copias). Los benchmarks lo usan para medir
+    # asignaciones por nodo de búsqueda.
+    asignaciones = 0
+
+    def __new__(cls, motor=MOTOR_ARREGLO):
+        # Tablero(motor=MOTOR_BITBOARD) entrega directamente un TableroBitboard
+        if cls is Tablero and motor == MOTOR_BITBOARD:
+            return super().__new__(TableroBitboard)
+        return super().__new__(cls)
+
+    def __init__(self, motor=MOTOR_ARREGLO):
+        if motor not in MOTORES:
+            raise ValueError(f"Motor de tablero desconocido: {motor}")
+        Tablero.asignaciones += 1
+        self.motor = MOTOR_ARREGLO
+        # Creamos un tablero de 6 filas x 7 columnas, todas vacías
+        self.celdas = bytearray(FILAS * COLUMNAS)
+        self.hash = 0 # Clave Zobrist, se actualiza en cada inserción
+        self.conteo = None # ConteoVentanas opcional (ver activar_conteo)
+        # Resultado de la partida, se actualiza con cada inserción
+        self.movimientos = 0
+        self.ganador = None
+        self._jugada_ganadora = 0 # Valor de movimientos al momento de ganar
+
+    def copiar(self):
+        """Devuelve una copia independiente del tablero."""
+        Tablero.asignaciones += 1
+        copia = Tablero.__new__(Tablero)
+        copia.motor = self.motor
+        copia.celdas = self.celdas[:]
+        copia.hash = self.hash
+        copia.movimientos = self.movimientos
+        copia.ganador = self.ganador
+        copia._jugada_ganadora = self._jugada_ganadora
+        copia.conteo = self.conteo.copiar() if self.conteo is not None else None
+        return copia
+
+    def __deepcopy__(self, memo):
+        return self.copiar()
+
+    @property
+    def grid(self):
+        """Grilla de strings (FILAS, COLUMNAS) reconstruida desde las celdas."""
+        return _GRILLA_DE_CODIGO[np.frombuffer(self.celdas, dtype=np.int8)].reshape(FILAS, COLUMNAS)
+
+    def bitboards(self):
+        """Devuelve un diccionario ficha -> bitboard con la posición actual."""
+        # Se usa en cada nodo de minimax (análisis de amenazas): un solo recorrido sin dict
+        codigo_x = CODIGO_DE_FICHA["X"]
+        bits_x = bits_o = 0
+        for bit, codigo in zip(_BIT_DE_INDICE, self.celdas):
+            if codigo == codigo_x:
+                bits_x |= bit
+            elif codigo:
+                bits_o |= bit
+        return {"X": bits_x, "O": bits_o}
+
+    def activar_conteo(self):
+        """Empieza a mantener los conteos por ventana en cada jugada (evaluación O(1))."""
+        if self.conteo is None:
+            self.conteo = ConteoVentanas.desde_grid(self.grid)
 
     def imprimir_tablero(self):
         """Imprime el tablero en la consola."""
@@ -209,7 +808,7 @@ class Tablero:
 
     def es_columna_valida(self, col):
         """Revisa si la columna superior (fila 5) está vacía."""
-        return self.grid[FILAS-1][col] == VACIO
+        return not self.celdas[(FILAS - 1) * COLUMNAS + col]
 
     def obtener_columnas_validas(self):
         """Devuelve una lista de todas las columnas no llenas."""
@@ -222,55 +821,194 @@ class Tablero:
     def insertar_ficha(self, col, ficha):
         """Inserta una ficha en la columna dada."""
         #  "manejando lógica de inserción"
+        celdas = self.celdas
         for fila in range(FILAS):
-            if self.grid[fila][col] == VACIO:
-                self.grid[fila][col] = ficha
+            if not celdas[fila * COLUMNAS + col]:
+                celdas[fila * COLUMNAS + col] = CODIGO_DE_FICHA[ficha]
+                self.hash ^= ZOBRIST[ficha][fila][col]
+                if self.conteo is not None:
+                    self.conteo.agregar(fila, col, ficha)
+                self._registrar_jugada(ficha, fila, col)
                 return fila # Devuelve la fila donde se insertó (útil para detectar victoria)
         return -1 # Esto no debería pasar si se usa es_columna_valida
 
+    def deshacer_ficha(self, col):
+        """Quita la ficha superior de la columna. Devuelve su fila."""
+        celdas = self.celdas
+        for fila in range(FILAS - 1, -1, -1):
+            codigo = celdas[fila * COLUMNAS + col]
+            if codigo:
+                ficha = FICHA_DE_CODIGO[codigo]
+                self.hash ^= ZOBRIST[ficha][fila][col]
+                if self.conteo is not None:
+                    self.conteo.quitar(fila, col, ficha)
+                celdas[fila * COLUMNAS + col] = 0
+                self._deshacer_registro()
+                return fila
+        return -1
+
+    def _registrar_jugada(self, ficha, fila, col):
+        """Actualiza el contador de jugadas y el ganador a partir de la última ficha."""
+        self.movimientos += 1
+        if self.ganador is None and self.detectar_victoria(ficha, fila, col):
+            self.ganador = ficha
+            self._jugada_ganadora = self.movimientos
+
+    def _deshacer_registro(self):
+        if self.ganador is not None and self.movimientos == self._jugada_ganadora:
+            self.ganador = None
+        self.movimientos -= 1
+
     def detectar_victoria(self, ficha, ultima_fila, ultima_col):
         """
         Revisa si la última jugada (ficha) resultó en una victoria.
          "detección de victoria"
         """
-        
+        celdas = self.celdas
+        codigo = CODIGO_DE_FICHA[ficha]
+        # Índice de la celda (f, c) en celdas: f * COLUMNAS + c
+
         # 1. Revisar Horizontal
         for c in range(max(0, ultima_col - 3), min(COLUMNAS - 3, ultima_col + 1)):
-            if all(self.grid[ultima_fila][c+i] == ficha for i in range(4)):
+            inicio = ultima_fila * COLUMNAS + c
+            if all(celdas[inicio + i] == codigo for i in range(4)):
                 return True
 
         # 2. Revisar Vertical
         # (Solo necesitas revisar hacia abajo desde la ficha insertada)
         if ultima_fila >= 3: # Solo si hay espacio para 4 en línea vertical
-            if all(self.grid[ultima_fila-i][ultima_col] == ficha for i in range(4)):
+            inicio = ultima_fila * COLUMNAS + ultima_col
+            if all(celdas[inicio - i * COLUMNAS] == codigo for i in range(4)):
                 return True
 
         # 3. Revisar Diagonal Positiva ( / )
         for f in range(max(0, ultima_fila - 3), min(FILAS - 3, ultima_fila + 1)):
             c_start = ultima_col - (ultima_fila - f)
             if 0 <= c_start <= COLUMNAS - 4:
-                if all(self.grid[f+i][c_start+i] == ficha for i in range(4)):
+                inicio = f * COLUMNAS + c_start
+                if all(celdas[inicio + i * (COLUMNAS + 1)] == codigo for i in range(4)):
                     return True
 
         # 4. Revisar Diagonal Negativa ( \ )
         for f in range(max(0, ultima_fila - 3), min(FILAS - 3, ultima_fila + 1)):
             c_start = ultima_col + (ultima_fila - f)
             if 3 <= c_start < COLUMNAS:
-                if all(self.grid[f+i][c_start-i] == ficha for i in range(4)):
+                inicio = f * COLUMNAS + c_start
+                if all(celdas[inicio + i * (COLUMNAS - 1)] == codigo for i in range(4)):
                     return True
         
         return False
 
     def esta_lleno(self):
         """Revisa si el tablero está lleno (empate)."""
-        return len(self.obtener_columnas_validas()) == 0
+        return self.movimientos == FILAS * COLUMNAS
+
+
+class TableroBitboard(Tablero):
+    """
+    Tablero 6x7 con un bitboard de 64 bits por ficha y un vector de alturas.
+    Mantiene la misma API pública que Tablero (no usa celdas).
+    """
+    __slots__ = ("bits", "alturas")
+
+    def __init__(self, motor=MOTOR_BITBOARD):
+        Tablero.asignaciones += 1
+        self.motor = MOTOR_BITBOARD
+        self.bits = {"X": 0, "O": 0}
+        self.alturas = [0] * COLUMNAS
+        self.hash = 0
+        self.conteo = None
+        self.movimientos = 0
+        self.ganador = None
+        self._jugada_ganadora = 0
+
+    def copiar(self):
+        Tablero.asignaciones += 1
+        copia = TableroBitboard.__new__(TableroBitboard)
+        copia.motor = self.motor
+        copia.bits = dict(self.bits)
+        copia.alturas = list(self.alturas)
+        copia.hash = self.hash
+        copia.movimientos = self.movimientos
+        copia.ganador = self.ganador
+        copia._jugada_ganadora = self._jugada_ganadora
+        copia.conteo = self.conteo.copiar() if self.conteo is not None else None
+        return copia
+
+    @property
+    def grid(self):
+        """Reconstruye la grilla de strings (solo para dibujar o imprimir)."""
+        grid = np.full((FILAS, COLUMNAS), VACIO)
+        for ficha, bits in self.bits.items():
+            for col in range(COLUMNAS):
+                for fila in range(self.alturas[col]):
+                    if bits & bit_celda(fila, col):
+                        grid[fila][col] = ficha
+        return grid
+
+    def bitboards(self):
+        return dict(self.bits)
+
+    def mascara(self):
+        """Bitboard con todas las celdas ocupadas."""
+        mascara = 0
+        for bits in self.bits.values():
+            mascara |= bits
+        return mascara
+
+    def mascara_validas(self):
+        """Bitboard con la celda donde caería una ficha en cada columna no llena."""
+        return (self.mascara() + FONDO) & MASCARA_TABLERO
+
+    def es_columna_valida(self, col):
+        return self.alturas[col] < FILAS
+
+    def obtener_columnas_validas(self):
+        return [col for col in range(COLUMNAS) if self.alturas[col] < FILAS]
+
+    def insertar_ficha(self, col, ficha):
+        """Inserta una ficha en O(1) usando la altura de la columna."""
+        fila = self.alturas[col]
+        if fila >= FILAS:
+            return -1
+        self.bits[ficha] = self.bits.get(ficha, 0) | bit_celda(fila, col)
+        self.alturas[col] = fila + 1
+        self.hash ^= ZOBRIST[ficha][fila][col]
+        if self.conteo is not None:
+            self.conteo.agregar(fila, col, ficha)
+        self._registrar_jugada(ficha, fila, col)
+        return fila
+
+    def deshacer_ficha(self, col):
+        """Quita la ficha superior de la columna. Devuelve su fila."""
+        fila = self.alturas[col] - 1
+        bit = bit_celda(fila, col)
+        for ficha, bits in self.bits.items():
+            if bits & bit:
+                self.bits[ficha] = bits ^ bit
+                self.hash ^= ZOBRIST[ficha][fila][col]
+                if self.conteo is not None:
+                    self.conteo.quitar(fila, col, ficha)
+                break
+        self.alturas[col] = fila
+        self._deshacer_registro()
+        return fila
+
+    def detectar_victoria(self, ficha, ultima_fila, ultima_col):
+        """Revisa si la ficha tiene 4 en línea en cualquier parte del tablero."""
+        return hay_cuatro_en_linea(self.bits.get(ficha, 0))
+
+    def esta_lleno(self):
+        return self.movimientos == FILAS * COLUMNAS
 
 
 # --- Clase Juego (Controlador) ---
 class JuegoConnect4:
     """Orquesta el flujo completo del juego."""
-    def __init__(self, jugador1, jugador2):
-        self.tablero = Tablero()
+    def __init__(self, jugador1, jugador2, motor=MOTOR_ARREGLO, registro=None, reportero=None):
+        self.tablero = Tablero(motor)
+        self.registro = registro # RegistroJugadas opcional (latencia, profundidad y nodos por jugada)
+        self.reportero = reportero if reportero is not None else REPORTERO_CONSOLA
         self.jugador1 = jugador1
         self.jugador2 = jugador2
         self.jugadores = {jugador1.ficha: jugador1, jugador2.ficha: jugador2}
@@ -285,34 +1023,47 @@ class JuegoConnect4:
     def iniciar_juego(self):
         """Bucle principal del juego."""
         game_over = False
-        self.tablero.imprimir_tablero()
+        self.reportero.tablero(self.tablero)
+        id_partida = self.registro.nueva_partida() if self.registro is not None else None
 
         while not game_over:
             jugador_actual = self.jugadores[self.turno_actual]
             
-            # 1. Jugador elige columna
+            # 1. Jugador elige columna (el rival pondera mientras tanto, si lo tiene activado)
+            rival = self.jugador2 if jugador_actual is self.jugador1 else self.jugador1
+            if rival.ponderacion:
+                rival.ponderar(self.tablero)
+            inicio = time.perf_counter()
             col = jugador_actual.elegir_columna(self.tablero)
+            if self.registro is not None:
+                self.registro.registrar(id_partida, self.tablero.movimientos + 1, jugador_actual,
+                                        self.tablero.motor, (time.perf_counter() - inicio) * 1000)
             
             # 2. Insertar ficha
             fila = self.tablero.insertar_ficha(col, jugador_actual.ficha)
             
             # 3. Imprimir estado
-            self.tablero.imprimir_tablero()
+            self.reportero.tablero(self.tablero)
 
             # 4. Revisar victoria
             if self.tablero.detectar_victoria(jugador_actual.ficha, fila, col):
-                print(f"🎉 ¡El jugador {jugador_actual.ficha} ({jugador_actual.tipo_jugador}) ha ganado!")
+                self.reportero.fin_partida(jugador_actual)
                 game_over = True
             
             # 5. Revisar empate
             elif self.tablero.esta_lleno():
-                print("🤝 ¡Es un empate!")
+                self.reportero.fin_partida(None)
                 game_over = True
             
             # 6. Cambiar turno
             else:
                 self.cambiar_turno()
 
+        for jugador in (self.jugador1, self.jugador2):
+            jugador.detener_ponderacion()
+        if self.registro is not None and self.registro.ruta is not None:
+            self.registro.guardar()
+
 
 # # --- Punto de Entrada Principal ---
 # if __name__ == "__main__":
@@ -324,9 +1075,9 @@ class JuegoConnect4:
 #     # j1 = Jugador(JUGADOR_IA, "X")
 #     # j2 = Jugador(JUGADOR_RANDOM, "O")
 
-    # 2. Agente DP vs. Jugador Humano 
-    j2 = Jugador(JUGADOR_IA, "X")
-    j1 = Jugador(JUGADOR_HUMANO, "O")
+#     # 2. Agente DP vs. Jugador Humano 
+#     j2 = Jugador(JUGADOR_IA, "X")
+#     j1 = Jugador(JUGADOR_HUMANO, "O")
 
 #     # 3. Jugador Humano vs. Jugador Aleatorio (para tu propia prueba)
 #     # j1 = Jugador(JUGADOR_HUMANO, "X")
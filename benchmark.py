@@ -1,57 +1,78 @@
 import sys
 import os
 import time
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import matplotlib.pyplot as plt 
-from back_end import Tablero, Jugador, JUGADOR_IA, JUGADOR_RANDOM, JUGADOR_HUMANO, VACIO
+from back_end import Tablero, Jugador, JUGADOR_IA, JUGADOR_RANDOM, JUGADOR_HUMANO, JUGADOR_SOLVER, JUGADOR_MCTS, VACIO, MOTOR_ARREGLO, MOTOR_BITBOARD
+from transposicion import compactar_cache
+from registro import RegistroJugadas, RUTA_REGISTRO_POR_DEFECTO
+from reportes import REPORTERO_NULO
 
-class SilenciarSalida:
-    def __enter__(self):
-        self._original_stdout = sys.stdout
-        sys.stdout = open(os.devnull, 'w')
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        sys.stdout.close()
-        sys.stdout = self._original_stdout
+NOMBRES = {JUGADOR_IA: "IA (Minimax)", JUGADOR_MCTS: "MCTS", JUGADOR_SOLVER: "Solver", JUGADOR_RANDOM: "Aleatorio"}
 
 #  Función para simular una sola partida 
-def simular_partida(id_partida):
+def simular_partida(id_partida, motor=MOTOR_ARREGLO, cache_tt=None, registro=None, agente=JUGADOR_IA,
+                    rival=JUGADOR_RANDOM):
     """
     Ejecuta una partida completa entre IA (X) y Random (O).
-    Retorna: "IA", "Random" o "Empate"
+    agente y rival: tipos de jugador de X y O (por ejemplo JUGADOR_MCTS contra JUGADOR_IA).
+    Retorna: "IA" (ganó el agente), "Random" (ganó el rival) o "Empate"
+    """
+    return jugar_partida(id_partida, motor, cache_tt, registro, agente, rival)[0]
+
+def jugar_partida(id_partida, motor=MOTOR_ARREGLO, cache_tt=None, registro=None, agente=JUGADOR_IA,
+                  rival=JUGADOR_RANDOM):
+    """
+    Igual que simular_partida, pero retorna (ganador, cantidad de jugadas).
+    cache_tt: ruta del caché persistente de la TT (la IA parte con él y al
+    terminar vuelca lo aprendido en un delta).
+    registro: RegistroJugadas donde anotar la latencia, profundidad y nodos de cada jugada.
     """
     # IA = "X", Random = "O"
     
-    jugador_ia = Jugador(JUGADOR_IA, "X")
-    jugador_random = Jugador(JUGADOR_RANDOM, "O")
-    
-    tablero = Tablero()
+    # Sin reportero de consola: las jugadas no se formatean ni se imprimen
+    jugador_ia = Jugador(agente, "X", cache_tt=cache_tt, reportero=REPORTERO_NULO)
+    jugador_random = Jugador(rival, "O", reportero=REPORTERO_NULO)
+    try:
+        return _jugar(id_partida, jugador_ia, jugador_random, motor, registro)
+    finally:
+        jugador_ia.cerrar()
+
+def _jugar(id_partida, jugador_ia, jugador_random, motor, registro=None):
+    tablero = Tablero(motor)
     
     # Alternar turno inicial para balancear
     turno_actual = jugador_ia if id_partida % 2 == 0 else jugador_random
     
     game_over = False
+    jugadas = 0
     
     while not game_over:
         # Lógica de turno (Simplificada del main original para velocidad)
+        inicio = time.perf_counter()
         col = turno_actual.elegir_columna(tablero)
+        if registro is not None:
+            registro.registrar(id_partida, jugadas + 1, turno_actual, motor, (time.perf_counter() - inicio) * 1000)
         
         # Validación de seguridad
         if col is None or not tablero.es_columna_valida(col):
             # Si la IA falla o el Random elige mal (raro), forzamos empate o derrota
-            return "Error"
+            return "Error", jugadas
 
         fila = tablero.insertar_ficha(col, turno_actual.ficha)
+        jugadas += 1
         
         # Chequear victoria
         if tablero.detectar_victoria(turno_actual.ficha, fila, col):
-            if turno_actual.tipo_jugador == JUGADOR_IA:
-                return "IA"
+            if turno_actual is jugador_ia:
+                return "IA", jugadas
             else:
-                return "Random"
+                return "Random", jugadas
         
         # Chequear empate
         if tablero.esta_lleno():
-            return "Empate"
+            return "Empate", jugadas
             
         # Cambiar turno
         if turno_actual == jugador_ia:
@@ -59,10 +80,44 @@ def simular_partida(id_partida):
         else:
             turno_actual = jugador_ia
 
+def registrar_resultado(resultados, ganador):
+    """Suma el ganador de una partida al diccionario de resultados."""
+    if ganador == "IA":
+        resultados["IA"] += 1
+    elif ganador == "Random":
+        resultados["Random"] += 1
+    elif ganador == "Empate":
+        resultados["Empate"] += 1
+    else:
+        resultados["Errores"] += 1
+
+def _jugar_partida_con_semilla(id_partida, semilla, motor, cache_tt=None, registrar=False, agente=JUGADOR_IA,
+                               rival=JUGADOR_RANDOM):
+    """
+    Tarea de un proceso trabajador: la semilla depende solo de la partida (reproducible).
+    Retorna (ganador, jugadas, filas del registro), con las filas vacías si no se registra.
+    """
+    random.seed(semilla + id_partida)
+    registro = RegistroJugadas() if registrar else None
+    ganador, jugadas = jugar_partida(id_partida, motor, cache_tt, registro, agente, rival)
+    return ganador, jugadas, registro.filas() if registro is not None else []
+
+def compactar(cache_tt):
+    """Mezcla los deltas de las partidas en la base del caché (paso explícito, después de jugar)."""
+    inicio = time.time()
+    entradas = compactar_cache(cache_tt)
+    print(f"Caché '{cache_tt}' compactado: {entradas} entradas en {time.time() - inicio:.2f} s")
+
+def guardar_registro(registro):
+    """Agrega las jugadas registradas al CSV del registro (ver plots.py)."""
+    ruta = registro.ruta or RUTA_REGISTRO_POR_DEFECTO
+    print(f"{registro.guardar(ruta)} jugadas agregadas a '{ruta}'")
+
 # Función Principal del Benchmark 
-def correr_benchmark(cantidad_partidas=100):
-    print(f" Iniciando Simulación de {cantidad_partidas} Partidas ")
-    print("Configuración: Agente IA (Minimax) vs Agente Random")
+def correr_benchmark(cantidad_partidas=100, motor=MOTOR_ARREGLO, cache_tt=None, registro=None, agente=JUGADOR_IA,
+                     rival=JUGADOR_RANDOM):
+    print(f" Iniciando Simulación de {cantidad_partidas} Partidas (motor: {motor})")
+    print(f"Configuración: Agente {NOMBRES[agente]} vs Agente {NOMBRES[rival]}")
     print("Nota: Esto puede tardar unos minutos dependiendo de la profundidad del Minimax...\n")
 
     resultados = {
@@ -75,19 +130,10 @@ def correr_benchmark(cantidad_partidas=100):
     tiempo_inicio = time.time()
 
     for i in range(1, cantidad_partidas + 1):
-        # Usamos el silenciador para que no imprima cada movimiento
-        with SilenciarSalida():
-            ganador = simular_partida(i)
+        ganador = simular_partida(i, motor, cache_tt, registro, agente, rival)
         
         # Registrar resultado
-        if ganador == "IA":
-            resultados["IA"] += 1
-        elif ganador == "Random":
-            resultados["Random"] += 1
-        elif ganador == "Empate":
-            resultados["Empate"] += 1
-        else:
-            resultados["Errores"] += 1
+        registrar_resultado(resultados, ganador)
             
         # Barra de progreso simple
         porcentaje = (i / cantidad_partidas) * 100
@@ -96,6 +142,61 @@ def correr_benchmark(cantidad_partidas=100):
 
     tiempo_total = time.time() - tiempo_inicio
     print(f"\n\n Simulación Finalizada en {tiempo_total:.2f} segundos ")
+    if cache_tt is not None:
+        compactar(cache_tt)
+    if registro is not None:
+        guardar_registro(registro)
+    
+    return resultados
+
+def correr_torneo_paralelo(cantidad_partidas=100, trabajadores=None, semilla=0, motor=MOTOR_ARREGLO, cache_tt=None,
+                           registro=None, agente=JUGADOR_IA, rival=JUGADOR_RANDOM):
+    """
+    Igual que correr_benchmark, pero reparte las partidas entre procesos.
+    Cada partida usa la semilla semilla + id_partida, así el resultado no depende
+    de qué proceso la juegue. Los resultados se agregan a medida que terminan
+    (las jugadas de cada partida, en registro si se da).
+    """
+    trabajadores = trabajadores or os.cpu_count() or 1
+    print(f" Iniciando Torneo Paralelo de {cantidad_partidas} Partidas "
+          f"({trabajadores} procesos, semilla {semilla}, motor: {motor})")
+    print(f"Configuración: Agente {NOMBRES[agente]} vs Agente {NOMBRES[rival]}\n")
+
+    resultados = {
+        "IA": 0,
+        "Random": 0,
+        "Empate": 0,
+        "Errores": 0
+    }
+    
+    tiempo_inicio = time.time()
+    jugadas_totales = 0
+
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        futuros = [pool.submit(_jugar_partida_con_semilla, i, semilla, motor, cache_tt, registro is not None,
+                               agente, rival)
+                   for i in range(1, cantidad_partidas + 1)]
+        for terminadas, futuro in enumerate(as_completed(futuros), start=1):
+            ganador, jugadas, filas = futuro.result()
+            registrar_resultado(resultados, ganador)
+            if registro is not None:
+                registro.extender(filas)
+            jugadas_totales += jugadas
+
+            # Progreso y rendimiento en vivo
+            transcurrido = max(time.time() - tiempo_inicio, 1e-9)
+            porcentaje = (terminadas / cantidad_partidas) * 100
+            sys.stdout.write(f"\rProgreso: [{terminadas}/{cantidad_partidas}] - {porcentaje:.1f}% | "
+                             f"{terminadas / transcurrido:.1f} partidas/s | "
+                             f"{jugadas_totales / transcurrido:.1f} jugadas/s")
+            sys.stdout.flush()
+
+    tiempo_total = time.time() - tiempo_inicio
+    print(f"\n\n Torneo Finalizado en {tiempo_total:.2f} segundos ")
+    if cache_tt is not None:
+        compactar(cache_tt)
+    if registro is not None:
+        guardar_registro(registro)
     
     return resultados
 
@@ -103,16 +204,26 @@ def correr_benchmark(cantidad_partidas=100):
 if __name__ == "__main__":
     
     N_PARTIDAS = 100
-    datos = correr_benchmark(N_PARTIDAS)
+    MOTOR = MOTOR_BITBOARD
+    PARALELO = True # False: una partida tras otra en este proceso
+    CACHE_TT = None # Ruta del caché persistente de la TT (p. ej. "cache_tt.bin"); None = sin caché
+    REGISTRO = RegistroJugadas(RUTA_REGISTRO_POR_DEFECTO) # Latencia por jugada para plots.py; None = sin registro
+    AGENTE = JUGADOR_IA # JUGADOR_MCTS para probar MCTS
+    RIVAL = JUGADOR_RANDOM # JUGADOR_IA para un duelo MCTS vs Minimax
+    if PARALELO:
+        datos = correr_torneo_paralelo(N_PARTIDAS, motor=MOTOR, cache_tt=CACHE_TT, registro=REGISTRO,
+                                       agente=AGENTE, rival=RIVAL)
+    else:
+        datos = correr_benchmark(N_PARTIDAS, MOTOR, CACHE_TT, REGISTRO, AGENTE, RIVAL)
     
     #  Reporte de Texto 
     print("\nRESULTADOS FINALES:")
-    print(f"Victorias IA:     {datos['IA']} ({datos['IA']/N_PARTIDAS*100}%)")
-    print(f"Victorias Random: {datos['Random']} ({datos['Random']/N_PARTIDAS*100}%)")
+    print(f"Victorias {NOMBRES[AGENTE]}: {datos['IA']} ({datos['IA']/N_PARTIDAS*100}%)")
+    print(f"Victorias {NOMBRES[RIVAL]}: {datos['Random']} ({datos['Random']/N_PARTIDAS*100}%)")
     print(f"Empates:          {datos['Empate']} ({datos['Empate']/N_PARTIDAS*100}%)")
     
     #  Generación de Gráfico 
-    etiquetas = ['IA (Minimax)', 'Aleatorio', 'Empates']
+    etiquetas = [NOMBRES[AGENTE], NOMBRES[RIVAL], 'Empates']
     valores = [datos['IA'], datos['Random'], datos['Empate']]
     colores = ['#4CAF50', '#F44336', '#FFC107'] # Verde, Rojo, Amarillo
 
@@ -126,7 +237,7 @@ if __name__ == "__main__":
                     f'{height}',
                     ha='center', va='bottom')
 
-    plt.title(f'Rendimiento Agente IA vs Random ({N_PARTIDAS} Partidas)')
+    plt.title(f'Rendimiento Agente {NOMBRES[AGENTE]} vs {NOMBRES[RIVAL]} ({N_PARTIDAS} Partidas)')
     plt.ylabel('Cantidad de Victorias')
     plt.ylim(0, N_PARTIDAS + 10)
     
@@ -2,14 +2,14 @@ import time
 import math
 import matplotlib.pyplot as plt
 
-from back_end import Tablero, Jugador, JUGADOR_IA, VACIO
+from back_end import Tablero, Jugador, JUGADOR_IA, VACIO, MOTOR_ARREGLO, MOTOR_BITBOARD
 
-def benchmark_profundidad(max_depth=8):
+def benchmark_profundidad(max_depth=8, motor=MOTOR_ARREGLO):
     """
     Mide cuánto tarda la IA en decidir el primer movimiento 
     para diferentes niveles de profundidad.
     """
-    print(f"--- Iniciando Benchmark de Profundidad (1 a {max_depth}) ---")
+    print(f"--- Iniciando Benchmark de Profundidad (1 a {max_depth}, motor: {motor}) ---")
     print("Nota: El algoritmo Minimax tiene complejidad exponencial.")
     print("Profundidades > 6 pueden tomar MUCHO tiempo en Python puro.\n")
 
@@ -19,29 +19,37 @@ def benchmark_profundidad(max_depth=8):
     # Preparamos el jugador
     jugador_ia = Jugador(JUGADOR_IA, "X")
 
-    print(f"{'Profundidad':<12} | {'Tiempo (segundos)':<20} | {'Nodos/Acción'}")
-    print("-" * 50)
+    print(f"{'Profundidad':<12} | {'Tiempo (segundos)':<20} | {'Nodos':<10} | {'Tableros/Nodo':<13} | {'Aciertos TT':<11} | {'Corte 1ª jugada'}")
+    print("-" * 100)
 
     for depth in profundidades:
         # Crear un tablero limpio para cada prueba
-        tablero = Tablero()
+        tablero = Tablero(motor)
         
-        #Limpiar la memoria (memoization) 
-        if hasattr(jugador_ia, 'memo'):
-            jugador_ia.memo = {}
+        # Limpiar la tabla de transposición y los contadores de ordenamiento
+        jugador_ia.nueva_partida()
+        jugador_ia.ordenador.nueva_busqueda()
 
-        # Medir tiempo
-        start_time = time.time()
+        # Medir tiempo, nodos y tableros asignados durante la búsqueda
+        nodos_inicio = jugador_ia.nodos
+        asignaciones_inicio = Tablero.asignaciones
+        start_time = time.perf_counter()
         
         # Llamamos minimax
         columna, score = jugador_ia.minimax(tablero, depth, -math.inf, math.inf, True)
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         duracion = end_time - start_time
         
+        nodos = jugador_ia.nodos - nodos_inicio
+        asignaciones = Tablero.asignaciones - asignaciones_inicio
+        
         tiempos.append(duracion)
         
-        print(f"{depth:<12} | {duracion:.5f} s {'':<11} | Completado")
+        tt = jugador_ia.tt
+        tasa_tt = tt.aciertos / max(1, tt.aciertos + tt.fallos)
+        
+        print(f"{depth:<12} | {duracion:.5f} s {'':<11} | {nodos:<10} | {asignaciones / nodos:<13.4f} | {tasa_tt:<11.1%} | {jugador_ia.ordenador.tasa_corte_primera:.1%}")
 
     return list(profundidades), tiempos
 
@@ -72,7 +80,7 @@ def graficar_resultados(x, y):
     plt.show()
 
 if __name__ == "__main__":
-    profundidades, tiempos = benchmark_profundidad(max_depth=10)
+    profundidades, tiempos = benchmark_profundidad(max_depth=10, motor=MOTOR_BITBOARD)
     
     if len(tiempos) > 0:
         graficar_resultados(profundidades, tiempos)
@@ -0,0 +1,73 @@
+import argparse
+import gc
+import random
+import tracemalloc
+
+from back_end import JuegoConnect4, Jugador, JUGADOR_HUMANO, JUGADOR_IA, JUGADOR_RANDOM, JUGADOR_MCTS, MOTORES
+from reportes import REPORTERO_NULO
+
+# Partidas vivas que se crean por escenario (la memoria se promedia entre ellas)
+N_PARTIDAS = 2000
+# Jugadas al azar que se hacen en cada partida antes de medir (tablero a mitad de partida)
+JUGADAS_INICIALES = 12
+# TT de los jugadores IA: con el tamaño por defecto (8 MB) la tabla es casi toda la partida
+BYTES_TT = 1 << 16
+
+ESCENARIOS = {
+    "aleatorio vs aleatorio": (JUGADOR_RANDOM, JUGADOR_RANDOM),
+    "humano vs MCTS": (JUGADOR_HUMANO, JUGADOR_MCTS),
+    "humano vs IA": (JUGADOR_HUMANO, JUGADOR_IA),
+    "IA vs IA": (JUGADOR_IA, JUGADOR_IA),
+}
+
+
+def crear_partida(tipos, motor, bytes_tt, jugadas, rng):
+    """Una partida viva: dos jugadores y un tablero con algunas jugadas hechas."""
+    jugador1 = Jugador(tipos[0], "X", bytes_tt=bytes_tt, reportero=REPORTERO_NULO)
+    jugador2 = Jugador(tipos[1], "O", bytes_tt=bytes_tt, reportero=REPORTERO_NULO)
+    juego = JuegoConnect4(jugador1, jugador2, motor=motor, reportero=REPORTERO_NULO)
+    ficha = "X"
+    for _ in range(jugadas):
+        juego.tablero.insertar_ficha(rng.choice(juego.tablero.obtener_columnas_validas()), ficha)
+        ficha = "O" if ficha == "X" else "X"
+    return juego
+
+
+def bytes_por_partida(tipos, motor, partidas=N_PARTIDAS, bytes_tt=BYTES_TT, jugadas=JUGADAS_INICIALES):
+    """
+    Memoria asignada por partida viva (tracemalloc), promediada sobre
+    partidas partidas que se mantienen vivas a la vez. Devuelve
+    (bytes por partida, bytes por tablero).
+    """
+    rng = random.Random(0)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        inicio = tracemalloc.get_traced_memory()[0]
+        vivas = [crear_partida(tipos, motor, bytes_tt, jugadas, rng) for _ in range(partidas)]
+        total = tracemalloc.get_traced_memory()[0] - inicio
+        # Los tableros solos, con las mismas jugadas
+        inicio = tracemalloc.get_traced_memory()[0]
+        tableros = [juego.tablero.copiar() for juego in vivas]
+        solo_tableros = tracemalloc.get_traced_memory()[0] - inicio
+    finally:
+        tracemalloc.stop()
+    del vivas, tableros
+    return total / partidas, solo_tableros / partidas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memoria por partida viva en un mismo proceso")
+    parser.add_argument("--partidas", type=int, default=N_PARTIDAS)
+    parser.add_argument("--bytes-tt", type=int, default=BYTES_TT, help="TT de cada jugador IA")
+    parser.add_argument("--jugadas", type=int, default=JUGADAS_INICIALES)
+    args = parser.parse_args()
+
+    print(f"--- Memoria por partida viva ({args.partidas} partidas a la vez, {args.jugadas} jugadas hechas, "
+          f"TT de la IA: {args.bytes_tt:,} bytes) ---")
+    print(f"{'Escenario':<24} | {'Motor':<9} | {'Bytes/partida':>14} | {'Bytes/tablero':>13}")
+    print("-" * 70)
+    for nombre, tipos in ESCENARIOS.items():
+        for motor in MOTORES:
+            por_partida, por_tablero = bytes_por_partida(tipos, motor, args.partidas, args.bytes_tt, args.jugadas)
+            print(f"{nombre:<24} | {motor:<9} | {por_partida:>14,.0f} | {por_tablero:>13,.0f}")
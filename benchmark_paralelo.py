@@ -0,0 +1,89 @@
+import os
+import time
+import matplotlib.pyplot as plt
+
+from back_end import Tablero, Jugador, JUGADOR_IA, MOTOR_BITBOARD, PARALELO_RAIZ, PARALELO_SMP
+
+# Posiciones de prueba (secuencias de columnas jugadas desde el tablero vacío)
+POSICIONES = [
+    [],
+    [3, 3, 2, 4],
+    [3, 3, 2, 4, 4, 2],
+    [3, 2, 3, 3, 4, 5, 2, 4],
+]
+
+
+def armar_tablero(jugadas, motor=MOTOR_BITBOARD):
+    """Reproduce una secuencia de jugadas alternando X y O. Devuelve (tablero, ficha en turno)."""
+    tablero = Tablero(motor)
+    ficha = "X"
+    for col in jugadas:
+        tablero.insertar_ficha(col, ficha)
+        ficha = "O" if ficha == "X" else "X"
+    return tablero, ficha
+
+
+def medir(profundidad, trabajadores, modo=PARALELO_RAIZ):
+    """Tiempo total (s) en decidir todas las POSICIONES a la profundidad dada."""
+    total = 0.0
+    for jugadas in POSICIONES:
+        tablero, ficha = armar_tablero(jugadas)
+        jugador = Jugador(JUGADOR_IA, ficha, profundidad=profundidad, trabajadores=trabajadores,
+                          modo_paralelo=modo)
+        if trabajadores > 1:
+            # Arrancamos los procesos antes de medir
+            jugador.buscar_paralelo(tablero, tiempo_ms=1)
+            jugador.nueva_partida()
+        inicio = time.perf_counter()
+        if trabajadores > 1:
+            jugador.buscar_paralelo(tablero)
+        else:
+            jugador.buscar(tablero)
+        total += time.perf_counter() - inicio
+        jugador.cerrar()
+    return total
+
+
+def benchmark_paralelo(profundidades=(7, 8), max_trabajadores=None, modos=(PARALELO_RAIZ, PARALELO_SMP)):
+    """Mide el speedup de cada modo de búsqueda paralela respecto a la secuencial."""
+    if max_trabajadores is None:
+        max_trabajadores = os.cpu_count() or 1
+    lista_trabajadores = list(range(1, max_trabajadores + 1))
+    speedups = {}
+
+    print(f"--- Benchmark de búsqueda paralela (1 a {max_trabajadores} procesos) ---")
+    print(f"{'Modo':<6} | {'Profundidad':<12} | {'Procesos':<9} | {'Tiempo (s)':<11} | {'Speedup'}")
+    print("-" * 59)
+    for profundidad in profundidades:
+        base = medir(profundidad, 1)
+        for modo in modos:
+            speedups[(modo, profundidad)] = []
+            for trabajadores in lista_trabajadores:
+                tiempo = base if trabajadores == 1 else medir(profundidad, trabajadores, modo)
+                speedups[(modo, profundidad)].append(base / tiempo)
+                print(f"{modo:<6} | {profundidad:<12} | {trabajadores:<9} | {tiempo:<11.3f} | {base / tiempo:.2f}x")
+    return lista_trabajadores, speedups
+
+
+def graficar_speedup(trabajadores, speedups):
+    plt.figure(figsize=(10, 6))
+    plt.plot(trabajadores, trabajadores, linestyle='--', color='gray', label='Ideal (lineal)')
+    for (modo, profundidad), valores in speedups.items():
+        plt.plot(trabajadores, valores, marker='o', linewidth=2, label=f'{modo}, profundidad {profundidad}')
+
+    plt.title('Speedup de la búsqueda paralela', fontsize=14)
+    plt.xlabel('Procesos trabajadores', fontsize=12)
+    plt.ylabel('Speedup respecto a la búsqueda secuencial', fontsize=12)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.xticks(trabajadores)
+    plt.legend()
+
+    filename = "benchmark_paralelo.png"
+    plt.savefig(filename)
+    print(f"\n[Éxito] Gráfico guardado como '{filename}'")
+    plt.show()
+
+
+if __name__ == "__main__":
+    trabajadores, speedups = benchmark_paralelo()
+    graficar_speedup(trabajadores, speedups)
@@ -0,0 +1,231 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from back_end import Tablero, Jugador, JUGADOR_IA, MOTORES
+
+# Corpus fijo de posiciones de mitad de partida (jugadas desde el tablero vacío,
+# X empieza). Ninguna está terminada ni tiene una victoria inmediata.
+CORPUS = [
+    [4, 1, 1, 3, 4, 6, 5, 1],
+    [2, 0, 1, 0, 0, 5, 6, 4],
+    [1, 3, 2, 1, 1, 2, 3, 4, 6, 5],
+    [2, 3, 4, 2, 2, 5, 5, 3, 6, 1],
+    [0, 1, 6, 2, 1, 5, 3, 4, 2, 3],
+    [0, 1, 4, 0, 6, 4, 4, 6, 4, 5],
+    [0, 6, 2, 2, 2, 3, 1, 2, 6, 3],
+    [6, 4, 6, 5, 3, 4, 0, 2, 6, 5, 4, 6],
+    [3, 5, 3, 1, 6, 0, 2, 2, 2, 1, 4, 5, 5, 2, 4, 0],
+    [3, 5, 6, 6, 5, 1, 4, 1, 6, 3, 0, 6, 2, 5, 3, 3, 0, 5],
+    [1, 6, 2, 3, 2, 2, 6, 1, 2, 3, 3, 2, 4, 1, 6, 3, 1, 1],
+    [0, 0, 2, 5, 0, 6, 1, 6, 4, 3, 5, 0, 1, 4, 3, 4, 3, 4],
+]
+
+PROFUNDIDAD_BUSQUEDA = 6
+REPETICIONES = 7
+CALENTAMIENTO = 2
+REPETICIONES_BUSQUEDA = 3
+MUESTRA_MINIMA_NS = 50_000_000 # Duración mínima de cada muestra de los micro-benchmarks
+TOLERANCIA = 0.10 # Una métrica empeora si se aleja más de un 10% de la línea base
+
+RUTA_RESULTADOS = "benchmark_rendimiento.json"
+RUTA_LINEA_BASE = "benchmark_rendimiento_base.json"
+
+# Métricas donde un valor mayor es mejor (en el resto, menor es mejor)
+MAYOR_ES_MEJOR = {"nodos_por_segundo"}
+
+
+def armar_tablero(jugadas, motor):
+    """Reproduce una secuencia de jugadas. Devuelve (tablero, ficha en turno, fila y columna de la última)."""
+    tablero = Tablero(motor)
+    ficha = "X"
+    fila = col = None
+    for col in jugadas:
+        fila = tablero.insertar_ficha(col, ficha)
+        ficha = "O" if ficha == "X" else "X"
+    return tablero, ficha, fila, col
+
+
+def cronometrar(funcion, repeticiones=REPETICIONES, calentamiento=CALENTAMIENTO):
+    """
+    Mediana en ns de una llamada a funcion. Cada muestra repite la llamada
+    las veces necesarias para durar al menos MUESTRA_MINIMA_NS (las primeras
+    calentamiento muestras se descartan).
+    """
+    vueltas = 1
+    while True:
+        inicio = time.perf_counter_ns()
+        for _ in range(vueltas):
+            funcion()
+        if time.perf_counter_ns() - inicio >= MUESTRA_MINIMA_NS:
+            break
+        vueltas *= 2
+
+    tiempos = []
+    for i in range(calentamiento + repeticiones):
+        inicio = time.perf_counter_ns()
+        for _ in range(vueltas):
+            funcion()
+        if i >= calentamiento:
+            tiempos.append((time.perf_counter_ns() - inicio) / vueltas)
+    return statistics.median(tiempos)
+
+
+def micro_insertar_ficha(posiciones):
+    """ns por par insertar_ficha + deshacer_ficha sobre cada columna válida del corpus."""
+    operaciones = sum(len(tablero.obtener_columnas_validas()) for tablero, _, _, _ in posiciones)
+
+    def correr():
+        for tablero, ficha, _, _ in posiciones:
+            for col in tablero.obtener_columnas_validas():
+                tablero.insertar_ficha(col, ficha)
+                tablero.deshacer_ficha(col)
+    return cronometrar(correr) / operaciones
+
+
+def micro_detectar_victoria(posiciones):
+    """ns por llamada a detectar_victoria con la última jugada de cada posición."""
+    def correr():
+        for tablero, ficha, fila, col in posiciones:
+            rival = "O" if ficha == "X" else "X"
+            tablero.detectar_victoria(rival, fila, col)
+    return cronometrar(correr) / len(posiciones)
+
+
+def micro_evaluar_posicion(posiciones, jugadores):
+    """ns por llamada a evaluar_posicion (evaluación completa, sin conteos incrementales)."""
+    def correr():
+        for tablero, ficha, _, _ in posiciones:
+            jugadores[ficha].evaluar_posicion(tablero, ficha)
+    return cronometrar(correr) / len(posiciones)
+
+
+def medir_busqueda(posiciones, profundidad=PROFUNDIDAD_BUSQUEDA, repeticiones=REPETICIONES_BUSQUEDA):
+    """
+    Busca cada posición con un jugador nuevo a la profundidad dada (la
+    búsqueda es determinista: cada repetición visita los mismos nodos).
+    Devuelve nodos/s con la mediana de los tiempos, factor de ramificación
+    efectivo (media geométrica de nodos(d) / nodos(d - 1) entre iteraciones)
+    y tasa de aciertos de la TT.
+
+    La tasa sale de EstadisticasBusqueda, que cuenta solo las consultas de
+    minimax (los contadores de la tabla también incluyen las de
+    variacion_principal). Se mide en una pasada aparte, así la
+    instrumentación no pesa en los tiempos.
+    """
+    aciertos = consultas = 0
+    for tablero, ficha, _, _ in posiciones:
+        estadisticas = Jugador(JUGADOR_IA, ficha, profundidad=profundidad,
+                               instrumentar=True).buscar(tablero).estadisticas
+        aciertos += estadisticas.tt_aciertos
+        consultas += estadisticas.tt_consultas
+
+    tiempos = []
+    for _ in range(repeticiones):
+        nodos = 0
+        tiempo_ns = 0
+        razones = []
+        for tablero, ficha, _, _ in posiciones:
+            jugador = Jugador(JUGADOR_IA, ficha, profundidad=profundidad)
+            acumulados = []
+            inicio = time.perf_counter_ns()
+            resultado = jugador.buscar(tablero, progreso=lambda r: acumulados.append(r.nodos))
+            tiempo_ns += time.perf_counter_ns() - inicio
+            nodos += resultado.nodos
+            # Nodos de cada iteración a partir de los acumulados
+            por_iteracion = [b - a for a, b in zip([0] + acumulados, acumulados)]
+            razones += [b / a for a, b in zip(por_iteracion, por_iteracion[1:]) if a > 0 and b > 0]
+        tiempos.append(tiempo_ns)
+    tiempo_ns = statistics.median(tiempos)
+    return {
+        "nodos": nodos,
+        "nodos_por_segundo": nodos / (tiempo_ns / 1e9),
+        "ramificacion_efectiva": statistics.geometric_mean(razones) if razones else 0.0,
+        "tasa_aciertos_tt": aciertos / max(1, consultas),
+        "busqueda_ms": tiempo_ns / 1e6,
+    }
+
+
+def correr_suite(motores=MOTORES, profundidad=PROFUNDIDAD_BUSQUEDA):
+    """Corre todos los benchmarks sobre el corpus con cada motor de tablero."""
+    jugadores = {"X": Jugador(JUGADOR_IA, "X", bytes_tt=0), "O": Jugador(JUGADOR_IA, "O", bytes_tt=0)}
+    resultados = {}
+    for motor in motores:
+        posiciones = [armar_tablero(jugadas, motor) for jugadas in CORPUS]
+        metricas = {
+            "insertar_ficha_ns": micro_insertar_ficha(posiciones),
+            "detectar_victoria_ns": micro_detectar_victoria(posiciones),
+            "evaluar_posicion_ns": micro_evaluar_posicion(posiciones, jugadores),
+        }
+        metricas.update(medir_busqueda(posiciones, profundidad))
+        resultados[motor] = metricas
+    return {
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "profundidad": profundidad,
+        "posiciones": len(CORPUS),
+        "resultados": resultados,
+    }
+
+
+def imprimir(reporte):
+    print(f"--- Benchmark de rendimiento ({reporte['posiciones']} posiciones, "
+          f"profundidad {reporte['profundidad']}) ---")
+    for motor, metricas in reporte["resultados"].items():
+        print(f"\nMotor: {motor}")
+        for nombre, valor in metricas.items():
+            print(f"  {nombre:<24} {valor:>14,.3f}")
+
+
+def comparar(reporte, linea_base, tolerancia=TOLERANCIA):
+    """
+    Compara cada métrica de tiempo o velocidad con la línea base.
+    Devuelve la lista de regresiones (motor, métrica, base, actual).
+    """
+    regresiones = []
+    print(f"\n--- Comparación con la línea base ({linea_base['fecha']}) ---")
+    for motor, metricas in reporte["resultados"].items():
+        base = linea_base["resultados"].get(motor, {})
+        for nombre, valor in metricas.items():
+            if nombre not in base or not (nombre.endswith("_ns") or nombre in MAYOR_ES_MEJOR):
+                continue
+            cambio = valor / base[nombre] - 1
+            empeoro = -cambio > tolerancia if nombre in MAYOR_ES_MEJOR else cambio > tolerancia
+            marca = "  <-- REGRESIÓN" if empeoro else ""
+            print(f"  {motor:<9} {nombre:<24} {base[nombre]:>14,.1f} -> {valor:>14,.1f} ({cambio:+.1%}){marca}")
+            if empeoro:
+                regresiones.append((motor, nombre, base[nombre], valor))
+    return regresiones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de rendimiento con línea base")
+    parser.add_argument("--profundidad", type=int, default=PROFUNDIDAD_BUSQUEDA)
+    parser.add_argument("--salida", default=RUTA_RESULTADOS)
+    parser.add_argument("--base", default=RUTA_LINEA_BASE)
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+    parser.add_argument("--guardar-base", action="store_true", help="guarda este resultado como nueva línea base")
+    args = parser.parse_args()
+
+    reporte = correr_suite(profundidad=args.profundidad)
+    imprimir(reporte)
+    with open(args.salida, "w") as archivo:
+        json.dump(reporte, archivo, indent=2)
+    print(f"\n[Éxito] Resultados guardados en '{args.salida}'")
+
+    if args.guardar_base:
+        with open(args.base, "w") as archivo:
+            json.dump(reporte, archivo, indent=2)
+        print(f"[Éxito] Línea base guardada en '{args.base}'")
+    elif os.path.exists(args.base):
+        with open(args.base) as archivo:
+            regresiones = comparar(reporte, json.load(archivo), args.tolerancia)
+        if regresiones:
+            print(f"\n{len(regresiones)} métricas empeoraron más de un {args.tolerancia:.0%}")
+            sys.exit(1)
+        print("\nSin regresiones respecto a la línea base")
@@ -0,0 +1,159 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+import numpy as np
+
+from back_end import JUGADOR_IA, MOTOR_BITBOARD, COLUMNAS
+from servidor import ServidorConnect4, HOST_POR_DEFECTO, PUERTO_POR_DEFECTO, MAX_LARGO_LINEA
+
+N_CLIENTES = 50
+PARTIDAS_POR_CLIENTE = 4
+
+
+class Conexion:
+    """Una conexión al servidor: manda pedidos numerados y espera cada respuesta por su id."""
+    def __init__(self, lector, escritor):
+        self.lector = lector
+        self.escritor = escritor
+        self._ids = itertools.count(1)
+        self._esperando = {}
+        self._recepcion = asyncio.create_task(self._recibir())
+
+    @classmethod
+    async def abrir(cls, host, puerto):
+        lector, escritor = await asyncio.open_connection(host, puerto, limit=MAX_LARGO_LINEA * 4)
+        return cls(lector, escritor)
+
+    async def _recibir(self):
+        while linea := await self.lector.readline():
+            respuesta = json.loads(linea)
+            futuro = self._esperando.pop(respuesta.get("id"), None)
+            if futuro is not None:
+                futuro.set_result(respuesta)
+
+    async def pedir(self, **pedido):
+        """Manda un pedido y devuelve (respuesta, latencia en ms)."""
+        pedido["id"] = next(self._ids)
+        futuro = asyncio.get_running_loop().create_future()
+        self._esperando[pedido["id"]] = futuro
+        inicio = time.perf_counter()
+        self.escritor.write(json.dumps(pedido).encode() + b"\n")
+        await self.escritor.drain()
+        respuesta = await futuro
+        return respuesta, (time.perf_counter() - inicio) * 1000
+
+    async def cerrar(self):
+        self.escritor.close()
+        await self.escritor.wait_closed()
+        self._recepcion.cancel()
+
+
+class ResultadosPrueba:
+    """Latencias vistas por los clientes, por operación, y resultados de las partidas."""
+    def __init__(self):
+        self.latencias_ms = {}
+        self.rechazos = 0
+        self.errores = []
+        self.partidas = {"cliente": 0, "servidor": 0, "empate": 0}
+
+    def registrar(self, operacion, latencia_ms):
+        self.latencias_ms.setdefault(operacion, []).append(latencia_ms)
+
+    def imprimir(self, segundos):
+        pedidos = sum(len(latencias) for latencias in self.latencias_ms.values())
+        print(f"{pedidos} pedidos en {segundos:.2f} s ({pedidos / segundos:,.0f} pedidos/s), "
+              f"{self.rechazos} rechazos por servidor ocupado, {len(self.errores)} errores")
+        print(f"Partidas: {self.partidas}")
+        print(f"{'Operación':<10} | {'Muestras':>8} | {'p50 [ms]':>9} | {'p95 [ms]':>9} | {'p99 [ms]':>9}")
+        for operacion, latencias in self.latencias_ms.items():
+            p50, p95, p99 = np.percentile(latencias, (50, 95, 99))
+            print(f"{operacion:<10} | {len(latencias):>8} | {p50:>9.2f} | {p95:>9.2f} | {p99:>9.2f}")
+        for error in self.errores[:5]:
+            print(f"  error: {error}")
+
+
+async def pedir_con_reintentos(conexion, resultados, **pedido):
+    """Reintenta mientras el servidor responda "ocupado" (contrapresión)."""
+    while True:
+        respuesta, latencia = await conexion.pedir(**pedido)
+        resultados.registrar(pedido["op"], latencia)
+        if respuesta["ok"] or respuesta["error"] != "ocupado":
+            return respuesta
+        resultados.rechazos += 1
+        await asyncio.sleep(respuesta.get("reintentar_ms", 50) / 1000)
+
+
+async def jugar_partidas(host, puerto, partidas, opciones, resultados, rng):
+    """Un cliente: juega partidas seguidas eligiendo columnas al azar."""
+    conexion = await Conexion.abrir(host, puerto)
+    try:
+        for i in range(partidas):
+            ficha = "X" if i % 2 == 0 else "O"
+            estado = await pedir_con_reintentos(conexion, resultados, op="nueva", ficha=ficha, **opciones)
+            while estado["ok"] and not estado["terminada"]:
+                # La fila de arriba del tablero (la primera) dice qué columnas siguen libres
+                validas = [col for col in range(COLUMNAS) if estado["tablero"][0][col] not in ("X", "O")]
+                estado = await pedir_con_reintentos(conexion, resultados, op="jugar", partida=estado["partida"],
+                                                    columna=rng.choice(validas))
+            if not estado["ok"]:
+                resultados.errores.append(estado["error"])
+                continue
+            ganador = estado["ganador"]
+            resultados.partidas["empate" if ganador is None else "cliente" if ganador == ficha else "servidor"] += 1
+            await pedir_con_reintentos(conexion, resultados, op="cerrar", partida=estado["partida"])
+    finally:
+        await conexion.cerrar()
+
+
+async def probar(host, puerto, clientes, partidas, opciones, trabajadores=None, semilla=0):
+    """
+    Corre clientes concurrentes contra el servidor en host:puerto. Con
+    trabajadores, primero levanta un servidor propio en este mismo proceso
+    (puerto libre) y lo cierra al final. Devuelve las métricas del servidor.
+    """
+    servidor = socket_servidor = None
+    if trabajadores is not None:
+        servidor = ServidorConnect4(trabajadores)
+        servidor.iniciar()
+        socket_servidor = await asyncio.start_server(servidor.atender_socket, host, 0, limit=MAX_LARGO_LINEA)
+        puerto = socket_servidor.sockets[0].getsockname()[1]
+    try:
+        resultados = ResultadosPrueba()
+        rng = random.Random(semilla)
+        inicio = time.perf_counter()
+        await asyncio.gather(*(jugar_partidas(host, puerto, partidas, opciones, resultados,
+                                              random.Random(rng.random())) for _ in range(clientes)))
+        resultados.imprimir(time.perf_counter() - inicio)
+        conexion = await Conexion.abrir(host, puerto)
+        metricas, _ = await conexion.pedir(op="metricas")
+        await conexion.cerrar()
+        return metricas
+    finally:
+        if servidor is not None:
+            socket_servidor.close()
+            await socket_servidor.wait_closed()
+            servidor.cerrar()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clientes de prueba concurrentes para servidor.py")
+    parser.add_argument("--host", default=HOST_POR_DEFECTO)
+    parser.add_argument("--puerto", type=int, default=PUERTO_POR_DEFECTO)
+    parser.add_argument("--clientes", type=int, default=N_CLIENTES)
+    parser.add_argument("--partidas", type=int, default=PARTIDAS_POR_CLIENTE, help="partidas por cliente")
+    parser.add_argument("--rival", default=JUGADOR_IA)
+    parser.add_argument("--profundidad", type=int, default=4)
+    parser.add_argument("--tiempo-ms", type=float, default=None)
+    parser.add_argument("--local", type=int, default=None, metavar="TRABAJADORES",
+                        help="levantar un servidor en este proceso con tantos trabajadores")
+    args = parser.parse_args()
+
+    opciones = {"rival": args.rival, "profundidad": args.profundidad, "tiempo_ms": args.tiempo_ms,
+                "motor": MOTOR_BITBOARD}
+    metricas = asyncio.run(probar(args.host, args.puerto, args.clientes, args.partidas, opciones, args.local))
+    print("\nMétricas del servidor:")
+    print(json.dumps(metricas, indent=2))
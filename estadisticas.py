@@ -0,0 +1,75 @@
+from ordenamiento import MAX_PLY
+
+
+class EstadisticasBusqueda:
+    """
+    Lo que pasó dentro de una búsqueda de Jugador.buscar: nodos, hojas
+    evaluadas, cortes por ply, uso de la tabla de transposición y tiempo
+    repartido entre evaluación y generación de jugadas.
+
+    Solo se llena si el jugador tiene instrumentar=True; si no, minimax no
+    toca ningún contador extra.
+    """
+    def __init__(self):
+        self.nodos = 0
+        self.hojas = 0 # Posiciones evaluadas con la heurística (profundidad 0)
+        self.terminales = 0 # Victorias, derrotas o empates encontrados
+        self.cortes_por_ply = [0] * MAX_PLY
+        self.tt_consultas = 0
+        self.tt_aciertos = 0 # Consultas que encontraron la posición
+        self.tt_cortes = 0 # Aciertos que resolvieron el nodo sin expandirlo
+        self.tt_guardados = 0
+        self.tiempo_evaluacion_ns = 0
+        self.tiempo_generacion_ns = 0 # Columnas válidas, análisis táctico y ordenamiento
+        self.profundidad = 0
+        self.tiempo_ms = 0.0
+        self.variacion = [] # Variación principal (lista de columnas)
+
+    def sumar(self, otra):
+        """Acumula los contadores de otra búsqueda (la de un trabajador de la búsqueda paralela)."""
+        self.nodos += otra.nodos
+        self.hojas += otra.hojas
+        self.terminales += otra.terminales
+        self.cortes_por_ply = [a + b for a, b in zip(self.cortes_por_ply, otra.cortes_por_ply)]
+        self.tt_consultas += otra.tt_consultas
+        self.tt_aciertos += otra.tt_aciertos
+        self.tt_cortes += otra.tt_cortes
+        self.tt_guardados += otra.tt_guardados
+        self.tiempo_evaluacion_ns += otra.tiempo_evaluacion_ns
+        self.tiempo_generacion_ns += otra.tiempo_generacion_ns
+
+    @property
+    def cortes(self):
+        return sum(self.cortes_por_ply)
+
+    @property
+    def tasa_aciertos_tt(self):
+        return self.tt_aciertos / self.tt_consultas if self.tt_consultas else 0.0
+
+    def como_dict(self):
+        """Diccionario plano (serializable a JSON) para logs y benchmarks."""
+        ultimo = max((ply for ply, cortes in enumerate(self.cortes_por_ply) if cortes), default=-1)
+        return {
+            "nodos": self.nodos,
+            "hojas": self.hojas,
+            "terminales": self.terminales,
+            "cortes": self.cortes,
+            "cortes_por_ply": self.cortes_por_ply[:ultimo + 1],
+            "tt_consultas": self.tt_consultas,
+            "tt_aciertos": self.tt_aciertos,
+            "tt_cortes": self.tt_cortes,
+            "tt_guardados": self.tt_guardados,
+            "tasa_aciertos_tt": self.tasa_aciertos_tt,
+            "tiempo_evaluacion_ms": self.tiempo_evaluacion_ns / 1e6,
+            "tiempo_generacion_ms": self.tiempo_generacion_ns / 1e6,
+            "profundidad": self.profundidad,
+            "tiempo_ms": self.tiempo_ms,
+            "variacion": list(self.variacion),
+        }
+
+    def __str__(self):
+        return (f"profundidad {self.profundidad}, {self.nodos} nodos, {self.hojas} hojas, "
+                f"{self.cortes} cortes, TT {self.tt_aciertos}/{self.tt_consultas} aciertos "
+                f"({self.tt_cortes} cortes, {self.tt_guardados} guardados), "
+                f"evaluación {self.tiempo_evaluacion_ns / 1e6:.1f} ms, "
+                f"generación {self.tiempo_generacion_ns / 1e6:.1f} ms, variación {self.variacion}")
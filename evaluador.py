@@ -0,0 +1,185 @@
+import numpy as np
+from geometria import FILAS, COLUMNAS, VACIO, bit_celda
+
+COL_CENTRO = COLUMNAS // 2
+PESO_CENTRO = 3
+
+
+def _generar_ventanas():
+    """Lista las 69 ventanas de 4 celdas en el mismo orden que Jugador.evaluar_posicion."""
+    ventanas = []
+    for r in range(FILAS):
+        for c in range(COLUMNAS - 3):
+            ventanas.append(tuple((r, c + i) for i in range(4)))
+    for c in range(COLUMNAS):
+        for r in range(FILAS - 3):
+            ventanas.append(tuple((r + i, c) for i in range(4)))
+    for r in range(FILAS - 3):
+        for c in range(COLUMNAS - 3):
+            ventanas.append(tuple((r + i, c + i) for i in range(4)))
+    for r in range(FILAS - 3):
+        for c in range(COLUMNAS - 3):
+            ventanas.append(tuple((r + 3 - i, c + i) for i in range(4)))
+    return ventanas
+
+
+def _puntaje_ventana(propias, rivales):
+    """Mismo puntaje que Jugador.evaluar_ventana, a partir de los conteos."""
+    vacias = 4 - propias - rivales
+    score = 0
+    if propias == 4:
+        score += 100
+    elif propias == 3 and vacias == 1:
+        score += 5
+    elif propias == 2 and vacias == 2:
+        score += 2
+    if rivales == 3 and vacias == 1:
+        score -= 4
+    return score
+
+
+# --- Tablas precalculadas ---
+VENTANAS = _generar_ventanas()
+N_VENTANAS = len(VENTANAS)
+
+# Índices de cada ventana sobre la grilla aplanada, forma (69, 4)
+INDICES_VENTANAS = np.array([[f * COLUMNAS + c for f, c in v] for v in VENTANAS])
+# Bitboard de cada ventana
+MASCARAS_VENTANAS = [sum(bit_celda(f, c) for f, c in v) for v in VENTANAS]
+MASCARA_CENTRO = sum(bit_celda(f, COL_CENTRO) for f in range(FILAS))
+# Ventanas que contienen cada celda: VENTANAS_POR_CELDA[fila][col]
+VENTANAS_POR_CELDA = [[tuple(i for i, v in enumerate(VENTANAS) if (f, c) in v)
+                       for c in range(COLUMNAS)] for f in range(FILAS)]
+
+# PUNTAJE[propias][rivales] (las combinaciones imposibles valen 0)
+PUNTAJE = [[_puntaje_ventana(p, r) if p + r <= 4 else 0 for r in range(5)] for p in range(5)]
+PUNTAJE_NP = np.array(PUNTAJE)
+# Cambio de puntaje al sumar una ficha propia / rival a una ventana
+DELTA_PROPIA = [[PUNTAJE[p + 1][r] - PUNTAJE[p][r] if p + r < 4 else 0 for r in range(5)] for p in range(4)]
+DELTA_RIVAL = [[PUNTAJE[p][r + 1] - PUNTAJE[p][r] if p + r < 4 else 0 for r in range(4)] for p in range(5)]
+
+
+def rival_de(ficha):
+    return "O" if ficha == "X" else "X"
+
+
+def evaluar_grid(grid, ficha_centro, ficha):
+    """Evalúa una grilla de strings en una sola pasada vectorizada sobre las 69 ventanas."""
+    celdas = grid.reshape(-1)[INDICES_VENTANAS]
+    propias = (celdas == ficha).sum(axis=1)
+    rivales = (celdas == rival_de(ficha)).sum(axis=1)
+    centro = int((grid[:, COL_CENTRO] == ficha_centro).sum())
+    return int(PUNTAJE_NP[propias, rivales].sum()) + centro * PESO_CENTRO
+
+
+def evaluar_bitboard(bits, ficha_centro, ficha):
+    """Evalúa un diccionario ficha -> bitboard contando bits de cada ventana."""
+    propias = bits.get(ficha, 0)
+    rivales = bits.get(rival_de(ficha), 0)
+    score = (bits.get(ficha_centro, 0) & MASCARA_CENTRO).bit_count() * PESO_CENTRO
+    for mascara in MASCARAS_VENTANAS:
+        score += PUNTAJE[(propias & mascara).bit_count()][(rivales & mascara).bit_count()]
+    return score
+
+
+class ConteoVentanas:
+    """
+    Fichas de cada jugador en cada ventana, actualizadas en cada jugada.
+    Mantiene el puntaje de ventanas de ambos jugadores, así evaluar una hoja
+    es O(1) y cada jugada o deshacer cuesta O(ventanas que tocan la celda).
+    """
+    def __init__(self):
+        self.conteos = {"X": [0] * N_VENTANAS, "O": [0] * N_VENTANAS}
+        self.puntaje = {"X": 0, "O": 0} # Suma de PUNTAJE de las ventanas según cada jugador
+        self.centro = {"X": 0, "O": 0}
+
+    @classmethod
+    def desde_grid(cls, grid):
+        conteo = cls()
+        for fila in range(FILAS):
+            for col in range(COLUMNAS):
+                if grid[fila][col] != VACIO:
+                    conteo.agregar(fila, col, grid[fila][col])
+        return conteo
+
+    def copiar(self):
+        copia = ConteoVentanas.__new__(ConteoVentanas)
+        copia.conteos = {ficha: list(c) for ficha, c in self.conteos.items()}
+        copia.puntaje = dict(self.puntaje)
+        copia.centro = dict(self.centro)
+        return copia
+
+    def agregar(self, fila, col, ficha):
+        rival = rival_de(ficha)
+        propias = self.conteos[ficha]
+        rivales = self.conteos[rival]
+        delta_ficha = delta_rival = 0
+        for w in VENTANAS_POR_CELDA[fila][col]:
+            p = propias[w]
+            r = rivales[w]
+            delta_ficha += DELTA_PROPIA[p][r]
+            delta_rival += DELTA_RIVAL[r][p]
+            propias[w] = p + 1
+        self.puntaje[ficha] += delta_ficha
+        self.puntaje[rival] += delta_rival
+        if col == COL_CENTRO:
+            self.centro[ficha] += 1
+
+    def quitar(self, fila, col, ficha):
+        rival = rival_de(ficha)
+        propias = self.conteos[ficha]
+        rivales = self.conteos[rival]
+        delta_ficha = delta_rival = 0
+        for w in VENTANAS_POR_CELDA[fila][col]:
+            p = propias[w] - 1
+            r = rivales[w]
+            delta_ficha += DELTA_PROPIA[p][r]
+            delta_rival += DELTA_RIVAL[r][p]
+            propias[w] = p
+        self.puntaje[ficha] -= delta_ficha
+        self.puntaje[rival] -= delta_rival
+        if col == COL_CENTRO:
+            self.centro[ficha] -= 1
+
+    def evaluar(self, ficha_centro, ficha):
+        return self.puntaje[ficha] + self.centro[ficha_centro] * PESO_CENTRO
+
+
+def verificar_paridad(cantidad_posiciones=2000, semilla=0):
+    """
+    Compara las tres evaluaciones con Jugador.evaluar_posicion_referencia
+    sobre posiciones aleatorias. Lanza AssertionError si alguna difiere.
+    """
+    import random
+    from back_end import Jugador, Tablero, JUGADOR_IA, MOTOR_BITBOARD
+
+    rng = random.Random(semilla)
+    jugadores = {"X": Jugador(JUGADOR_IA, "X", bytes_tt=0), "O": Jugador(JUGADOR_IA, "O", bytes_tt=0)}
+    for _ in range(cantidad_posiciones):
+        tablero = Tablero(MOTOR_BITBOARD)
+        conteo = ConteoVentanas()
+        ficha = rng.choice("XO")
+        for _ in range(rng.randint(0, FILAS * COLUMNAS)):
+            col = rng.choice(tablero.obtener_columnas_validas())
+            fila = tablero.insertar_ficha(col, ficha)
+            conteo.agregar(fila, col, ficha)
+            # Simulamos también algunas jugadas deshechas
+            if rng.random() < 0.2:
+                tablero.deshacer_ficha(col)
+                conteo.quitar(fila, col, ficha)
+            else:
+                ficha = rival_de(ficha)
+        grid = tablero.grid
+        for perspectiva, jugador in jugadores.items():
+            for ficha_centro in "XO":
+                esperado = jugador.evaluar_posicion_referencia(tablero, ficha_centro)
+                assert evaluar_grid(grid, ficha_centro, perspectiva) == esperado
+                assert evaluar_bitboard(tablero.bits, ficha_centro, perspectiva) == esperado
+                assert conteo.evaluar(ficha_centro, perspectiva) == esperado
+                assert ConteoVentanas.desde_grid(grid).evaluar(ficha_centro, perspectiva) == esperado
+    return cantidad_posiciones
+
+
+if __name__ == "__main__":
+    n = verificar_paridad()
+    print(f"[Éxito] Las evaluaciones coinciden con la referencia en {n} posiciones.")
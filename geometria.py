@@ -0,0 +1,63 @@
+FILAS = 6
+COLUMNAS = 7
+VACIO = " "
+
+# --- Constantes del bitboard ---
+# Cada columna ocupa ALTO bits (FILAS + 1 bit centinela), el bit de la celda
+# (fila, col) es col * ALTO + fila.
+ALTO = FILAS + 1
+FONDO = sum(1 << (c * ALTO) for c in range(COLUMNAS))
+MASCARA_TABLERO = FONDO * ((1 << FILAS) - 1)
+MASCARA_COLUMNA = [((1 << FILAS) - 1) << (col * ALTO) for col in range(COLUMNAS)]
+
+
+def bit_celda(fila, col):
+    """Devuelve el bit que representa la celda (fila, col)."""
+    return 1 << (col * ALTO + fila)
+
+
+def columna_de(bit):
+    """Columna de un bitboard con una sola celda."""
+    return (bit.bit_length() - 1) // ALTO
+
+
+def hay_cuatro_en_linea(bits):
+    """Revisa con desplazamientos y máscaras si hay 4 en línea en un bitboard."""
+    # 1: vertical, ALTO: horizontal, ALTO-1: diagonal ( \ ), ALTO+1: diagonal ( / )
+    for d in (1, ALTO, ALTO - 1, ALTO + 1):
+        m = bits & (bits >> d)
+        if m & (m >> (2 * d)):
+            return True
+    return False
+
+
+def espejar(bits):
+    """Refleja horizontalmente un bitboard (la columna c pasa a COLUMNAS - 1 - c)."""
+    columna = (1 << ALTO) - 1
+    espejo = 0
+    for c in range(COLUMNAS):
+        espejo |= ((bits >> (c * ALTO)) & columna) << ((COLUMNAS - 1 - c) * ALTO)
+    return espejo
+
+
+def celdas_ganadoras(bits, mascara):
+    """
+    Celdas vacías (alcanzables o no en la próxima jugada) que completarían un
+    4 en línea para las fichas de bits. mascara: todas las fichas del tablero.
+    """
+    # Vertical: solo hacia arriba de tres fichas seguidas
+    r = (bits << 1) & (bits << 2) & (bits << 3)
+    # ALTO: horizontal, ALTO-1: diagonal ( \ ), ALTO+1: diagonal ( / ); el hueco puede ir en cualquier posición
+    for d in (ALTO, ALTO - 1, ALTO + 1):
+        p = (bits << d) & (bits << 2 * d)
+        r |= p & (bits << 3 * d)
+        r |= p & (bits >> d)
+        p = (bits >> d) & (bits >> 2 * d)
+        r |= p & (bits << d)
+        r |= p & (bits >> 3 * d)
+    return r & (MASCARA_TABLERO ^ mascara)
+
+
+def jugadas_posibles(mascara):
+    """Bitboard con la celda donde caería la próxima ficha de cada columna no llena."""
+    return (mascara + FONDO) & MASCARA_TABLERO
@@ -1,7 +1,12 @@
+import argparse
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import messagebox
 import numpy as np
-from back_end import Tablero, Jugador, FILAS, COLUMNAS, VACIO, JUGADOR_HUMANO, JUGADOR_IA, JUGADOR_RANDOM
+from back_end import Tablero, Jugador, FILAS, COLUMNAS, VACIO, JUGADOR_HUMANO, JUGADOR_IA, JUGADOR_RANDOM, JUGADOR_SOLVER, JUGADOR_MCTS, MOTOR_BITBOARD
+from registro import RegistroJugadas, RUTA_REGISTRO_POR_DEFECTO
 
 TAMANO_CELDA = 80
 RADIO = 30
@@ -9,25 +14,45 @@ COLOR_FONDO = "#0055D4"
 COLOR_VACIO = "#FFFFFF"
 COLOR_J1 = "#FF3333"
 COLOR_J2 = "#FFFF33" 
+INTERVALO_SONDEO_MS = 50 # Cada cuánto se revisa la cola de la búsqueda en segundo plano
 
 class Connect4GUI:
     def __init__(
         self,
         root: tk.Tk, 
         jugador1_type: str = JUGADOR_HUMANO, 
-        jugador2_type: str = JUGADOR_IA
+        jugador2_type: str = JUGADOR_IA,
+        motor: str = MOTOR_BITBOARD,
+        registro: RegistroJugadas = None
     ):
         self.root = root
         self.root.title("Connect 4 - Proyecto 2")
         self.root.config(bg="black")
 
         # 1. Inicializar la lógica
-        self.jugador1 = Jugador(jugador1_type, "X")
-        self.jugador2 = Jugador(jugador2_type, "O")
-        self.tablero = Tablero()
+        # La IA pondera durante el turno de un humano
+        self.jugador1 = Jugador(jugador1_type, "X", ponderacion=jugador2_type == JUGADOR_HUMANO)
+        self.jugador2 = Jugador(jugador2_type, "O", ponderacion=jugador1_type == JUGADOR_HUMANO)
+        self.motor = motor
+        self.tablero = Tablero(self.motor)
         self.turno_actual = self.jugador1
         self.game_over = False
 
+        # Registro opcional de latencia, profundidad y nodos por jugada (se guarda al terminar la partida)
+        self.registro = registro
+        self._id_partida = registro.nueva_partida() if registro is not None else None
+        self._inicio_turno = time.perf_counter()
+
+        # Búsqueda en segundo plano: el hilo publica en la cola y la GUI la revisa con after.
+        # Cada búsqueda tiene un id; los mensajes de búsquedas canceladas se descartan.
+        self._cola = queue.Queue()
+        self._hilo = None
+        self._detener = threading.Event()
+        self._id_busqueda = 0
+        self._inicio_busqueda = None
+        self._turno_programado = None
+        self._sondeo = None
+
         # 2. Interfaz
         self.canvas = tk.Canvas(root, width=COLUMNAS * TAMANO_CELDA, height=FILAS * TAMANO_CELDA)
         self.canvas.pack()
@@ -35,8 +60,12 @@ class Connect4GUI:
         # Label inicial
         self.info_label = tk.Label(root, text="Iniciando...", font=("Arial", 14, "bold"), bg="black", fg="white")
         self.info_label.pack(pady=10)
+        self.progreso_label = tk.Label(root, text="", font=("Arial", 11), bg="black", fg="white")
+        self.progreso_label.pack()
         
         # Botones
+        self.btn_mover_ya = tk.Button(root, text="Mover ya", command=self.mover_ya, state=tk.DISABLED)
+        self.btn_mover_ya.pack(pady=5)
         self.btn_reset = tk.Button(root, text="Reiniciar Juego", command=self.reset_game)
         self.btn_reset.pack(pady=5)
         self.btn_main_menu = tk.Button(root, text="Main Menu", command=self.main_menu)
@@ -51,8 +80,8 @@ class Connect4GUI:
         self.dibujar_tablero()
 
         # 5. Turno inicial
-        if self.turno_actual.tipo_jugador in [JUGADOR_IA, JUGADOR_RANDOM]:
-            self.root.after(500, self.turno_ia)
+        if self.turno_actual.tipo_jugador in [JUGADOR_IA, JUGADOR_RANDOM, JUGADOR_SOLVER, JUGADOR_MCTS]:
+            self.programar_turno_ia(500)
 
     def actualizar_etiqueta(self):
         """Gestiona el color y texto del turno."""
@@ -112,6 +141,11 @@ class Connect4GUI:
 
     def ejecutar_jugada(self, col):
         """Inserta ficha, actualiza GUI, verifica victoria y cambia turno."""
+        if self.registro is not None:
+            # La IA cuenta desde que empezó a buscar; el humano, desde que empezó su turno
+            inicio = self._inicio_turno if self.turno_actual.tipo_jugador == JUGADOR_HUMANO else self._inicio_busqueda
+            self.registro.registrar(self._id_partida, self.tablero.movimientos + 1, self.turno_actual,
+                                    self.motor, (time.perf_counter() - inicio) * 1000)
         
         fila = self.tablero.insertar_ficha(col, self.turno_actual.ficha)
         
@@ -126,71 +160,180 @@ class Connect4GUI:
                 nombre_ganador = "Amarillo"
                 color_texto = COLOR_J2
 
+            self.terminar_partida()
+
             # Actualizamos la etiqueta con el texto y el color del ganador
             self.info_label.config(text=f"¡Ganó {nombre_ganador} ({self.turno_actual.tipo_jugador})!", fg=color_texto)
             
             # Actualizamos el popup
             messagebox.showinfo("Fin del juego", f"¡El jugador {nombre_ganador} ({self.turno_actual.tipo_jugador}) ha ganado!")
-            
-            self.game_over = True
             return
 
         # Verificar Empate
         if self.tablero.esta_lleno():
+            self.terminar_partida()
             self.info_label.config(text="¡Empate!", fg="black")
             messagebox.showinfo("Fin", "¡Empate!")
-            self.game_over = True
             return
 
         if self.turno_actual == self.jugador1:
             self.turno_actual = self.jugador2
         else:
             self.turno_actual = self.jugador1
+        self._inicio_turno = time.perf_counter()
         
         self.actualizar_etiqueta() 
 
-        if self.turno_actual.tipo_jugador in [JUGADOR_IA, JUGADOR_RANDOM]:
-            self.root.after(500, self.turno_ia)
+        if self.turno_actual.tipo_jugador in [JUGADOR_IA, JUGADOR_RANDOM, JUGADOR_SOLVER, JUGADOR_MCTS]:
+            self.programar_turno_ia(500)
+        else:
+            rival = self.jugador2 if self.turno_actual is self.jugador1 else self.jugador1
+            if rival.ponderacion:
+                rival.ponderar(self.tablero)
+
+    def programar_turno_ia(self, espera_ms):
+        self._turno_programado = self.root.after(espera_ms, self.turno_ia)
 
     def turno_ia(self):
-        """Ejecuta la lógica de la IA."""
+        """Lanza la búsqueda de la IA en un hilo, sin bloquear la ventana."""
+        self._turno_programado = None
         if self.game_over: 
             return
-            
-        col = self.turno_actual.elegir_columna(self.tablero)
-        if col is not None and self.tablero.es_columna_valida(col):
-            self.ejecutar_jugada(col)
-        else:
-            print("Error: IA eligió columna inválida")
+
+        self._id_busqueda += 1
+        self._detener = threading.Event()
+        self._inicio_busqueda = time.perf_counter()
+        self._hilo = threading.Thread(
+            target=self._buscar_en_segundo_plano,
+            args=(self.turno_actual, self.tablero.copiar(), self._id_busqueda, self._detener),
+            daemon=True,
+        )
+        self._hilo.start()
+        self.btn_mover_ya.config(state=tk.NORMAL)
+        self.progreso_label.config(text="Pensando...")
+        self._sondeo = self.root.after(INTERVALO_SONDEO_MS, self._revisar_cola)
+
+    def _buscar_en_segundo_plano(self, jugador, tablero, id_busqueda, detener):
+        """Corre en el hilo de búsqueda: solo se comunica con la GUI a través de la cola."""
+        def progreso(resultado):
+            self._cola.put(("progreso", id_busqueda, resultado))
+        col = jugador.elegir_columna(tablero, detener=detener, progreso=progreso)
+        self._cola.put(("jugada", id_busqueda, col))
+
+    def _revisar_cola(self):
+        """Procesa los mensajes del hilo de búsqueda (en el hilo de la GUI)."""
+        self._sondeo = None
+        while True:
+            try:
+                tipo, id_busqueda, dato = self._cola.get_nowait()
+            except queue.Empty:
+                break
+            if id_busqueda != self._id_busqueda:
+                continue # Mensaje de una búsqueda cancelada
+            if tipo == "progreso":
+                segundos = max(1e-9, dato.tiempo_ms / 1000)
+                self.progreso_label.config(
+                    text=f"Profundidad {dato.profundidad} | {dato.nodos / segundos:,.0f} nodos/s | "
+                         f"Mejor jugada: columna {dato.columna}")
+            else:
+                self._hilo = None
+                self.btn_mover_ya.config(state=tk.DISABLED)
+                segundos = time.perf_counter() - self._inicio_busqueda
+                self.progreso_label.config(text=f"Jugó columna {dato} en {segundos:.2f} s")
+                if dato is not None and self.tablero.es_columna_valida(dato):
+                    self.ejecutar_jugada(dato)
+                else:
+                    print("Error: IA eligió columna inválida")
+                return
+        self._sondeo = self.root.after(INTERVALO_SONDEO_MS, self._revisar_cola)
+
+    def mover_ya(self):
+        """Corta la búsqueda en curso: la IA juega lo mejor que encontró hasta ahora."""
+        self._detener.set()
+
+    def cancelar_busqueda(self):
+        """Descarta el turno programado y la búsqueda en curso, esperando que el hilo termine."""
+        if self._turno_programado is not None:
+            self.root.after_cancel(self._turno_programado)
+            self._turno_programado = None
+        if self._sondeo is not None:
+            self.root.after_cancel(self._sondeo)
+            self._sondeo = None
+        self._id_busqueda += 1
+        self._detener.set()
+        if self._hilo is not None:
+            # El jugador no admite dos búsquedas a la vez: esperamos a que corte
+            self._hilo.join()
+            self._hilo = None
+        self.btn_mover_ya.config(state=tk.DISABLED)
+        self.progreso_label.config(text="")
+        self.jugador1.detener_ponderacion()
+        self.jugador2.detener_ponderacion()
+
+    def terminar_partida(self):
+        """
+        Marca el fin de la partida. Corta la ponderación antes del aviso: el
+        rival de un humano pondera sin límite de tiempo y seguiría ocupando
+        una CPU hasta el próximo Reset o Menú Principal.
+        """
+        self.game_over = True
+        self.jugador1.detener_ponderacion()
+        self.jugador2.detener_ponderacion()
+        self.guardar_registro()
+
+    def guardar_registro(self):
+        """Agrega las jugadas registradas de la partida al CSV del registro."""
+        if self.registro is not None and len(self.registro):
+            self.registro.guardar()
 
     def reset_game(self):
-        self.tablero = Tablero()
+        self.cancelar_busqueda()
+        self.guardar_registro()
+        self.tablero = Tablero(self.motor)
+        self.jugador1.nueva_partida()
+        self.jugador2.nueva_partida()
         self.turno_actual = self.jugador1
         self.game_over = False
+        if self.registro is not None:
+            self._id_partida = self.registro.nueva_partida()
+        self._inicio_turno = time.perf_counter()
         
         self.actualizar_etiqueta()
         
         self.dibujar_tablero()
-        if self.turno_actual.tipo_jugador in [JUGADOR_IA, JUGADOR_RANDOM]:
-            self.root.after(1000, self.turno_ia)
+        if self.turno_actual.tipo_jugador in [JUGADOR_IA, JUGADOR_RANDOM, JUGADOR_SOLVER, JUGADOR_MCTS]:
+            self.programar_turno_ia(1000)
 
     def main_menu(self):
+        self.cancelar_busqueda()
+        self.guardar_registro()
         self.root.destroy()
         root = tk.Tk()
-        MainMenu(root)
+        # El menú conserva la opción de registro de esta partida
+        if self.registro is not None:
+            MainMenu(root, ruta_registro=self.registro.ruta, registrar=True)
+        else:
+            MainMenu(root)
         root.mainloop()
 
 class MainMenu:
-    def __init__(self, root):
+    """
+    Menú para elegir los jugadores. Las jugadas se registran (ver
+    RegistroJugadas) solo si se marca la opción; ruta_registro es el CSV
+    donde se agregan.
+    """
+    def __init__(self, root, ruta_registro=RUTA_REGISTRO_POR_DEFECTO, registrar=False):
         self.root = root
         self.root.title("Connect 4 - Menú Principal")
+        self.ruta_registro = ruta_registro
+        self.registrar = tk.BooleanVar(root, value=registrar)
 
         self.frame_principal = tk.Frame(root)
         self.frame_principal.pack(pady=20)
         centrar_ventana(
             root, 
             ancho=350, 
-            alto=250
+            alto=360
         )
         self.label = tk.Label(
             self.frame_principal,
@@ -222,10 +365,33 @@ class MainMenu:
             command=lambda: self.iniciar_partida(JUGADOR_IA, JUGADOR_IA)
         )
         self.btn_ai_vs_human.pack(pady=5)
+        self.btn_human_vs_solver = tk.Button(
+            self.frame_principal,
+            text="Humano vs Solver",
+            command=lambda: self.iniciar_partida(JUGADOR_HUMANO, JUGADOR_SOLVER)
+        )
+        self.btn_human_vs_solver.pack(pady=5)
+        self.btn_human_vs_mcts = tk.Button(
+            self.frame_principal,
+            text="Humano vs MCTS",
+            command=lambda: self.iniciar_partida(JUGADOR_HUMANO, JUGADOR_MCTS)
+        )
+        self.btn_human_vs_mcts.pack(pady=5)
+        self.check_registrar = tk.Checkbutton(
+            self.frame_principal,
+            text=f"Registrar jugadas en {self.ruta_registro}",
+            variable=self.registrar
+        )
+        self.check_registrar.pack(pady=5)
+
+    def crear_registro(self):
+        """El RegistroJugadas de la partida, o None si no se registran las jugadas."""
+        return RegistroJugadas(self.ruta_registro) if self.registrar.get() else None
 
     def iniciar_partida(self, j1, j2):
+        registro = self.crear_registro()
         self.root.destroy() 
-        juego = Connect4GUI(tk.Tk(), j1, j2)
+        juego = Connect4GUI(tk.Tk(), j1, j2, registro=registro)
         juego.root.mainloop()
 
 def centrar_ventana(root, ancho=None, alto=None):
@@ -244,6 +410,11 @@ def centrar_ventana(root, ancho=None, alto=None):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Connect4 con interfaz gráfica")
+    parser.add_argument("--registro", nargs="?", const=RUTA_REGISTRO_POR_DEFECTO, metavar="RUTA",
+                        help=f"registra las jugadas en RUTA (por defecto {RUTA_REGISTRO_POR_DEFECTO})")
+    args = parser.parse_args()
     root = tk.Tk()
-    gui = MainMenu(root)
+    gui = MainMenu(root, ruta_registro=args.registro or RUTA_REGISTRO_POR_DEFECTO,
+                   registrar=args.registro is not None)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,190 @@
+import mmap
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from geometria import COLUMNAS, FONDO, espejar
+from transposicion import PUNTAJE_VICTORIA
+
+# --- Formato del archivo ---
+# Encabezado: firma, versión, plies, profundidad de búsqueda, cantidad de registros.
+# Registros ordenados por clave: (clave de la posición, mejor columna, puntaje).
+FIRMA = b"C4LB"
+VERSION = 2
+ENCABEZADO = struct.Struct("<4sBBBxI")
+REGISTRO = struct.Struct("<Qbi")
+
+RUTA_POR_DEFECTO = "libro_aperturas.bin"
+# Las victorias (PUNTAJE_VICTORIA + profundidad restante) se guardan como
+# VICTORIA_LIBRO + profundidad restante, así entran en 32 bits sin perder la
+# distancia; los heurísticos son mucho menores que VICTORIA_LIBRO.
+VICTORIA_LIBRO = 1 << 30
+
+
+def clave_posicion(propias, rivales):
+    """Clave única de una posición vista por el jugador que mueve."""
+    return propias + (propias | rivales) + FONDO
+
+
+def clave_canonica(propias, rivales):
+    """
+    Clave de la posición o de su reflejo horizontal (la menor de ambas).
+    Devuelve (clave, espejada); si espejada, las columnas del libro están reflejadas.
+    """
+    clave = clave_posicion(propias, rivales)
+    clave_espejo = clave_posicion(espejar(propias), espejar(rivales))
+    if clave_espejo < clave:
+        return clave_espejo, True
+    return clave, False
+
+
+def _rival(ficha):
+    return "O" if ficha == "X" else "X"
+
+
+def empacar_puntaje(puntaje):
+    """Puntaje de minimax a los 32 bits del registro."""
+    if puntaje >= PUNTAJE_VICTORIA:
+        return VICTORIA_LIBRO + puntaje - PUNTAJE_VICTORIA
+    if puntaje <= -PUNTAJE_VICTORIA:
+        return -VICTORIA_LIBRO + puntaje + PUNTAJE_VICTORIA
+    return max(1 - VICTORIA_LIBRO, min(VICTORIA_LIBRO - 1, int(puntaje)))
+
+
+def desempacar_puntaje(puntaje):
+    """Inverso de empacar_puntaje: devuelve el puntaje en la escala de minimax."""
+    if puntaje >= VICTORIA_LIBRO:
+        return PUNTAJE_VICTORIA + puntaje - VICTORIA_LIBRO
+    if puntaje <= -VICTORIA_LIBRO:
+        return -PUNTAJE_VICTORIA + puntaje + VICTORIA_LIBRO
+    return puntaje
+
+
+class LibroAperturas:
+    """
+    Libro de aperturas de solo lectura. El archivo se mapea en memoria y cada
+    consulta es una búsqueda binaria sobre los registros, sin cargarlo en
+    objetos de Python.
+    """
+    def __init__(self, ruta=RUTA_POR_DEFECTO):
+        self._archivo = open(ruta, "rb")
+        self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        firma, version, self.plies, self.profundidad, self.cantidad = ENCABEZADO.unpack_from(self._mapa, 0)
+        if firma != FIRMA or version != VERSION:
+            raise ValueError(f"{ruta} no es un libro de aperturas válido")
+
+    def buscar(self, tablero, ficha):
+        """Devuelve (columna, puntaje) para la ficha que mueve, o None si la posición no está."""
+        if tablero.movimientos >= self.plies:
+            return None
+        bits = tablero.bitboards()
+        clave, espejada = clave_canonica(bits.get(ficha, 0), bits.get(_rival(ficha), 0))
+
+        # Búsqueda binaria sobre los registros del archivo
+        mapa = self._mapa
+        bajo, alto = 0, self.cantidad
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            clave_medio = struct.unpack_from("<Q", mapa, ENCABEZADO.size + medio * REGISTRO.size)[0]
+            if clave_medio < clave:
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo == self.cantidad:
+            return None
+        clave_encontrada, columna, puntaje = REGISTRO.unpack_from(mapa, ENCABEZADO.size + bajo * REGISTRO.size)
+        if clave_encontrada != clave:
+            return None
+        if espejada:
+            columna = COLUMNAS - 1 - columna
+        return columna, desempacar_puntaje(puntaje)
+
+    def cerrar(self):
+        self._mapa.close()
+        self._archivo.close()
+
+
+# --- Generación (offline) ---
+
+def _posiciones_hasta(plies):
+    """
+    Recorre las posiciones con menos de plies fichas (X empieza), sin repetir
+    posiciones equivalentes por simetría. Devuelve listas de jugadas.
+    """
+    from back_end import Tablero, MOTOR_BITBOARD
+
+    vistas = set()
+    frontera = [[]]
+    posiciones = []
+    for ply in range(plies):
+        siguiente = []
+        for jugadas in frontera:
+            tablero = Tablero(MOTOR_BITBOARD)
+            ficha = "X"
+            for col in jugadas:
+                tablero.insertar_ficha(col, ficha)
+                ficha = _rival(ficha)
+            if tablero.ganador is not None:
+                continue
+            clave, _ = clave_canonica(tablero.bits[ficha], tablero.bits[_rival(ficha)])
+            if clave in vistas:
+                continue
+            vistas.add(clave)
+            posiciones.append(jugadas)
+            siguiente.extend(jugadas + [col] for col in tablero.obtener_columnas_validas())
+        frontera = siguiente
+    return posiciones
+
+
+# Jugadores de cada proceso trabajador por (ficha, profundidad): la TT se
+# reutiliza entre posiciones en lugar de asignarla de nuevo en cada una.
+_jugadores = {}
+
+
+def _resolver_posicion(jugadas, profundidad):
+    """Busca una posición a la profundidad dada. Devuelve un registro (clave, columna, puntaje)."""
+    from back_end import Tablero, Jugador, JUGADOR_IA, MOTOR_BITBOARD
+
+    tablero = Tablero(MOTOR_BITBOARD)
+    ficha = "X"
+    for col in jugadas:
+        tablero.insertar_ficha(col, ficha)
+        ficha = _rival(ficha)
+    jugador = _jugadores.get((ficha, profundidad))
+    if jugador is None:
+        jugador = _jugadores[(ficha, profundidad)] = Jugador(JUGADOR_IA, ficha, profundidad=profundidad)
+    else:
+        # Cada posición se busca con la tabla y la historia vacías, como con un jugador nuevo
+        jugador.nueva_partida()
+        jugador.ordenador.reiniciar()
+    resultado = jugador.buscar(tablero)
+    clave, espejada = clave_canonica(tablero.bits[ficha], tablero.bits[_rival(ficha)])
+    columna = resultado.columna
+    if espejada:
+        columna = COLUMNAS - 1 - columna
+    return clave, columna, empacar_puntaje(resultado.puntaje)
+
+
+def generar_libro(ruta=RUTA_POR_DEFECTO, plies=6, profundidad=8, trabajadores=None):
+    """Busca todas las posiciones con menos de plies fichas y escribe el libro en ruta."""
+    inicio = time.time()
+    posiciones = _posiciones_hasta(plies)
+    print(f"Generando libro: {len(posiciones)} posiciones (plies < {plies}, profundidad {profundidad})")
+
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        registros = list(pool.map(_resolver_posicion, posiciones, [profundidad] * len(posiciones),
+                                  chunksize=16))
+    registros.sort()
+
+    with open(ruta, "wb") as archivo:
+        archivo.write(ENCABEZADO.pack(FIRMA, VERSION, plies, profundidad, len(registros)))
+        for registro in registros:
+            archivo.write(REGISTRO.pack(*registro))
+
+    tamano = ENCABEZADO.size + len(registros) * REGISTRO.size
+    print(f"[Éxito] Libro guardado en '{ruta}' ({tamano} bytes) en {time.time() - inicio:.1f} s")
+    return len(registros)
+
+
+if __name__ == "__main__":
+    generar_libro()
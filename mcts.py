@@ -0,0 +1,235 @@
+import math
+import time
+
+import numpy as np
+
+from geometria import FILAS, COLUMNAS, MASCARA_COLUMNA, hay_cuatro_en_linea, jugadas_posibles
+from simulacion_lotes import terminar_partidas, politica_tactica
+
+CASILLAS = FILAS * COLUMNAS
+
+ITERACIONES_POR_DEFECTO = 2000 # Hojas por jugada cuando no hay presupuesto de tiempo
+HOJAS_POR_LOTE = 32 # Hojas que se eligen antes de simularlas todas juntas
+SIMULACIONES_POR_HOJA = 8 # Partidas simuladas desde cada hoja (se promedian)
+EXPLORACION = 1.0 # Constante c de UCT
+CAPACIDAD_INICIAL = 1 << 14
+MAX_NODOS = 1 << 21 # Con el árbol lleno se simula desde el nodo sin expandirlo
+
+# Estado de un nodo
+NO_TERMINAL = 0
+GANADO = 1 # La jugada que llevó al nodo ganó la partida
+EMPATADO = 2
+
+ORDEN_COLUMNAS = sorted(range(COLUMNAS), key=lambda col: abs(col - COLUMNAS // 2))
+
+
+class ArbolMCTS:
+    """
+    Árbol de búsqueda Monte Carlo guardado en arreglos paralelos de NumPy:
+    el nodo i es la fila i de cada arreglo (sin un objeto por nodo).
+
+    Cada nodo guarda su posición como dos bitboards (fichas de quien mueve
+    y todas las fichas), su padre, sus hijos por columna (-1 si no se
+    expandió) y las visitas y la suma de resultados, vistos desde quien hizo
+    la jugada que llevó al nodo (así el padre elige el hijo de mayor valor).
+
+    Cada iteración elige HOJAS_POR_LOTE hojas con UCT, usando pérdida
+    virtual para no repetir caminos dentro del lote, las simula todas juntas
+    con simulacion_lotes.terminar_partidas y propaga los resultados.
+    """
+    def __init__(self, exploracion=EXPLORACION, hojas_por_lote=HOJAS_POR_LOTE,
+                 simulaciones_por_hoja=SIMULACIONES_POR_HOJA, politica=politica_tactica, semilla=None):
+        self.exploracion = exploracion
+        self.hojas_por_lote = hojas_por_lote
+        self.simulaciones_por_hoja = simulaciones_por_hoja
+        self.politica = politica
+        self.rng = np.random.default_rng(semilla)
+        self.simulaciones = 0 # Partidas simuladas (acumulado)
+        self._reservar(CAPACIDAD_INICIAL)
+        self.limpiar()
+
+    def _reservar(self, capacidad):
+        self.capacidad = capacidad
+        self.actual = np.zeros(capacidad, dtype=np.uint64)
+        self.mascara = np.zeros(capacidad, dtype=np.uint64)
+        self.padre = np.full(capacidad, -1, dtype=np.int32)
+        self.hijos = np.full((capacidad, COLUMNAS), -1, dtype=np.int32)
+        self.visitas = np.zeros(capacidad, dtype=np.float64)
+        self.valor = np.zeros(capacidad, dtype=np.float64)
+        self.estado = np.zeros(capacidad, dtype=np.int8)
+
+    def _crecer(self):
+        """Duplica la capacidad copiando los nodos existentes."""
+        n = self.cantidad
+        anteriores = (self.actual, self.mascara, self.padre, self.hijos, self.visitas, self.valor, self.estado)
+        self._reservar(min(self.capacidad * 2, MAX_NODOS))
+        for nuevo, viejo in zip((self.actual, self.mascara, self.padre, self.hijos, self.visitas, self.valor,
+                                 self.estado), anteriores):
+            nuevo[:n] = viejo[:n]
+
+    def limpiar(self):
+        self.cantidad = 0
+        self.raiz = -1
+        self.profundidad_maxima = 0 # Plies del camino más largo seleccionado desde la raíz actual
+
+    def _nuevo_nodo(self, actual, mascara, padre, estado):
+        if self.cantidad == self.capacidad:
+            self._crecer()
+        nodo = self.cantidad
+        self.cantidad += 1
+        self.actual[nodo] = actual
+        self.mascara[nodo] = mascara
+        self.padre[nodo] = padre
+        self.hijos[nodo] = -1
+        self.visitas[nodo] = 0
+        self.valor[nodo] = 0
+        self.estado[nodo] = estado
+        return nodo
+
+    def posicionar(self, actual, mascara):
+        """
+        Ubica la raíz en la posición dada (actual: fichas de quien mueve).
+        Si es un hijo o nieto de la raíz anterior se reutiliza ese subárbol;
+        si no (o el árbol está lleno), se empieza uno nuevo.
+        """
+        if self.raiz >= 0 and self.cantidad < MAX_NODOS:
+            candidatos = [self.raiz]
+            for _ in range(2):
+                hijos = self.hijos[candidatos]
+                candidatos = hijos[hijos >= 0].tolist()
+                for nodo in candidatos:
+                    if self.mascara[nodo] == mascara and self.actual[nodo] == actual:
+                        self.raiz = nodo
+                        self.padre[nodo] = -1 # La propagación se detiene en la nueva raíz
+                        self.profundidad_maxima = 0
+                        return
+        self.limpiar()
+        self.raiz = self._nuevo_nodo(actual, mascara, -1, NO_TERMINAL)
+
+    def _expandir(self, nodo):
+        """Agrega el primer hijo sin expandir (del centro hacia afuera). Devuelve None si no quedan."""
+        mascara = int(self.mascara[nodo])
+        posibles = jugadas_posibles(mascara)
+        hijos = self.hijos[nodo]
+        for col in ORDEN_COLUMNAS:
+            celda = posibles & MASCARA_COLUMNA[col]
+            if celda and hijos[col] < 0:
+                propias = int(self.actual[nodo]) | celda
+                if hay_cuatro_en_linea(propias):
+                    estado = GANADO
+                elif (mascara | celda).bit_count() == CASILLAS:
+                    estado = EMPATADO
+                else:
+                    estado = NO_TERMINAL
+                hijo = self._nuevo_nodo(propias ^ (mascara | celda), mascara | celda, nodo, estado)
+                hijos[col] = hijo
+                return hijo
+        return None
+
+    def _seleccionar(self):
+        """
+        Baja desde la raíz por el hijo de mayor UCT hasta un nodo terminal o
+        uno con jugadas sin expandir, y expande una. Marca el camino con una
+        pérdida virtual (visita + 1, valor - 1) que propagar() corrige.
+        """
+        nodo = self.raiz
+        plies = 0
+        while True:
+            self.visitas[nodo] += 1
+            self.valor[nodo] -= 1
+            if self.estado[nodo] != NO_TERMINAL:
+                break
+            if self.cantidad < MAX_NODOS:
+                hijo = self._expandir(nodo)
+                if hijo is not None:
+                    self.visitas[hijo] += 1
+                    self.valor[hijo] -= 1
+                    nodo = hijo
+                    plies += 1
+                    break
+            hijos = self.hijos[nodo]
+            hijos = hijos[hijos >= 0]
+            if not len(hijos):
+                break # Árbol lleno: se simula desde aquí
+            visitas = self.visitas[hijos]
+            uct = self.valor[hijos] / visitas + self.exploracion * np.sqrt(math.log(self.visitas[nodo]) / visitas)
+            nodo = int(hijos[uct.argmax()])
+            plies += 1
+        self.profundidad_maxima = max(self.profundidad_maxima, plies)
+        return nodo
+
+    def _propagar(self, nodo, resultado):
+        """resultado: desde quien hizo la jugada que llevó a nodo, en [-1, 1]."""
+        while nodo >= 0:
+            self.valor[nodo] += resultado + 1 # + 1: se deshace la pérdida virtual
+            resultado = -resultado
+            nodo = self.padre[nodo]
+
+    def iterar(self):
+        """Elige un lote de hojas, las simula juntas y propaga. Devuelve cuántas hojas procesó."""
+        hojas = [self._seleccionar() for _ in range(self.hojas_por_lote)]
+        abiertas = [hoja for hoja in hojas if self.estado[hoja] == NO_TERMINAL]
+        resultados = {}
+        if abiertas:
+            # Cada hoja abierta se simula varias veces; el resultado es desde quien mueve en la hoja
+            indices = np.repeat(np.array(abiertas), self.simulaciones_por_hoja)
+            simulado = terminar_partidas(self.actual[indices], self.mascara[indices], self.politica, self.rng)
+            promedios = simulado.reshape(-1, self.simulaciones_por_hoja).mean(axis=1)
+            resultados = dict(zip(abiertas, (-promedios).tolist()))
+            self.simulaciones += len(indices)
+        for hoja in hojas:
+            if self.estado[hoja] == GANADO:
+                self._propagar(hoja, 1.0)
+            elif self.estado[hoja] == EMPATADO:
+                self._propagar(hoja, 0.0)
+            else:
+                self._propagar(hoja, resultados[hoja])
+        return len(hojas)
+
+    def mejor_columna(self):
+        """(columna más visitada desde la raíz, su valor medio en [-1, 1])."""
+        hijos = self.hijos[self.raiz]
+        columnas = np.flatnonzero(hijos >= 0)
+        visitas = self.visitas[hijos[columnas]]
+        col = int(columnas[visitas.argmax()])
+        hijo = hijos[col]
+        return col, float(self.valor[hijo] / max(1.0, self.visitas[hijo]))
+
+    def variacion_principal(self, largo=CASILLAS):
+        """Columnas del camino más visitado desde la raíz."""
+        variacion = []
+        nodo = self.raiz
+        while len(variacion) < largo and self.estado[nodo] == NO_TERMINAL:
+            hijos = self.hijos[nodo]
+            columnas = np.flatnonzero(hijos >= 0)
+            if not len(columnas):
+                break
+            col = int(columnas[self.visitas[hijos[columnas]].argmax()])
+            variacion.append(col)
+            nodo = hijos[col]
+        return variacion
+
+    def buscar(self, actual, mascara, iteraciones=None, tiempo_ms=None, detener=None, progreso=None):
+        """
+        Corre iteraciones hojas (o hasta tiempo_ms, o hasta que se active
+        detener) desde la posición dada. progreso(hojas, segundos) se llama
+        después de cada lote. Devuelve (columna, valor, hojas).
+        """
+        self.posicionar(actual, mascara)
+        if iteraciones is None and tiempo_ms is None:
+            iteraciones = ITERACIONES_POR_DEFECTO
+        limite = time.perf_counter() + tiempo_ms / 1000 if tiempo_ms is not None else None
+        inicio = time.perf_counter()
+        hojas = 0
+        while True:
+            hojas += self.iterar()
+            if progreso is not None:
+                progreso(hojas, time.perf_counter() - inicio)
+            if iteraciones is not None and hojas >= iteraciones:
+                break
+            if limite is not None and time.perf_counter() > limite:
+                break
+            if detener is not None and detener.is_set():
+                break
+        columna, valor = self.mejor_columna()
+        return columna, valor, hojas
@@ -0,0 +1,97 @@
+MAX_PLY = 64 # Más que las 42 jugadas posibles de una partida
+
+
+class OrdenadorJugadas:
+    """
+    Ordena las columnas a explorar en cada nodo de minimax:
+    1. la mejor jugada guardada en la tabla de transposición,
+    2. las jugadas killer del mismo ply (las que produjeron cortes en nodos hermanos),
+    3. el resto según la tabla de historia y, a igualdad, del centro hacia afuera.
+
+    Cualquier objeto con los métodos ordenar, registrar_corte y
+    nueva_busqueda puede reemplazarlo en Jugador.
+
+    Las killers van en una lista plana (las dos del ply p en 2p y 2p + 1),
+    no en una lista por ply: cada jugador IA lleva un ordenador.
+    """
+    __slots__ = ("usar_tt", "usar_killers", "usar_historia", "rango", "columnas", "killers", "historia",
+                 "cortes", "cortes_primera")
+
+    def __init__(self, columnas, usar_tt=True, usar_killers=True, usar_historia=True):
+        self.usar_tt = usar_tt
+        self.usar_killers = usar_killers
+        self.usar_historia = usar_historia
+
+        # Rango estático: 0 para la columna central, creciendo hacia los bordes
+        centro = columnas // 2
+        self.rango = [abs(col - centro) * 2 + (col > centro) for col in range(columnas)]
+        self.columnas = columnas
+
+        self.killers = [None] * (2 * MAX_PLY)
+        self.historia = {"X": [0] * columnas, "O": [0] * columnas}
+
+        # Contadores
+        self.cortes = 0
+        self.cortes_primera = 0 # Cortes producidos por la primera jugada explorada
+
+    @property
+    def tasa_corte_primera(self):
+        """Fracción de cortes que ocurrieron con la primera jugada."""
+        return self.cortes_primera / self.cortes if self.cortes else 0.0
+
+    def ordenar(self, validas, ply, ficha, jugada_tt=None):
+        """Devuelve las columnas válidas en el orden en que conviene explorarlas."""
+        if self.usar_historia:
+            historia = self.historia[ficha]
+            rango = self.rango
+            orden = sorted(validas, key=lambda col: (-historia[col], rango[col]))
+        else:
+            orden = sorted(validas, key=self.rango.__getitem__)
+
+        primeras = []
+        if self.usar_tt and jugada_tt is not None and jugada_tt in validas:
+            primeras.append(jugada_tt)
+        if self.usar_killers and ply < MAX_PLY:
+            for killer in self.killers[2 * ply:2 * ply + 2]:
+                if killer is not None and killer in validas and killer not in primeras:
+                    primeras.append(killer)
+        if not primeras:
+            return orden
+        return primeras + [col for col in orden if col not in primeras]
+
+    def registrar_corte(self, col, indice, ply, ficha, profundidad):
+        """Registra que la jugada col (en la posición indice del orden) produjo un corte."""
+        self.cortes += 1
+        if indice == 0:
+            self.cortes_primera += 1
+        if self.usar_killers and ply < MAX_PLY:
+            killers = self.killers
+            if killers[2 * ply] != col:
+                killers[2 * ply + 1] = killers[2 * ply]
+                killers[2 * ply] = col
+        if self.usar_historia:
+            self.historia[ficha][col] += profundidad * profundidad
+
+    def reiniciar(self):
+        """Vacía killers, historia y contadores, como en un ordenador nuevo."""
+        self.killers = [None] * (2 * MAX_PLY)
+        for historia in self.historia.values():
+            historia[:] = [0] * self.columnas
+        self.cortes = 0
+        self.cortes_primera = 0
+
+    def nueva_busqueda(self, plies_jugados=0):
+        """
+        Prepara una nueva búsqueda: killers vacías e historia envejecida.
+        plies_jugados: si la raíz nueva es la posición que la búsqueda
+        anterior veía a esa distancia, sus killers se conservan corridas.
+        """
+        if plies_jugados:
+            self.killers = self.killers[2 * plies_jugados:] + [None] * (2 * plies_jugados)
+        else:
+            self.killers = [None] * (2 * MAX_PLY)
+        for historia in self.historia.values():
+            for col in range(self.columnas):
+                historia[col] //= 2
+        self.cortes = 0
+        self.cortes_primera = 0
@@ -0,0 +1,275 @@
+import copy
+import math
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from back_end import Jugador, ResultadoBusqueda, TiempoAgotado, JUGADOR_IA, FILAS, COLUMNAS, PUNTAJE_VICTORIA
+from estadisticas import EstadisticasBusqueda
+from reportes import REPORTERO_NULO
+from transposicion import BYTES_TT_POR_DEFECTO, TablaTransposicionCompartida
+
+INTERVALO_DETENER_S = 0.01 # Cada cuánto se revisa el evento detener del llamador mientras trabajan los procesos
+
+# --- Estado de cada proceso trabajador ---
+_alpha_compartido = None
+_detener_raiz = None
+_bytes_tt = BYTES_TT_POR_DEFECTO
+_configuracion = {} # Ver configuracion_de
+_jugadores = {} # ficha -> Jugador del proceso (conserva su TT entre tareas)
+_busqueda_actual = None
+# Lazy SMP
+_tt_compartida = None
+_detener = None
+_ayudantes = {} # ficha -> Jugador ayudante del proceso
+
+
+def configuracion_de(jugador):
+    """
+    Opciones de jugador que copian los jugadores de los trabajadores, así la
+    búsqueda paralela elige como lo haría él (el ordenador va como modelo).
+    """
+    return {"analisis_amenazas": jugador.analisis_amenazas, "ordenador": jugador.ordenador,
+            "instrumentar": jugador.instrumentar}
+
+
+def _crear_jugador(ficha, bytes_tt, **cambios):
+    """Jugador de un trabajador con la configuración del llamador y un ordenador propio."""
+    configuracion = {**_configuracion, **cambios}
+    configuracion["ordenador"] = copy.deepcopy(configuracion.get("ordenador"))
+    return Jugador(JUGADOR_IA, ficha, bytes_tt=bytes_tt, reportero=REPORTERO_NULO, **configuracion)
+
+
+def _inicializar_trabajador(alpha_compartido, detener, bytes_tt, configuracion):
+    global _alpha_compartido, _detener_raiz, _bytes_tt, _configuracion
+    _alpha_compartido = alpha_compartido
+    _detener_raiz = detener
+    _bytes_tt = bytes_tt
+    _configuracion = configuracion
+
+
+def _jugador_del_proceso(ficha, id_busqueda):
+    """Jugador propio del proceso. Su TT se limpia al empezar cada búsqueda nueva."""
+    global _busqueda_actual
+    jugador = _jugadores.get(ficha)
+    if jugador is None:
+        jugador = _jugadores[ficha] = _crear_jugador(ficha, _bytes_tt)
+    if _busqueda_actual != id_busqueda:
+        _busqueda_actual = id_busqueda
+        for j in _jugadores.values():
+            j.nueva_partida()
+    return jugador
+
+
+def _buscar_jugada_raiz(tablero, ficha, col, profundidad, id_busqueda, limite):
+    """
+    Evalúa una jugada de la raíz en un proceso trabajador.
+    limite: instante (time.time()) en que se corta la búsqueda, o None.
+    Devuelve (col, valor, nodos, estadisticas), con valor None si se acabó
+    el tiempo o se activó el evento detener, y estadisticas None si el
+    jugador no instrumenta.
+    """
+    jugador = _jugador_del_proceso(ficha, id_busqueda)
+    nodos_inicio = jugador.nodos
+    tablero.activar_conteo()
+    tablero.insertar_ficha(col, ficha)
+    if tablero.ganador == ficha:
+        return col, PUNTAJE_VICTORIA + profundidad, 1, None
+
+    # La cota inferior se baja en 1: así las jugadas que empatan con la mejor
+    # devuelven su valor exacto y el desempate por orden es determinista.
+    alpha = _alpha_compartido.value - 1
+    jugador.ordenador.nueva_busqueda()
+    if limite is not None:
+        jugador._limite = time.perf_counter() + (limite - time.time())
+    jugador._detener = _detener_raiz
+    estadisticas = EstadisticasBusqueda() if jugador.instrumentar else None
+    jugador._estadisticas = estadisticas
+    try:
+        _, valor = jugador.minimax(tablero, profundidad - 1, alpha, math.inf, False, 1)
+    except TiempoAgotado:
+        return col, None, jugador.nodos - nodos_inicio, estadisticas
+    finally:
+        jugador._limite = None
+        jugador._detener = None
+        jugador._estadisticas = None
+
+    with _alpha_compartido.get_lock():
+        if valor > _alpha_compartido.value:
+            _alpha_compartido.value = valor
+    return col, valor, jugador.nodos - nodos_inicio, estadisticas
+
+
+class BusquedaRaizParalela:
+    """
+    Reparte las jugadas de la raíz entre procesos. Cada trabajador busca una
+    jugada con alpha-beta, partiendo del mejor valor encontrado hasta el momento
+    por los demás (alpha compartido) y lo actualiza al terminar.
+
+    configuracion: opciones del jugador que se copian en los trabajadores
+    (ver configuracion_de); con instrumentar, el resultado trae la suma de
+    las EstadisticasBusqueda de todos.
+    """
+    def __init__(self, trabajadores, bytes_tt=BYTES_TT_POR_DEFECTO, configuracion=None):
+        self.trabajadores = trabajadores
+        self.instrumentar = bool(configuracion and configuracion.get("instrumentar"))
+        self._alpha = multiprocessing.Value('d', -math.inf)
+        # El evento detener del llamador (de un hilo) se reenvía a los trabajadores por este
+        self._detener = multiprocessing.Event()
+        self._pool = ProcessPoolExecutor(
+            max_workers=trabajadores,
+            initializer=_inicializar_trabajador,
+            initargs=(self._alpha, self._detener, bytes_tt, configuracion or {}),
+        )
+        self._id_busqueda = 0
+
+    def _buscar_profundidad(self, tablero, ficha, profundidad, orden, limite, detener, estadisticas):
+        """
+        Busca todas las jugadas de la raíz a una profundidad. None si se
+        acabó el tiempo o se activó detener.
+        """
+        self._alpha.value = -math.inf
+        futuros = [
+            self._pool.submit(_buscar_jugada_raiz, tablero, ficha, col, profundidad, self._id_busqueda, limite)
+            for col in orden
+        ]
+        if detener is not None:
+            while wait(futuros, timeout=INTERVALO_DETENER_S).not_done:
+                if detener.is_set():
+                    self._detener.set()
+        resultados = [futuro.result() for futuro in futuros]
+        nodos = sum(r[2] for r in resultados)
+        if estadisticas is not None:
+            for *_, estadisticas_trabajador in resultados:
+                if estadisticas_trabajador is not None:
+                    estadisticas.sumar(estadisticas_trabajador)
+        if any(valor is None for _, valor, _, _ in resultados):
+            return None, nodos
+
+        # Mayor valor; a igualdad gana la jugada que va antes en el orden
+        mejor_col, mejor_valor = orden[0], -math.inf
+        for col, valor, _, _ in resultados:
+            if valor > mejor_valor:
+                mejor_col, mejor_valor = col, valor
+        return (mejor_col, mejor_valor), nodos
+
+    def buscar(self, tablero, ficha, profundidad_max, tiempo_ms=None, detener=None, progreso=None):
+        """
+        Profundización iterativa con la raíz repartida entre procesos. El
+        plazo rige desde la segunda profundidad; el evento detener corta a
+        los trabajadores en cualquier momento (si corta la primera, se juega
+        la primera jugada del orden).
+        """
+        inicio = time.perf_counter()
+        self._id_busqueda += 1
+        self._detener.clear()
+        estadisticas = EstadisticasBusqueda() if self.instrumentar else None
+        limite = time.time() + tiempo_ms / 1000 if tiempo_ms is not None else None
+        casillas_vacias = FILAS * COLUMNAS - tablero.movimientos
+        profundidad_max = max(1, min(profundidad_max, casillas_vacias))
+
+        tablero = tablero.copiar()
+        centro = COLUMNAS // 2
+        orden = sorted(tablero.obtener_columnas_validas(), key=lambda col: abs(col - centro))
+        columna, puntaje, profundidad_completa, nodos = None, None, 0, 0
+
+        for profundidad in range(1, profundidad_max + 1):
+            # El plazo no corta la primera profundidad (detener sí)
+            resultado, nodos_iteracion = self._buscar_profundidad(
+                tablero, ficha, profundidad, orden, limite if profundidad > 1 else None, detener, estadisticas)
+            nodos += nodos_iteracion
+            if resultado is None:
+                break
+            columna, puntaje = resultado
+            profundidad_completa = profundidad
+            # La mejor jugada de esta iteración se busca primero en la siguiente
+            orden.remove(columna)
+            orden.insert(0, columna)
+            if progreso is not None:
+                progreso(ResultadoBusqueda(columna, puntaje, profundidad, nodos,
+                                           (time.perf_counter() - inicio) * 1000, [columna]))
+            if abs(puntaje) >= PUNTAJE_VICTORIA:
+                break
+            if limite is not None and time.time() > limite:
+                break
+            if detener is not None and detener.is_set():
+                break
+
+        if columna is None:
+            columna = orden[0] # Cortada antes de completar una profundidad
+        tiempo_ms = (time.perf_counter() - inicio) * 1000
+        if estadisticas is not None:
+            estadisticas.nodos = nodos
+            estadisticas.profundidad = profundidad_completa
+            estadisticas.tiempo_ms = tiempo_ms
+            estadisticas.variacion = [columna]
+        return ResultadoBusqueda(columna, puntaje, profundidad_completa, nodos, tiempo_ms, [columna], estadisticas)
+
+    def cerrar(self):
+        self._detener.set()
+        self._pool.shutdown(cancel_futures=True)
+
+
+def _inicializar_ayudante(nombre_tt, bytes_tt, detener, configuracion):
+    global _tt_compartida, _detener, _configuracion
+    _tt_compartida = TablaTransposicionCompartida(bytes_tt, nombre=nombre_tt)
+    _detener = detener
+    _configuracion = configuracion
+
+
+def _buscar_ayudante(tablero, ficha, id_ayudante, limite, profundidad_max, generacion):
+    """
+    Profundización iterativa de un ayudante de Lazy SMP sobre la TT compartida.
+    Los ayudantes pares empiezan una profundidad más adelante que los impares,
+    así llenan la tabla con entradas que el trabajador principal aún no tiene.
+    generacion: la de la TT del principal, para que la política de reemplazo
+    no trate como viejas las entradas de los demás.
+    Devuelve la cantidad de nodos visitados.
+    """
+    _tt_compartida.generacion = generacion
+    jugador = _ayudantes.get(ficha)
+    if jugador is None:
+        # Las estadísticas de los ayudantes no se usan: solo cuenta el principal
+        jugador = _ayudantes[ficha] = _crear_jugador(ficha, 0, instrumentar=False)
+        jugador.tt = _tt_compartida
+    tiempo_ms = None if limite is None else max(0.0, (limite - time.time()) * 1000)
+    resultado = jugador.buscar(tablero, tiempo_ms, profundidad_max, detener=_detener,
+                               profundidad_inicial=1 + id_ayudante % 2)
+    return resultado.nodos
+
+
+class BusquedaLazySMP:
+    """
+    Lazy SMP: el proceso principal y trabajadores - 1 ayudantes buscan la
+    misma posición compartiendo una tabla de transposición en memoria
+    compartida. Solo se usa el resultado del principal; los ayudantes se
+    detienen cuando este termina o se acaba el tiempo. Los ayudantes copian
+    la configuracion del principal (ver configuracion_de).
+    """
+    def __init__(self, trabajadores, bytes_tt=BYTES_TT_POR_DEFECTO, configuracion=None):
+        self.trabajadores = trabajadores
+        self.tt = TablaTransposicionCompartida(bytes_tt)
+        self._detener = multiprocessing.Event()
+        self._pool = ProcessPoolExecutor(
+            max_workers=max(1, trabajadores - 1),
+            initializer=_inicializar_ayudante,
+            initargs=(self.tt.nombre, bytes_tt, self._detener, configuracion or {}),
+        )
+
+    def buscar(self, jugador, tablero, tiempo_ms, profundidad_max, detener=None, progreso=None):
+        """Busca con jugador (cuya TT debe ser self.tt) mientras los ayudantes llenan la tabla."""
+        limite = time.time() + tiempo_ms / 1000 if tiempo_ms is not None else None
+        self._detener.clear()
+        futuros = [
+            self._pool.submit(_buscar_ayudante, tablero, jugador.ficha, i, limite, profundidad_max, self.tt.generacion)
+            for i in range(1, self.trabajadores)
+        ]
+        resultado = jugador.buscar(tablero, tiempo_ms, profundidad_max, detener=detener, progreso=progreso)
+        self._detener.set()
+        resultado.nodos += sum(futuro.result() for futuro in futuros)
+        return resultado
+
+    def cerrar(self):
+        self._detener.set()
+        self._pool.shutdown(cancel_futures=True)
+        self.tt.cerrar()
@@ -1,121 +1,102 @@
+import argparse
+import glob
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+from registro import RUTA_REGISTRO_POR_DEFECTO
+
+# Colores y marcadores de cada ficha (mismos que la GUI)
+ESTILOS = {
+    "X": {"color": '#ff3333', "marker": 's', "nombre": 'jugador1'},
+    "O": {"color": '#ffff00', "marker": 'd', "nombre": 'jugador2'},
+}
+
 # --- 1. DATOS ---
-data_str = """(X)    46.083    38.254    53.367    45.9013333333333    7.55813762333905
-(O)    77.799    73.27    77.263    76.1106666666667    2.47464428420195
-(X)    0.456    0.211    0.34    0.335666666666667    0.122557469512606
-(O)    0.443    0.468    0.277    0.396    0.103812330674154
-(X)    49.847    48.91    61.574    53.4436666666667    7.0566445520044
-(O)    40.69    50.649    50.769    47.3693333333333    5.78478351654868
-(X)    0.434    0.514    0.489    0.479    0.0409267638593623
-(O)    0.42    0.294    0.505    0.406333333333333    0.106161826158621
-(X)    71.83    67.926    81.75    73.8353333333333    7.1268341732731
-(O)    69.174    73.495    78.262    73.6436666666667    4.54582361441063
-(X)    0.7    0.339    0.391    0.476666666666667    0.195152077450724
-(O)    0.424    0.308    0.121    0.284333333333333    0.152880127332931
-(X)    39.495    41.541    40.061    40.3656666666667    1.05647779594904
-(O)    38.289    47.665    48.77    44.908    5.75878693823621
-(X)    0.707    0.316    0.245    0.422666666666667    0.248785717703676
-(O)    0.518    0.302    0.685    0.501666666666667    0.192021700162595
-(X)    31.813    33.896    40.732    35.4803333333333    4.66580371783183
-(O)    34.275    36.899    49.595    40.2563333333333    8.19325120653171
-(X)    0.414    0.26    0.531    0.401666666666667    0.135920319795582
-(O)    0.429    0.363    0.484    0.425333333333333    0.0605832760201471
-(X)    16.741    6.31    11.268    11.4396666666667    5.21761845417364
-(O)    12.488    11.085    12.423    11.9986666666667    0.791925712004183
-(X)    0.431    0.412    0.449    0.430666666666667    0.0185022521151706
-(O)    0.453    0.406    0.434    0.431    0.0236431808350738
-(X)    15.585    5.87    10.319    10.5913333333333    4.86322221714506
-(O)    6.325    7.019    2.028    5.124    2.70357559539215
-(X)    0.105    0.365    0.469    0.313    0.187488666324127"""
-
-lines = data_str.strip().split('\n')
-xy_data = []
-
-# Procesamos y extraemos MEDIA (índice 4) y STD (índice 5)
-jugada_count = 1
-
-# Usamos range con paso de 2 para ir pares. 
-# Si el número de líneas es impar (como ahora, 27), el loop captura la última correctamente
-for i in range(0, len(lines), 2):
-    # Datos de X (línea i)
-    parts_x = lines[i].split()
-    mean_x = float(parts_x[4])
-    std_x = float(parts_x[5])
-    
-    # Datos de O (línea i+1)
-    # Verificamos si EXISTE la línea i+1
-    if i + 1 < len(lines):
-        parts_o = lines[i+1].split()
-        mean_o = float(parts_o[4])
-        std_o = float(parts_o[5])
-    else:
-        # Si es la última y no tiene par (O), ponemos NaN para que no grafique nada
-        mean_o = np.nan
-        std_o = np.nan
-
-    xy_data.append({
-        'Jugada': jugada_count,
-        'Valor_X': mean_x,
-        'Std_X': std_x,
-        'Valor_O': mean_o,
-        'Std_O': std_o
-    })
-    jugada_count += 1
-
-df = pd.DataFrame(xy_data)
+
+def cargar_registros(patrones):
+    """Lee y concatena los CSV del registro de jugadas (acepta comodines)."""
+    rutas = sorted({ruta for patron in patrones for ruta in glob.glob(patron)})
+    if not rutas:
+        raise FileNotFoundError(f"No hay registros de jugadas en {patrones}")
+    return pd.concat([pd.read_csv(ruta) for ruta in rutas], ignore_index=True)
+
+
+def latencia_por_jugada(df):
+    """
+    Media, desviación estándar y cantidad de la latencia de cada ficha por
+    jugada propia (la primera de cada jugador es la 1, la segunda la 2, ...).
+    """
+    df = df.assign(Jugada=(df['jugada'] + 1) // 2)
+    resumen = df.groupby(['ficha', 'Jugada'])['latencia_ms'].agg(['mean', 'std', 'count'])
+    return resumen.rename(columns={'mean': 'Valor', 'std': 'Std', 'count': 'Muestras'}).reset_index()
 
 # --- 2. GRAFICACIÓN CON FONDO AZUL ---
 
-bg_color = '#110061'
-text_color = 'white'
-
-fig, ax = plt.subplots(figsize=(12, 6))
-
-fig.patch.set_facecolor(bg_color)
-ax.set_facecolor(bg_color)
-
-# Serie 'jugador1' (Rojo, Cuadrados) -> Corresponde a (X)
-ax.errorbar(df['Jugada'], df['Valor_X'], yerr=df['Std_X'], 
-            color='#ff3333',
-            ecolor='#ff3333', 
-            marker='s', linestyle='-', linewidth=2, markersize=8, 
-            label='(X) jugador1', capsize=5)
-
-# Serie 'jugador2' (Amarillo/Dorado, Rombos) -> Corresponde a (O)
-# Matplotlib automáticamente ignora los valores NaN, cortando la línea donde no hay datos
-ax.errorbar(df['Jugada'], df['Valor_O'], yerr=df['Std_O'], 
-            color='#ffff00', 
-            ecolor='#ffff00', 
-            marker='d', linestyle='-', linewidth=2, markersize=8, 
-            label='(O) jugador2', capsize=5)
-
-# --- ESTÉTICA ---
-ax.set_title('Tiempo en función de las jugadas', fontsize=14, color=text_color, fontweight='bold')
-ax.set_xlabel('Jugadas', fontsize=12, color=text_color)
-ax.set_ylabel('Tiempo [ms]', fontsize=12, color=text_color)
-
-ax.tick_params(axis='x', colors=text_color)
-ax.tick_params(axis='y', colors=text_color)
-# Mostramos todos los ticks de las jugadas (del 1 al 14)
-ax.set_xticks(df['Jugada'])
-
-for spine in ax.spines.values():
-    spine.set_edgecolor(text_color)
-
-ax.grid(axis='y', linestyle='--', color='white', alpha=0.3)
-ax.set_ylim(bottom=0)
-
-# Leyenda
-legend = ax.legend(loc='best', borderaxespad=0.)
-frame = legend.get_frame()
-frame.set_facecolor(bg_color)
-frame.set_edgecolor(text_color)
-for text in legend.get_texts():
-    text.set_color(text_color)
-
-plt.tight_layout()
-plt.savefig('zigzag_blue_final_fixed.pdf', facecolor=bg_color)
-plt.show()
\ No newline at end of file
+def graficar(resumen, tipos_por_ficha, partidas, nombre_archivo):
+    bg_color = '#110061'
+    text_color = 'white'
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    fig.patch.set_facecolor(bg_color)
+    ax.set_facecolor(bg_color)
+
+    for ficha, serie in resumen.groupby('ficha'):
+        estilo = ESTILOS.get(ficha, {"color": 'white', "marker": 'o', "nombre": ficha})
+        # Con una sola muestra la desviación es NaN: no se dibuja la barra de error
+        ax.errorbar(serie['Jugada'], serie['Valor'], yerr=serie['Std'].fillna(0),
+                    color=estilo["color"],
+                    ecolor=estilo["color"],
+                    marker=estilo["marker"], linestyle='-', linewidth=2, markersize=8,
+                    label=f'({ficha}) {estilo["nombre"]} [{tipos_por_ficha.get(ficha, "")}]', capsize=5)
+
+    # --- ESTÉTICA ---
+    ax.set_title(f'Tiempo en función de las jugadas ({partidas} partidas)', fontsize=14, color=text_color,
+                 fontweight='bold')
+    ax.set_xlabel('Jugadas', fontsize=12, color=text_color)
+    ax.set_ylabel('Tiempo [ms]', fontsize=12, color=text_color)
+
+    ax.tick_params(axis='x', colors=text_color)
+    ax.tick_params(axis='y', colors=text_color)
+    # Mostramos todos los ticks de las jugadas
+    ax.set_xticks(np.sort(resumen['Jugada'].unique()))
+
+    for spine in ax.spines.values():
+        spine.set_edgecolor(text_color)
+
+    ax.grid(axis='y', linestyle='--', color='white', alpha=0.3)
+    ax.set_ylim(bottom=0)
+
+    # Leyenda
+    legend = ax.legend(loc='best', borderaxespad=0.)
+    frame = legend.get_frame()
+    frame.set_facecolor(bg_color)
+    frame.set_edgecolor(text_color)
+    for text in legend.get_texts():
+        text.set_color(text_color)
+
+    plt.tight_layout()
+    plt.savefig(nombre_archivo, facecolor=bg_color)
+    print(f"[Éxito] Gráfico guardado como '{nombre_archivo}'")
+    plt.show()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latencia por jugada a partir del registro de jugadas")
+    parser.add_argument("registros", nargs="*", default=[RUTA_REGISTRO_POR_DEFECTO],
+                        help="CSV del registro (acepta comodines)")
+    parser.add_argument("--tipos", nargs="*", default=None, help="tipos de jugador a incluir (p. ej. AI S)")
+    parser.add_argument("--salida", default="latencia_por_jugada.png")
+    args = parser.parse_args()
+
+    df = cargar_registros(args.registros)
+    # Los ids de partida se repiten entre corridas: se cuentan las primeras jugadas
+    partidas = int((df['jugada'] == 1).sum())
+    if args.tipos is not None:
+        df = df[df['tipo'].isin(args.tipos)]
+    tipos_por_ficha = df.groupby('ficha')['tipo'].agg(lambda tipos: ", ".join(sorted(tipos.unique()))).to_dict()
+    resumen = latencia_por_jugada(df)
+    print(resumen.to_string(index=False))
+    graficar(resumen, tipos_por_ficha, partidas, args.salida)
@@ -0,0 +1,69 @@
+import csv
+import os
+
+from back_end import JUGADOR_IA, JUGADOR_SOLVER, JUGADOR_MCTS
+
+# Columnas del registro (una fila por jugada)
+COLUMNAS_REGISTRO = ("partida", "jugada", "ficha", "tipo", "motor", "latencia_ms", "profundidad", "nodos")
+
+RUTA_REGISTRO_POR_DEFECTO = "registro_jugadas.csv"
+
+
+class RegistroJugadas:
+    """
+    Registro por jugada de la latencia, la profundidad alcanzada y los nodos
+    visitados. Guarda en memoria por columnas (una lista por campo) y vuelca
+    a un CSV con encabezado, agregando filas si el archivo ya existe, así
+    varias corridas se acumulan en el mismo archivo (ver plots.py).
+    """
+    def __init__(self, ruta=None):
+        self.ruta = ruta
+        self.columnas = {nombre: [] for nombre in COLUMNAS_REGISTRO}
+        self._partidas = 0
+
+    def __len__(self):
+        return len(self.columnas["partida"])
+
+    def nueva_partida(self):
+        """Devuelve un id para la próxima partida (los bucles sin id propio)."""
+        self._partidas += 1
+        return self._partidas
+
+    def registrar(self, id_partida, jugada, jugador, motor, latencia_ms):
+        """
+        Agrega una jugada. jugada: número de jugada dentro de la partida
+        (desde 1). La profundidad y los nodos salen de la última búsqueda
+        del jugador (vacíos para humanos y aleatorios; en MCTS, el camino más
+        largo explorado y las partidas simuladas).
+        """
+        buscadores = (JUGADOR_IA, JUGADOR_SOLVER, JUGADOR_MCTS)
+        resultado = jugador.ultima_busqueda if jugador.tipo_jugador in buscadores else None
+        fila = (id_partida, jugada, jugador.ficha, jugador.tipo_jugador, motor, round(latencia_ms, 3),
+                resultado.profundidad if resultado is not None else None,
+                resultado.nodos if resultado is not None else None)
+        for nombre, valor in zip(COLUMNAS_REGISTRO, fila):
+            self.columnas[nombre].append(valor)
+
+    def filas(self):
+        """Las jugadas registradas como tuplas (para pasarlas entre procesos)."""
+        return list(zip(*(self.columnas[nombre] for nombre in COLUMNAS_REGISTRO)))
+
+    def extender(self, filas):
+        """Agrega filas obtenidas con filas() de otro registro."""
+        for fila in filas:
+            for nombre, valor in zip(COLUMNAS_REGISTRO, fila):
+                self.columnas[nombre].append(valor)
+
+    def guardar(self, ruta=None):
+        """Agrega las jugadas pendientes al CSV y vacía la memoria. Devuelve cuántas se escribieron."""
+        ruta = ruta or self.ruta or RUTA_REGISTRO_POR_DEFECTO
+        filas = self.filas()
+        nuevo = not os.path.exists(ruta) or os.path.getsize(ruta) == 0
+        with open(ruta, "a", newline="") as archivo:
+            escritor = csv.writer(archivo)
+            if nuevo:
+                escritor.writerow(COLUMNAS_REGISTRO)
+            escritor.writerows(filas)
+        for valores in self.columnas.values():
+            valores.clear()
+        return len(filas)
@@ -0,0 +1,53 @@
+class Reportero:
+    """
+    Recibe los eventos de Jugador y JuegoConnect4 (quién piensa, qué jugó,
+    el tablero, el final de la partida). Esta clase base los ignora todos:
+    es el reportero nulo de las simulaciones sin consola. Los eventos llegan
+    con los objetos tal cual, así el texto solo se arma si alguien lo imprime.
+    """
+    def pensando(self, jugador):
+        pass
+
+    def jugada(self, jugador, columna, resultado=None):
+        """columna elegida por jugador; resultado es la ResultadoBusqueda de la IA (None si no buscó)."""
+
+    def aviso(self, jugador, mensaje):
+        pass
+
+    def tablero(self, tablero):
+        pass
+
+    def fin_partida(self, ganador):
+        """ganador: el Jugador que ganó, o None si fue empate."""
+
+
+class ReporteroConsola(Reportero):
+    """Imprime los eventos en la consola (el comportamiento de siempre)."""
+    def pensando(self, jugador):
+        print(f"Agente IA ({jugador.ficha}) está pensando...")
+
+    def jugada(self, jugador, columna, resultado=None):
+        if resultado is None:
+            print(f"Jugador Aleatorio ({jugador.ficha}) eligió columna {columna}")
+            return
+        exacto = " exacto" if resultado.exacto else ""
+        print(f"IA ({jugador.ficha}) eligió columna {columna} con puntaje{exacto} {resultado.puntaje}")
+        print(f'IA se demoró {resultado.tiempo_ms:.3f} ms en calcular su jugada '
+              f'(profundidad {resultado.profundidad}, {resultado.nodos} nodos)')
+
+    def aviso(self, jugador, mensaje):
+        print(f"IA ({jugador.ficha}): {mensaje}")
+
+    def tablero(self, tablero):
+        tablero.imprimir_tablero()
+
+    def fin_partida(self, ganador):
+        if ganador is None:
+            print("🤝 ¡Es un empate!")
+        else:
+            print(f"🎉 ¡El jugador {ganador.ficha} ({ganador.tipo_jugador}) ha ganado!")
+
+
+# Instancias compartidas (no tienen estado)
+REPORTERO_NULO = Reportero()
+REPORTERO_CONSOLA = ReporteroConsola()
@@ -0,0 +1,462 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from back_end import Tablero, Jugador, JUGADOR_IA, JUGADOR_SOLVER, JUGADOR_MCTS, JUGADOR_RANDOM, MOTORES, \
+    MOTOR_BITBOARD, COLUMNAS
+from reportes import REPORTERO_NULO
+from transposicion import BYTES_TT_POR_DEFECTO
+
+HOST_POR_DEFECTO = "127.0.0.1"
+PUERTO_POR_DEFECTO = 4203
+
+# Límites del servicio
+MAX_SESIONES = 10_000
+PENDIENTES_POR_TRABAJADOR = 4 # Jugadas de la IA en cola por proceso antes de rechazar pedidos
+MAX_EN_VUELO_POR_CONEXION = 32 # Pedidos de una conexión en curso a la vez (luego se deja de leer)
+MAX_LARGO_LINEA = 4096
+MAX_PROFUNDIDAD = 8
+MAX_TIEMPO_MS = 2000
+INACTIVIDAD_S = 600 # Las sesiones sin pedidos por más de esto se descartan
+REINTENTAR_MS = 50 # Sugerencia al cliente cuando el servidor está ocupado
+MUESTRAS_LATENCIA = 10_000 # Latencias guardadas por operación (las más recientes)
+
+RIVALES = (JUGADOR_IA, JUGADOR_SOLVER, JUGADOR_MCTS, JUGADOR_RANDOM)
+OPERACIONES = ("nueva", "jugar", "estado", "cerrar", "metricas")
+
+
+class ErrorPedido(Exception):
+    """Pedido inválido o imposible de atender; el mensaje va al cliente."""
+
+
+# --- Trabajadores: calculan las jugadas de la IA en otro proceso ---
+# Cada proceso guarda sus jugadores por configuración, así la TT y el
+# ordenador se reutilizan entre jugadas (y entre partidas). Un mismo jugador
+# atiende jugadas de partidas distintas intercaladas: es compartido (no poda
+# la TT ni reutiliza el árbol de MCTS entre jugadas).
+MAX_JUGADORES_POR_PROCESO = 8
+_jugadores = {}
+_bytes_tt = BYTES_TT_POR_DEFECTO
+
+
+def _inicializar_trabajador(bytes_tt):
+    global _bytes_tt
+    _bytes_tt = bytes_tt
+
+
+def _calcular_jugada(tipo, ficha, profundidad, tiempo_ms, motor, jugadas):
+    """
+    Reproduce las jugadas de la partida (X empieza) y elige la de ficha.
+    Devuelve (columna, profundidad alcanzada, nodos).
+    """
+    clave = (tipo, ficha, profundidad)
+    jugador = _jugadores.pop(clave, None)
+    if jugador is None:
+        if len(_jugadores) >= MAX_JUGADORES_POR_PROCESO:
+            _jugadores.pop(next(iter(_jugadores))).cerrar() # El usado hace más tiempo
+        jugador = Jugador(tipo, ficha, bytes_tt=_bytes_tt, profundidad=profundidad, reportero=REPORTERO_NULO,
+                          compartido=True)
+    _jugadores[clave] = jugador # Al final: el orden del diccionario es el de uso
+    tablero = Tablero(motor)
+    turno = "X"
+    for col in jugadas:
+        tablero.insertar_ficha(col, turno)
+        turno = "O" if turno == "X" else "X"
+    columna = jugador.elegir_columna(tablero, tiempo_ms)
+    resultado = jugador.ultima_busqueda
+    return columna, resultado.profundidad, resultado.nodos
+
+
+def _es_entero(valor):
+    """Entero de JSON: bool es subclase de int, pero true y false no son números."""
+    return isinstance(valor, int) and not isinstance(valor, bool)
+
+
+def _es_numero(valor):
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+
+# --- Estado del servidor ---
+
+class Sesion:
+    """Una partida entre un cliente y un rival del servidor."""
+    __slots__ = ("id", "tablero", "jugadas", "ficha", "rival", "profundidad", "tiempo_ms", "ocupada",
+                 "ultimo_uso")
+
+    def __init__(self, id_sesion, ficha, rival, profundidad, tiempo_ms, motor):
+        self.id = id_sesion
+        self.tablero = Tablero(motor)
+        self.jugadas = bytearray() # Columnas jugadas desde el inicio (X empieza)
+        self.ficha = ficha # La del cliente
+        self.rival = rival # Tipo de jugador del servidor
+        self.profundidad = profundidad
+        self.tiempo_ms = tiempo_ms
+        self.ocupada = False # Hay un pedido de esta sesión en curso
+        self.ultimo_uso = time.monotonic()
+
+    @property
+    def ficha_rival(self):
+        return "O" if self.ficha == "X" else "X"
+
+    @property
+    def turno(self):
+        return "X" if len(self.jugadas) % 2 == 0 else "O"
+
+    @property
+    def terminada(self):
+        return self.tablero.ganador is not None or self.tablero.esta_lleno()
+
+    def jugar(self, col, ficha):
+        self.tablero.insertar_ficha(col, ficha)
+        self.jugadas.append(col)
+
+    def estado(self):
+        """Lo que el cliente ve de la partida."""
+        return {
+            "partida": self.id,
+            "ficha": self.ficha,
+            "turno": None if self.terminada else self.turno,
+            "jugadas": list(self.jugadas),
+            "tablero": ["".join(fila) for fila in np.flip(self.tablero.grid, axis=0)],
+            "terminada": self.terminada,
+            "ganador": self.tablero.ganador,
+        }
+
+
+class MetricasServidor:
+    """Contadores y latencias por operación (desde que llega la línea hasta que se responde)."""
+    def __init__(self, muestras=MUESTRAS_LATENCIA):
+        self.muestras = muestras
+        self.latencias_ms = {} # Operación -> deque con las latencias más recientes
+        self.pedidos = 0
+        self.errores = 0
+        self.rechazos = 0 # Pedidos rechazados por falta de capacidad
+        self.jugadas_ia = 0
+        self.tiempo_ia_ms = 0.0 # Tiempo total de las jugadas de la IA (cola + cálculo)
+
+    def registrar(self, operacion, latencia_ms):
+        if operacion not in self.latencias_ms:
+            self.latencias_ms[operacion] = deque(maxlen=self.muestras)
+        self.latencias_ms[operacion].append(latencia_ms)
+
+    def resumen(self):
+        operaciones = {}
+        for operacion, latencias in self.latencias_ms.items():
+            p50, p95, p99 = np.percentile(np.array(latencias), (50, 95, 99))
+            operaciones[operacion] = {"muestras": len(latencias), "p50_ms": round(float(p50), 3),
+                                      "p95_ms": round(float(p95), 3), "p99_ms": round(float(p99), 3),
+                                      "max_ms": round(max(latencias), 3)}
+        return {
+            "pedidos": self.pedidos,
+            "errores": self.errores,
+            "rechazos": self.rechazos,
+            "jugadas_ia": self.jugadas_ia,
+            "ia_media_ms": round(self.tiempo_ia_ms / self.jugadas_ia, 3) if self.jugadas_ia else None,
+            "operaciones": operaciones,
+        }
+
+
+class ServidorConnect4:
+    """
+    Servicio de partidas con asyncio. Los clientes mandan pedidos como
+    líneas JSON (por un socket local o por stdin) y reciben una línea JSON
+    por pedido, con el mismo "id" si lo traían. Los pedidos de una conexión
+    se atienden a la vez, así que las respuestas pueden llegar en otro orden
+    (una partida atiende un pedido a la vez). Operaciones:
+
+        {"op": "nueva", "ficha": "X", "rival": "AI", "profundidad": 4, "tiempo_ms": null, "motor": "bitboard"}
+        {"op": "jugar", "partida": 1, "columna": 3}
+        {"op": "estado", "partida": 1}
+        {"op": "cerrar", "partida": 1}
+        {"op": "metricas"}
+
+    Todas las sesiones viven en este proceso; las jugadas del rival (salvo
+    el aleatorio) se calculan en un pool acotado de procesos. Contrapresión:
+    cada conexión tiene a lo más MAX_EN_VUELO_POR_CONEXION pedidos en curso
+    (después se deja de leer su socket) y si la cola del pool está llena
+    los pedidos que necesitan a la IA se rechazan con "ocupado" antes de
+    tocar la partida, para que el cliente reintente.
+    """
+    def __init__(self, trabajadores=None, bytes_tt=BYTES_TT_POR_DEFECTO, max_sesiones=MAX_SESIONES,
+                 pendientes_por_trabajador=PENDIENTES_POR_TRABAJADOR):
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.bytes_tt = bytes_tt
+        self.max_sesiones = max_sesiones
+        self.max_pendientes = self.trabajadores * pendientes_por_trabajador
+        self.pendientes = 0 # Jugadas de la IA enviadas al pool sin terminar
+        self.sesiones = {}
+        self._reservadas = 0 # Sesiones nuevas esperando su primera jugada (aún sin publicar)
+        self.metricas = MetricasServidor()
+        self._ids = itertools.count(1)
+        self._pool = None
+        self._aleatorios = {ficha: Jugador(JUGADOR_RANDOM, ficha, reportero=REPORTERO_NULO) for ficha in ("X", "O")}
+        self._tareas = set()
+
+    # --- Ciclo de vida ---
+
+    def iniciar(self):
+        self._pool = ProcessPoolExecutor(self.trabajadores, initializer=_inicializar_trabajador,
+                                         initargs=(self.bytes_tt,))
+        self._tareas.add(asyncio.create_task(self._expirar_sesiones()))
+
+    def cerrar(self):
+        for tarea in self._tareas:
+            tarea.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    async def _expirar_sesiones(self):
+        while True:
+            await asyncio.sleep(INACTIVIDAD_S / 10)
+            limite = time.monotonic() - INACTIVIDAD_S
+            for id_sesion in [s.id for s in self.sesiones.values() if s.ultimo_uso < limite and not s.ocupada]:
+                del self.sesiones[id_sesion]
+
+    # --- Conexiones ---
+
+    async def atender_socket(self, lector, escritor):
+        try:
+            await self.atender(lector, escritor)
+        except asyncio.CancelledError:
+            pass # El servidor se está cerrando
+        finally:
+            escritor.close()
+
+    async def atender(self, lector, escritor):
+        """Lee pedidos de lector y responde en escritor hasta que se cierre la entrada."""
+        en_vuelo = asyncio.Semaphore(MAX_EN_VUELO_POR_CONEXION)
+        tareas = set()
+        while True:
+            await en_vuelo.acquire() # Con la conexión saturada no se lee más (el socket se llena)
+            try:
+                linea = await lector.readline()
+            except ValueError:
+                # Línea demasiado larga: no hay cómo seguir leyendo la conexión
+                escritor.write(json.dumps({"ok": False, "error": "línea demasiado larga"}).encode() + b"\n")
+                self.metricas.errores += 1
+                break
+            except ConnectionError:
+                break
+            if not linea:
+                break
+            recibido = time.perf_counter()
+            tarea = asyncio.create_task(self._responder(linea, recibido, escritor, en_vuelo))
+            tareas.add(tarea)
+            tarea.add_done_callback(tareas.discard)
+        if tareas:
+            await asyncio.gather(*tareas, return_exceptions=True)
+
+    async def _responder(self, linea, recibido, escritor, en_vuelo):
+        operacion = "invalida"
+        id_pedido = None
+        try:
+            try:
+                pedido = json.loads(linea)
+                if not isinstance(pedido, dict):
+                    raise ValueError
+            except ValueError:
+                raise ErrorPedido("el pedido debe ser un objeto JSON")
+            id_pedido = pedido.get("id")
+            if pedido.get("op") in OPERACIONES:
+                operacion = pedido["op"]
+            respuesta = {"ok": True, **await self.procesar(pedido)}
+        except ErrorPedido as e:
+            respuesta = {"ok": False, "error": str(e)}
+            # Un rechazo por falta de capacidad no es un error del pedido: se cuenta aparte
+            if str(e) == "ocupado":
+                self.metricas.rechazos += 1
+                respuesta["reintentar_ms"] = REINTENTAR_MS
+            else:
+                self.metricas.errores += 1
+        except Exception as e:
+            # Un error del pool no debe dejar al cliente sin respuesta
+            self.metricas.errores += 1
+            respuesta = {"ok": False, "error": f"error interno: {e!r}"}
+        if id_pedido is not None:
+            respuesta["id"] = id_pedido
+        try:
+            escritor.write(json.dumps(respuesta).encode() + b"\n")
+            await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            en_vuelo.release()
+            self.metricas.pedidos += 1
+            self.metricas.registrar(operacion, (time.perf_counter() - recibido) * 1000)
+
+    # --- Operaciones ---
+
+    async def procesar(self, pedido):
+        operacion = pedido.get("op")
+        if operacion not in OPERACIONES:
+            raise ErrorPedido(f"operación desconocida: {operacion}")
+        if operacion == "nueva":
+            return await self.nueva(pedido)
+        if operacion == "metricas":
+            return self.resumen()
+        sesion = self.sesiones.get(pedido.get("partida"))
+        if sesion is None:
+            raise ErrorPedido("partida inexistente")
+        sesion.ultimo_uso = time.monotonic()
+        if operacion == "estado":
+            return sesion.estado()
+        if operacion == "cerrar":
+            self.sesiones.pop(sesion.id, None)
+            return {"partida": sesion.id}
+        return await self.jugar(sesion, pedido.get("columna"))
+
+    async def nueva(self, pedido):
+        if len(self.sesiones) + self._reservadas >= self.max_sesiones:
+            raise ErrorPedido("ocupado")
+        ficha = pedido.get("ficha", "X")
+        rival = pedido.get("rival", JUGADOR_IA)
+        profundidad = pedido.get("profundidad", 4)
+        tiempo_ms = pedido.get("tiempo_ms")
+        motor = pedido.get("motor", MOTOR_BITBOARD)
+        if ficha not in ("X", "O"):
+            raise ErrorPedido("ficha debe ser X u O")
+        if rival not in RIVALES:
+            raise ErrorPedido(f"rival debe ser uno de {RIVALES}")
+        if not _es_entero(profundidad) or not 1 <= profundidad <= MAX_PROFUNDIDAD:
+            raise ErrorPedido(f"profundidad debe estar entre 1 y {MAX_PROFUNDIDAD}")
+        if tiempo_ms is not None and (not _es_numero(tiempo_ms) or not 0 < tiempo_ms <= MAX_TIEMPO_MS):
+            raise ErrorPedido(f"tiempo_ms debe estar entre 0 y {MAX_TIEMPO_MS}")
+        if motor not in MOTORES:
+            raise ErrorPedido(f"motor debe ser uno de {MOTORES}")
+        sesion = Sesion(next(self._ids), ficha, rival, profundidad, tiempo_ms, motor)
+        if ficha == "O":
+            # Empieza el servidor: la sesión solo se publica si su primera jugada se pudo
+            # calcular, pero su lugar se reserva antes de esperar a la IA
+            sesion.ocupada = True
+            self._reservadas += 1
+            try:
+                await self._jugar_rival(sesion)
+            finally:
+                self._reservadas -= 1
+                sesion.ocupada = False
+        self.sesiones[sesion.id] = sesion
+        return sesion.estado()
+
+    async def jugar(self, sesion, col):
+        if sesion.ocupada:
+            raise ErrorPedido("la partida ya tiene una jugada en curso")
+        if sesion.terminada:
+            raise ErrorPedido("la partida terminó")
+        if sesion.turno != sesion.ficha:
+            raise ErrorPedido("no es el turno del cliente")
+        if not _es_entero(col) or not 0 <= col < COLUMNAS or not sesion.tablero.es_columna_valida(col):
+            raise ErrorPedido("columna inválida o llena")
+        if sesion.rival != JUGADOR_RANDOM and self.pendientes >= self.max_pendientes:
+            raise ErrorPedido("ocupado")
+        sesion.ocupada = True
+        try:
+            sesion.jugar(col, sesion.ficha)
+            if not sesion.terminada:
+                try:
+                    await self._jugar_rival(sesion)
+                except BaseException:
+                    # Sin respuesta del rival (sin capacidad, error o pedido cancelado): la jugada
+                    # del cliente se deshace
+                    sesion.tablero.deshacer_ficha(sesion.jugadas.pop())
+                    raise
+        finally:
+            sesion.ocupada = False
+        return sesion.estado()
+
+    async def _jugar_rival(self, sesion):
+        """Calcula y hace la jugada del servidor (en el pool, salvo el rival aleatorio)."""
+        if sesion.rival == JUGADOR_RANDOM:
+            sesion.jugar(self._aleatorios[sesion.ficha_rival].elegir_columna(sesion.tablero), sesion.ficha_rival)
+            return
+        if self.pendientes >= self.max_pendientes:
+            raise ErrorPedido("ocupado")
+        self.pendientes += 1
+        inicio = time.perf_counter()
+        try:
+            col, _, _ = await asyncio.get_running_loop().run_in_executor(
+                self._pool, _calcular_jugada, sesion.rival, sesion.ficha_rival, sesion.profundidad,
+                sesion.tiempo_ms, sesion.tablero.motor, bytes(sesion.jugadas))
+        finally:
+            self.pendientes -= 1
+        self.metricas.jugadas_ia += 1
+        self.metricas.tiempo_ia_ms += (time.perf_counter() - inicio) * 1000
+        sesion.jugar(col, sesion.ficha_rival)
+
+    def resumen(self):
+        return {"sesiones": len(self.sesiones), "pendientes": self.pendientes, "max_pendientes": self.max_pendientes,
+                **self.metricas.resumen()}
+
+
+# --- Entrada y salida estándar como una conexión más ---
+
+class EscritorSalida:
+    """Lo mínimo de asyncio.StreamWriter que usa ServidorConnect4, sobre stdout."""
+    def write(self, datos):
+        sys.stdout.buffer.write(datos)
+        sys.stdout.buffer.flush()
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+
+async def lector_entrada():
+    """
+    Un asyncio.StreamReader sobre stdin. Si stdin es un archivo (no un pipe
+    ni una terminal) se lee desde un hilo, sin contrapresión.
+    """
+    loop = asyncio.get_running_loop()
+    lector = asyncio.StreamReader(limit=MAX_LARGO_LINEA)
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(lector), sys.stdin)
+    except ValueError:
+        def leer():
+            for linea in sys.stdin.buffer:
+                loop.call_soon_threadsafe(lector.feed_data, linea)
+            loop.call_soon_threadsafe(lector.feed_eof)
+        threading.Thread(target=leer, daemon=True).start()
+    return lector
+
+
+async def servir(servidor, host=HOST_POR_DEFECTO, puerto=PUERTO_POR_DEFECTO, entrada_estandar=False):
+    """Atiende por stdin hasta que se cierre, o por el socket hasta que se cancele."""
+    servidor.iniciar()
+    try:
+        if entrada_estandar:
+            await servidor.atender(await lector_entrada(), EscritorSalida())
+            return
+        socket_servidor = await asyncio.start_server(servidor.atender_socket, host, puerto, limit=MAX_LARGO_LINEA)
+        print(f"Servidor Connect4 en {host}:{puerto} ({servidor.trabajadores} trabajadores)", file=sys.stderr)
+        async with socket_servidor:
+            await socket_servidor.serve_forever()
+    finally:
+        servidor.cerrar()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor de partidas de Connect4 (líneas JSON)")
+    parser.add_argument("--host", default=HOST_POR_DEFECTO)
+    parser.add_argument("--puerto", type=int, default=PUERTO_POR_DEFECTO)
+    parser.add_argument("--stdin", action="store_true", help="atender pedidos por stdin/stdout en vez de un socket")
+    parser.add_argument("--trabajadores", type=int, default=None, help="procesos para la IA (por defecto, uno por CPU)")
+    parser.add_argument("--bytes-tt", type=int, default=BYTES_TT_POR_DEFECTO, help="TT de cada jugador del pool")
+    args = parser.parse_args()
+
+    servidor = ServidorConnect4(args.trabajadores, args.bytes_tt)
+    try:
+        asyncio.run(servir(servidor, args.host, args.puerto, args.stdin))
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(servidor.resumen(), indent=2), file=sys.stderr)
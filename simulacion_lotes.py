@@ -0,0 +1,200 @@
+import time
+
+import numpy as np
+
+from geometria import FILAS, COLUMNAS, ALTO, MASCARA_TABLERO, MASCARA_COLUMNA, celdas_ganadoras, jugadas_posibles
+
+CASILLAS = FILAS * COLUMNAS
+
+# Resultado de cada partida del lote
+EMPATE = 0
+GANA_X = 1
+GANA_O = 2
+
+TAMANO_LOTE = 100_000 # Partidas que avanzan juntas (acota la memoria)
+
+COLUMNAS_BITS = np.array(MASCARA_COLUMNA, dtype=np.uint64)
+
+
+# --- Operaciones sobre N bitboards a la vez ---
+# Las funciones de geometria sirven tal cual con arreglos uint64 (desplazamientos
+# y máscaras elemento a elemento); solo el 4 en línea necesita una versión sin if.
+
+def hay_cuatro_en_linea_lote(bits):
+    """Arreglo booleano: qué bitboards tienen 4 en línea."""
+    hay = np.zeros(bits.shape, dtype=bool)
+    for d in (1, ALTO, ALTO - 1, ALTO + 1):
+        m = bits & (bits >> d)
+        hay |= (m & (m >> 2 * d)) != 0
+    return hay
+
+
+def columna_al_azar(jugadas, rng):
+    """
+    Una columna elegida uniformemente entre las celdas de cada bitboard de
+    jugadas (a lo más una por columna y al menos una por bitboard).
+    """
+    permitidas = (jugadas[:, None] & COLUMNAS_BITS) != 0
+    ruido = rng.random(permitidas.shape)
+    ruido[~permitidas] = -1.0
+    return ruido.argmax(axis=1)
+
+
+# --- Políticas: (fichas de quien mueve, todas las fichas, rng) -> columnas ---
+
+def politica_aleatoria(actual, mascara, rng):
+    """Cualquier columna no llena, al azar (el jugador aleatorio de back_end)."""
+    return columna_al_azar(jugadas_posibles(mascara), rng)
+
+
+def politica_tactica(actual, mascara, rng):
+    """
+    Igual que amenazas.jugadas_tacticas, al azar entre las candidatas: gana
+    si puede, si no tapa una amenaza inmediata del rival, y evita jugar
+    debajo de una celda ganadora del rival mientras haya otra opción.
+    """
+    posibles = jugadas_posibles(mascara)
+    ganadoras = celdas_ganadoras(actual, mascara) & posibles
+    amenazas = celdas_ganadoras(actual ^ mascara, mascara)
+    forzadas = posibles & amenazas
+    seguras = posibles & ~(amenazas >> 1)
+    candidatas = np.where(ganadoras != 0, ganadoras,
+                 np.where(forzadas != 0, forzadas,
+                 np.where(seguras != 0, seguras, posibles)))
+    return columna_al_azar(candidatas, rng)
+
+
+POLITICAS = {
+    "aleatoria": politica_aleatoria,
+    "tactica": politica_tactica,
+}
+
+
+class ResultadoLote:
+    """Resultados de un lote de partidas, como arreglos de NumPy (una posición por partida)."""
+    def __init__(self, ganador, jugadas, empieza_o, historial=None):
+        self.ganador = ganador # EMPATE, GANA_X o GANA_O
+        self.jugadas = jugadas # Cantidad de jugadas de la partida
+        self.empieza_o = empieza_o # True si la partida la empezó O
+        self.historial = historial # (partidas, CASILLAS) columnas jugadas, -1 después del final
+
+    def __len__(self):
+        return len(self.ganador)
+
+    @staticmethod
+    def concatenar(resultados):
+        historiales = [r.historial for r in resultados]
+        return ResultadoLote(
+            np.concatenate([r.ganador for r in resultados]),
+            np.concatenate([r.jugadas for r in resultados]),
+            np.concatenate([r.empieza_o for r in resultados]),
+            np.concatenate(historiales) if all(h is not None for h in historiales) else None,
+        )
+
+    def resumen(self):
+        """Conteos de resultados y largo medio de las partidas."""
+        total = max(1, len(self))
+        return {
+            "partidas": len(self),
+            "victorias_x": int((self.ganador == GANA_X).sum()),
+            "victorias_o": int((self.ganador == GANA_O).sum()),
+            "empates": int((self.ganador == EMPATE).sum()),
+            "victorias_primero": int(((self.ganador == GANA_X) & ~self.empieza_o).sum() +
+                                     ((self.ganador == GANA_O) & self.empieza_o).sum()),
+            "jugadas_media": float(self.jugadas.sum() / total),
+        }
+
+
+def simular_lote(cantidad, politica_x=politica_aleatoria, politica_o=politica_aleatoria, rng=None,
+                 alternar=True, historial=False):
+    """
+    Juega cantidad partidas a la vez, avanzando todas de a una jugada. Cada
+    partida es un par de bitboards uint64 (fichas de quien mueve y todas las
+    fichas); las terminadas se sacan del lote. Con alternar, las partidas
+    impares las empieza O. Devuelve un ResultadoLote.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    ganador = np.zeros(cantidad, dtype=np.int8)
+    jugadas = np.zeros(cantidad, dtype=np.int8)
+    empieza_o = (np.arange(cantidad) % 2 == 1) if alternar else np.zeros(cantidad, dtype=bool)
+    columnas_jugadas = np.full((cantidad, CASILLAS), -1, dtype=np.int8) if historial else None
+
+    # Estado de las partidas en curso (activas: su índice en el lote)
+    activas = np.arange(cantidad)
+    actual = np.zeros(cantidad, dtype=np.uint64)
+    mascara = np.zeros(cantidad, dtype=np.uint64)
+    mueve_x = ~empieza_o
+
+    for ply in range(CASILLAS):
+        if not len(activas):
+            break
+        col = np.empty(len(activas), dtype=np.intp)
+        if mueve_x.any():
+            col[mueve_x] = politica_x(actual[mueve_x], mascara[mueve_x], rng)
+        if not mueve_x.all():
+            col[~mueve_x] = politica_o(actual[~mueve_x], mascara[~mueve_x], rng)
+        if historial:
+            columnas_jugadas[activas, ply] = col
+
+        celda = jugadas_posibles(mascara) & COLUMNAS_BITS[col]
+        actual |= celda
+        mascara |= celda
+        gano = hay_cuatro_en_linea_lote(actual)
+        jugadas[activas] = ply + 1
+        ganador[activas[gano]] = np.where(mueve_x[gano], GANA_X, GANA_O)
+
+        # Las terminadas salen del lote; en las demás pasa a mover el rival
+        sigue = ~gano
+        activas = activas[sigue]
+        actual = (actual ^ mascara)[sigue]
+        mascara = mascara[sigue]
+        mueve_x = ~mueve_x[sigue]
+
+    return ResultadoLote(ganador, jugadas, empieza_o, columnas_jugadas)
+
+
+def terminar_partidas(actual, mascara, politica=politica_tactica, rng=None):
+    """
+    Juega hasta el final, con la misma política para los dos, partidas que
+    parten de posiciones sin terminar (actual: fichas de quien mueve).
+    Devuelve por partida 1 si gana quien movía al inicio, -1 si pierde y 0 si empatan.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    resultado = np.zeros(len(actual), dtype=np.int8)
+    activas = np.arange(len(actual))
+    signo = 1 # 1 mientras mueve quien movía al inicio
+    while len(activas):
+        celda = jugadas_posibles(mascara) & COLUMNAS_BITS[politica(actual, mascara, rng)]
+        actual = actual | celda
+        mascara = mascara | celda
+        gano = hay_cuatro_en_linea_lote(actual)
+        resultado[activas[gano]] = signo
+        sigue = ~gano & (mascara != MASCARA_TABLERO)
+        activas = activas[sigue]
+        actual = (actual ^ mascara)[sigue]
+        mascara = mascara[sigue]
+        signo = -signo
+    return resultado
+
+
+def simular(cantidad, politica_x=politica_aleatoria, politica_o=politica_aleatoria, semilla=0,
+            tamano_lote=TAMANO_LOTE, alternar=True, historial=False):
+    """Igual que simular_lote, en lotes de a lo más tamano_lote partidas (reproducible con semilla)."""
+    rng = np.random.default_rng(semilla)
+    resultados = [simular_lote(min(tamano_lote, cantidad - inicio), politica_x, politica_o, rng, alternar, historial)
+                  for inicio in range(0, cantidad, tamano_lote)]
+    return ResultadoLote.concatenar(resultados)
+
+
+if __name__ == "__main__":
+    N_PARTIDAS = 1_000_000
+    for nombre_x, nombre_o in (("aleatoria", "aleatoria"), ("tactica", "aleatoria"), ("tactica", "tactica")):
+        inicio = time.perf_counter()
+        resultado = simular(N_PARTIDAS, POLITICAS[nombre_x], POLITICAS[nombre_o])
+        segundos = time.perf_counter() - inicio
+        resumen = resultado.resumen()
+        print(f"X {nombre_x} vs O {nombre_o}: {N_PARTIDAS:,} partidas en {segundos:.2f} s "
+              f"({N_PARTIDAS / segundos:,.0f} partidas/s)")
+        print(f"  X: {resumen['victorias_x'] / N_PARTIDAS:.1%} | O: {resumen['victorias_o'] / N_PARTIDAS:.1%} | "
+              f"Empates: {resumen['empates'] / N_PARTIDAS:.1%} | Gana quien empieza: "
+              f"{resumen['victorias_primero'] / N_PARTIDAS:.1%} | Jugadas promedio: {resumen['jugadas_media']:.1f}")
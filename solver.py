@@ -0,0 +1,259 @@
+import random
+import time
+
+from back_end import TiempoAgotado, PUNTAJE_VICTORIA
+from geometria import FILAS, COLUMNAS, MASCARA_COLUMNA, columna_de, espejar, celdas_ganadoras, jugadas_posibles
+from transposicion import TablaTransposicion, BYTES_TT_POR_DEFECTO, INFERIOR, SUPERIOR
+
+CASILLAS = FILAS * COLUMNAS
+
+# Presupuesto por jugada cuando el jugador no tiene uno propio (después se
+# recurre a la búsqueda heurística)
+TIEMPO_SOLVER_POR_DEFECTO_MS = 2000
+
+# Las claves de posición son poco aleatorias en sus bits bajos: se mezclan
+# multiplicando por una constante impar (biyección módulo 2**64)
+MEZCLA_CLAVE = 0x9E3779B97F4A7C15
+MASCARA_64 = (1 << 64) - 1
+
+ORDEN_COLUMNAS = sorted(range(COLUMNAS), key=lambda col: abs(col - COLUMNAS // 2))
+
+
+def puntaje_minimax(puntaje):
+    """
+    Convierte un puntaje exacto (positivo: gana quien mueve, mayor mientras
+    antes gane) a la escala de minimax, donde las victorias valen PUNTAJE_VICTORIA + algo.
+    """
+    if puntaje > 0:
+        return PUNTAJE_VICTORIA + puntaje
+    if puntaje < 0:
+        return -PUNTAJE_VICTORIA + puntaje
+    return 0
+
+
+class Solucionador:
+    """
+    Resuelve posiciones de forma exacta con negamax alpha-beta sobre dos
+    bitboards (fichas del jugador que mueve y todas las fichas).
+
+    El puntaje de una posición es 0 si es empate, y si no (casillas libres
+    al ganar + 1) / 2, positivo si gana quien mueve. Se encuentra con
+    búsquedas de ventana nula que van acotando el valor (estilo MTD), que
+    comparten una tabla de transposición indexada por la posición o su
+    reflejo. Antes de expandir un nodo se descartan las jugadas perdedoras:
+    si el rival amenaza ganar solo se puede tapar y nunca se juega debajo
+    de una amenaza suya.
+    """
+    def __init__(self, bytes_tt=BYTES_TT_POR_DEFECTO, tt=None):
+        # Los valores exactos no dependen de la profundidad: la TT sirve entre jugadas y partidas.
+        # tt: una tabla ya creada para compartir (la del Jugador solver); sus claves no se
+        # cruzan con las Zobrist de minimax
+        self.tt = tt if tt is not None else TablaTransposicion(bytes_tt)
+        self.nodos = 0
+        self._limite = None
+        self._detener = None # Evento que corta la búsqueda (ver mejor_jugada)
+
+    def _negamax(self, actual, mascara, movimientos, alpha, beta):
+        """
+        Valor de la posición dentro de la ventana (alpha, beta). Supone que
+        quien mueve no puede ganar en esta jugada.
+        """
+        self.nodos += 1
+        if not self.nodos & 4095 and \
+                ((self._limite is not None and time.perf_counter() > self._limite) or
+                 (self._detener is not None and self._detener.is_set())):
+            raise TiempoAgotado()
+
+        posibles = jugadas_posibles(mascara)
+        amenazas_rival = celdas_ganadoras(actual ^ mascara, mascara)
+        forzadas = posibles & amenazas_rival
+        if forzadas:
+            if forzadas & (forzadas - 1):
+                # Dos amenazas inmediatas del rival: se pierde en la próxima jugada
+                return -((CASILLAS - movimientos) // 2)
+            posibles = forzadas
+        # Jugar debajo de una amenaza del rival le deja la casilla ganadora
+        jugadas = posibles & ~(amenazas_rival >> 1)
+        if not jugadas:
+            return -((CASILLAS - movimientos) // 2)
+        if movimientos >= CASILLAS - 2:
+            return 0
+
+        # Cotas por la cantidad de casillas libres
+        minimo = -((CASILLAS - 2 - movimientos) // 2)
+        if alpha < minimo:
+            alpha = minimo
+            if alpha >= beta:
+                return alpha
+        maximo = (CASILLAS - 1 - movimientos) // 2
+
+        # Una posición y su reflejo valen lo mismo: se guardan con la menor de las claves
+        clave = actual + mascara
+        clave_espejo = espejar(actual) + espejar(mascara)
+        simetrica = clave == clave_espejo
+        clave = ((clave if clave < clave_espejo else clave_espejo) * MEZCLA_CLAVE) & MASCARA_64
+
+        entrada = self.tt.buscar(clave)
+        if entrada is not None:
+            valor_tt, bandera_tt = entrada[1], entrada[2]
+            if bandera_tt == INFERIOR:
+                if alpha < valor_tt:
+                    alpha = valor_tt
+                    if alpha >= beta:
+                        return alpha
+            elif valor_tt < maximo:
+                maximo = valor_tt
+        if beta > maximo:
+            beta = maximo
+            if alpha >= beta:
+                return beta
+
+        for jugada in self._ordenar(actual, mascara, jugadas, simetrica):
+            # El rival pasa a ser quien mueve
+            valor = -self._negamax(actual ^ mascara, mascara | jugada, movimientos + 1, -beta, -alpha)
+            if valor >= beta:
+                self.tt.guardar(clave, 0, valor, INFERIOR, None, movimientos)
+                return valor
+            if valor > alpha:
+                alpha = valor
+        self.tt.guardar(clave, 0, alpha, SUPERIOR, None, movimientos)
+        return alpha
+
+    def _ordenar(self, actual, mascara, jugadas, simetrica=False):
+        """
+        Jugadas (como bitboards) ordenadas por cuántas amenazas propias dejan
+        y, a igualdad, del centro hacia afuera. En una posición simétrica
+        basta con la mitad del tablero.
+        """
+        puntuadas = []
+        for col in ORDEN_COLUMNAS:
+            if simetrica and col > COLUMNAS // 2:
+                continue
+            jugada = jugadas & MASCARA_COLUMNA[col]
+            if jugada:
+                puntuadas.append((celdas_ganadoras(actual | jugada, mascara).bit_count(), jugada))
+        puntuadas.sort(key=lambda p: -p[0])
+        return [jugada for _, jugada in puntuadas]
+
+    def _resolver(self, actual, mascara, movimientos):
+        """Puntaje exacto de la posición, acotado con búsquedas de ventana nula."""
+        if celdas_ganadoras(actual, mascara) & jugadas_posibles(mascara):
+            return (CASILLAS + 1 - movimientos) // 2
+        minimo = -((CASILLAS - movimientos) // 2)
+        maximo = (CASILLAS + 1 - movimientos) // 2
+        while minimo < maximo:
+            # Se prueba primero cerca de 0 (empate) y de victorias o derrotas tempranas
+            medio = minimo + (maximo - minimo) // 2
+            if medio <= 0 and int(minimo / 2) < medio:
+                medio = int(minimo / 2)
+            elif medio >= 0 and int(maximo / 2) > medio:
+                medio = int(maximo / 2)
+            valor = self._negamax(actual, mascara, movimientos, medio, medio + 1)
+            if valor <= medio:
+                maximo = valor
+            else:
+                minimo = valor
+        return minimo
+
+    def _posicion(self, tablero, ficha):
+        bits = tablero.bitboards()
+        actual = bits.get(ficha, 0)
+        mascara = actual | bits.get("O" if ficha == "X" else "X", 0)
+        return actual, mascara, tablero.movimientos
+
+    def _con_limite(self, tiempo_ms, detener, funcion, *args):
+        self._limite = time.perf_counter() + tiempo_ms / 1000 if tiempo_ms is not None else None
+        self._detener = detener
+        try:
+            return funcion(*args)
+        finally:
+            self._limite = None
+            self._detener = None
+
+    def resolver(self, tablero, ficha, tiempo_ms=None, detener=None):
+        """Puntaje exacto de la posición para ficha, que es quien mueve. Lanza TiempoAgotado."""
+        return self._con_limite(tiempo_ms, detener, self._resolver, *self._posicion(tablero, ficha))
+
+    def mejor_jugada(self, tablero, ficha, tiempo_ms=None, detener=None):
+        """
+        Devuelve (columna, puntaje exacto) de una jugada óptima para ficha.
+        Lanza TiempoAgotado si se acaba tiempo_ms o se activa el evento detener.
+        """
+        return self._con_limite(tiempo_ms, detener, self._mejor_jugada, *self._posicion(tablero, ficha))
+
+    def _mejor_jugada(self, actual, mascara, movimientos):
+        posibles = jugadas_posibles(mascara)
+        ganadoras = celdas_ganadoras(actual, mascara) & posibles
+        if ganadoras:
+            return columna_de(ganadoras & -ganadoras), (CASILLAS + 1 - movimientos) // 2
+
+        puntaje = self._resolver(actual, mascara, movimientos)
+        amenazas_rival = celdas_ganadoras(actual ^ mascara, mascara)
+        forzadas = posibles & amenazas_rival
+        jugadas = (forzadas or posibles) & ~(amenazas_rival >> 1)
+        if forzadas & (forzadas - 1) or not jugadas:
+            # Derrota inmediata inevitable: al menos se tapa una amenaza
+            restantes = forzadas or posibles
+            return columna_de(self._ordenar(actual, mascara, restantes)[0]), puntaje
+
+        # Con la TT ya cargada, la primera jugada que alcanza el puntaje es óptima
+        candidatas = self._ordenar(actual, mascara, jugadas)
+        for jugada in candidatas[:-1]:
+            if self._negamax(actual ^ mascara, mascara | jugada, movimientos + 1, -puntaje, -puntaje + 1) <= -puntaje:
+                return columna_de(jugada), puntaje
+        return columna_de(candidatas[-1]), puntaje
+
+    def puntajes_columnas(self, tablero, ficha, tiempo_ms=None):
+        """Puntaje exacto de cada columna para ficha (None si la columna está llena). Lanza TiempoAgotado."""
+        return self._con_limite(tiempo_ms, None, self._puntajes_columnas, *self._posicion(tablero, ficha))
+
+    def _puntajes_columnas(self, actual, mascara, movimientos):
+        posibles = jugadas_posibles(mascara)
+        ganadoras = celdas_ganadoras(actual, mascara)
+        puntajes = [None] * COLUMNAS
+        for col in range(COLUMNAS):
+            jugada = posibles & MASCARA_COLUMNA[col]
+            if not jugada:
+                continue
+            if jugada & ganadoras:
+                puntajes[col] = (CASILLAS + 1 - movimientos) // 2
+            else:
+                puntajes[col] = -self._resolver(actual ^ mascara, mascara | jugada, movimientos + 1)
+        return puntajes
+
+
+def comparar_con_solver(profundidad=4, cantidad_posiciones=50, jugadas_aleatorias=20, semilla=0):
+    """
+    Usa el solucionador como referencia para el agente heurístico: en
+    posiciones aleatorias de mitad de partida, mide la fracción de jugadas
+    de Jugador.buscar que son óptimas.
+    """
+    from back_end import Tablero, Jugador, JUGADOR_IA, MOTOR_BITBOARD
+
+    rng = random.Random(semilla)
+    solucionador = Solucionador()
+    optimas = evaluadas = 0
+    while evaluadas < cantidad_posiciones:
+        tablero = Tablero(MOTOR_BITBOARD)
+        ficha = "X"
+        for _ in range(jugadas_aleatorias):
+            tablero.insertar_ficha(rng.choice(tablero.obtener_columnas_validas()), ficha)
+            ficha = "O" if ficha == "X" else "X"
+            if tablero.ganador is not None:
+                break
+        if tablero.ganador is not None or tablero.esta_lleno():
+            continue
+
+        puntajes = solucionador.puntajes_columnas(tablero, ficha)
+        mejor = max(p for p in puntajes if p is not None)
+        columna = Jugador(JUGADOR_IA, ficha, profundidad=profundidad).buscar(tablero).columna
+        optimas += puntajes[columna] == mejor
+        evaluadas += 1
+
+    print(f"Jugadas óptimas de la IA (profundidad {profundidad}): {optimas}/{evaluadas} "
+          f"({100 * optimas / evaluadas:.1f}%), {solucionador.nodos} nodos del solver")
+    return optimas / evaluadas
+
+
+if __name__ == "__main__":
+    comparar_con_solver()
@@ -0,0 +1,6 @@
+from evaluador import verificar_paridad
+
+
+def test_paridad_incremental():
+    # Incremental, vectorizada y por bitboards contra la heurística original
+    assert verificar_paridad(cantidad_posiciones=500, semilla=0) == 500
@@ -0,0 +1,52 @@
+from unittest import mock
+
+import gui
+from back_end import Tablero, Jugador, JUGADOR_HUMANO, JUGADOR_IA, MOTOR_BITBOARD
+from reportes import REPORTERO_NULO
+
+
+def gui_sin_ventana(jugador1, jugador2, tablero):
+    """Un Connect4GUI con jugadores y tablero reales y los widgets reemplazados (no hace falta pantalla)."""
+    interfaz = gui.Connect4GUI.__new__(gui.Connect4GUI)
+    interfaz.jugador1 = jugador1
+    interfaz.jugador2 = jugador2
+    interfaz.tablero = tablero
+    interfaz.motor = tablero.motor
+    interfaz.turno_actual = jugador1
+    interfaz.game_over = False
+    interfaz.registro = None
+    interfaz.dibujar_tablero = mock.Mock()
+    interfaz.info_label = mock.Mock()
+    return interfaz
+
+
+def test_ganar_con_el_rival_ponderando_corta_la_ponderacion():
+    humano = Jugador(JUGADOR_HUMANO, "X", reportero=REPORTERO_NULO)
+    ia = Jugador(JUGADOR_IA, "O", ponderacion=True, bytes_tt=1 << 16, reportero=REPORTERO_NULO)
+    tablero = Tablero(MOTOR_BITBOARD)
+    # X tiene tres en la fila de abajo; O tiene tres fichas encima
+    for col, ficha in ((0, "X"), (0, "O"), (1, "X"), (1, "O"), (2, "X"), (2, "O")):
+        tablero.insertar_ficha(col, ficha)
+    interfaz = gui_sin_ventana(humano, ia, tablero)
+
+    # Lo que hace la GUI al pasar el turno al humano: la IA pondera sin límite de tiempo
+    ia.ponderar(tablero)
+    assert ia._hilo_ponderacion is not None and ia._hilo_ponderacion.is_alive()
+
+    with mock.patch.object(gui.messagebox, "showinfo"):
+        interfaz.ejecutar_jugada(3)
+
+    assert interfaz.game_over
+    assert tablero.ganador == "X"
+    assert ia._hilo_ponderacion is None
+
+
+def test_el_menu_registra_jugadas_solo_si_se_pide(tmp_path):
+    menu = gui.MainMenu.__new__(gui.MainMenu)
+    menu.ruta_registro = str(tmp_path / "jugadas.csv")
+    menu.registrar = mock.Mock(get=lambda: False)
+    assert menu.crear_registro() is None
+
+    menu.registrar = mock.Mock(get=lambda: True)
+    registro = menu.crear_registro()
+    assert registro is not None and registro.ruta == menu.ruta_registro
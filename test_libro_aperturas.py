@@ -0,0 +1,49 @@
+import random
+
+from back_end import Tablero, MOTOR_BITBOARD, COLUMNAS, PUNTAJE_VICTORIA
+from libro_aperturas import (LibroAperturas, generar_libro, clave_canonica, empacar_puntaje, desempacar_puntaje,
+                             _posiciones_hasta)
+
+
+def tablero_con(jugadas):
+    tablero = Tablero(MOTOR_BITBOARD)
+    for i, col in enumerate(jugadas):
+        tablero.insertar_ficha(col, "X" if i % 2 == 0 else "O")
+    return tablero
+
+
+def test_una_posicion_y_su_reflejo_tienen_la_misma_clave():
+    rng = random.Random(0)
+    for _ in range(200):
+        jugadas = [rng.randrange(COLUMNAS) for _ in range(rng.randrange(8))]
+        tablero, reflejo = tablero_con(jugadas), tablero_con([COLUMNAS - 1 - col for col in jugadas])
+        clave, espejada = clave_canonica(tablero.bits["X"], tablero.bits["O"])
+        clave_reflejo, espejada_reflejo = clave_canonica(reflejo.bits["X"], reflejo.bits["O"])
+        assert clave == clave_reflejo
+        if tablero.bits != reflejo.bits:
+            assert espejada != espejada_reflejo
+
+
+def test_el_libro_refleja_la_jugada_de_la_posicion_espejada(tmp_path):
+    ruta = str(tmp_path / "libro.bin")
+    generar_libro(ruta, plies=3, profundidad=4, trabajadores=1)
+    libro = LibroAperturas(ruta)
+    try:
+        for jugadas in _posiciones_hasta(3):
+            tablero = tablero_con(jugadas)
+            reflejo = tablero_con([COLUMNAS - 1 - col for col in jugadas])
+            ficha = "X" if len(jugadas) % 2 == 0 else "O"
+            columna, puntaje = libro.buscar(tablero, ficha)
+            assert tablero.es_columna_valida(columna)
+            if reflejo.bits != tablero.bits: # Una posición simétrica es su propio reflejo
+                assert libro.buscar(reflejo, ficha) == (COLUMNAS - 1 - columna, puntaje)
+        assert libro.buscar(tablero_con([3, 3, 3]), "O") is None # Fuera de los plies del libro
+    finally:
+        libro.cerrar()
+
+
+def test_los_puntajes_de_victoria_conservan_la_distancia():
+    for puntaje in (0, 17, -250, PUNTAJE_VICTORIA + 5, PUNTAJE_VICTORIA + 30, -PUNTAJE_VICTORIA - 3):
+        empacado = empacar_puntaje(puntaje)
+        assert -2**31 <= empacado < 2**31
+        assert desempacar_puntaje(empacado) == puntaje
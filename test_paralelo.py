@@ -0,0 +1,49 @@
+import threading
+import time
+
+import pytest
+
+from back_end import Tablero, Jugador, JUGADOR_IA, PARALELO_RAIZ, PARALELO_SMP
+from reportes import REPORTERO_NULO
+
+
+def tablero_de(columnas):
+    tablero = Tablero()
+    for col in columnas:
+        tablero.insertar_ficha(col, "X" if tablero.movimientos % 2 == 0 else "O")
+    return tablero
+
+
+@pytest.fixture
+def cerrar():
+    jugadores = []
+    yield jugadores.append
+    for jugador in jugadores:
+        jugador._paralelo.cerrar()
+
+
+@pytest.mark.parametrize("analisis_amenazas", [False, True])
+def test_raiz_paralela_usa_la_configuracion_del_jugador(cerrar, analisis_amenazas):
+    tablero = tablero_de([3, 3, 2, 4])
+    secuencial = Jugador(JUGADOR_IA, "X", profundidad=6, reportero=REPORTERO_NULO,
+                         analisis_amenazas=analisis_amenazas).buscar(tablero)
+    jugador = Jugador(JUGADOR_IA, "X", profundidad=6, reportero=REPORTERO_NULO, trabajadores=2,
+                      analisis_amenazas=analisis_amenazas, instrumentar=True)
+    cerrar(jugador)
+    paralelo = jugador.buscar_paralelo(tablero)
+    assert (paralelo.columna, paralelo.puntaje) == (secuencial.columna, secuencial.puntaje)
+    assert paralelo.estadisticas is not None and paralelo.estadisticas.tt_consultas > 0
+
+
+@pytest.mark.parametrize("modo", [PARALELO_RAIZ, PARALELO_SMP])
+def test_detener_corta_a_los_trabajadores(cerrar, modo):
+    tablero = tablero_de([3])
+    jugador = Jugador(JUGADOR_IA, "X", profundidad=42, reportero=REPORTERO_NULO, trabajadores=2,
+                      modo_paralelo=modo)
+    cerrar(jugador)
+    detener = threading.Event()
+    threading.Timer(0.3, detener.set).start()
+    inicio = time.perf_counter()
+    resultado = jugador.buscar_paralelo(tablero, detener=detener)
+    assert time.perf_counter() - inicio < 2
+    assert resultado.columna in tablero.obtener_columnas_validas()
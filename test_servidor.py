@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from back_end import JUGADOR_RANDOM
+from servidor import ServidorConnect4, ErrorPedido
+
+
+async def con_servidor(prueba, **opciones):
+    servidor = ServidorConnect4(1, bytes_tt=1 << 16, **opciones)
+    servidor.iniciar()
+    try:
+        return await prueba(servidor)
+    finally:
+        servidor.cerrar()
+
+
+def test_rechaza_booleanos_como_numeros():
+    async def prueba(servidor):
+        for pedido in ({"op": "nueva", "profundidad": True}, {"op": "nueva", "tiempo_ms": True}):
+            with pytest.raises(ErrorPedido):
+                await servidor.procesar(pedido)
+        estado = await servidor.procesar({"op": "nueva", "rival": JUGADOR_RANDOM})
+        with pytest.raises(ErrorPedido):
+            await servidor.procesar({"op": "jugar", "partida": estado["partida"], "columna": True})
+
+    asyncio.run(con_servidor(prueba))
+
+
+def test_jugada_cancelada_se_deshace():
+    async def prueba(servidor):
+        estado = await servidor.procesar({"op": "nueva", "profundidad": 8})
+        tarea = asyncio.create_task(servidor.procesar({"op": "jugar", "partida": estado["partida"], "columna": 3}))
+        await asyncio.sleep(0.05)
+        tarea.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await tarea
+        sesion = servidor.sesiones[estado["partida"]]
+        assert not sesion.jugadas and sesion.tablero.movimientos == 0
+        assert not sesion.ocupada and servidor.pendientes == 0
+
+    asyncio.run(con_servidor(prueba))
+
+
+def test_nuevas_concurrentes_respetan_el_maximo_de_sesiones():
+    async def prueba(servidor):
+        pedidos = [servidor.procesar({"op": "nueva", "ficha": "O", "profundidad": 2}) for _ in range(4)]
+        resultados = await asyncio.gather(*pedidos, return_exceptions=True)
+        assert sum(not isinstance(r, Exception) for r in resultados) == 2
+        assert len(servidor.sesiones) == 2
+
+    asyncio.run(con_servidor(prueba, max_sesiones=2))
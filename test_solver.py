@@ -0,0 +1,104 @@
+import functools
+import random
+import threading
+
+from back_end import Tablero, Jugador, JUGADOR_SOLVER, MOTOR_BITBOARD, FILAS, COLUMNAS
+from geometria import ALTO, MASCARA_COLUMNA
+from reportes import REPORTERO_NULO
+from solver import Solucionador
+
+CASILLAS = FILAS * COLUMNAS
+
+
+def rival(ficha):
+    return "O" if ficha == "X" else "X"
+
+
+def puntaje_fuerza_bruta(tablero, ficha):
+    """Negamax sin podas ni heurísticas, con la misma escala de puntajes que el solver."""
+    @functools.lru_cache(maxsize=None)
+    def puntaje(bits_x, bits_o, ficha):
+        tablero_actual = Tablero(MOTOR_BITBOARD)
+        tablero_actual.bits = {"X": bits_x, "O": bits_o}
+        mascara = bits_x | bits_o
+        tablero_actual.alturas = [(mascara >> (col * ALTO) & MASCARA_COLUMNA[0]).bit_length()
+                                  for col in range(COLUMNAS)]
+        tablero_actual.movimientos = mascara.bit_count()
+        movimientos = tablero_actual.movimientos
+        if movimientos == CASILLAS:
+            return 0
+        mejor = None
+        for col in tablero_actual.obtener_columnas_validas():
+            tablero_actual.insertar_ficha(col, ficha)
+            if tablero_actual.ganador == ficha:
+                return (CASILLAS + 1 - movimientos) // 2
+            bits = tablero_actual.bits
+            valor = -puntaje(bits["X"], bits["O"], rival(ficha))
+            tablero_actual.deshacer_ficha(col)
+            mejor = valor if mejor is None else max(mejor, valor)
+        return mejor
+
+    return puntaje(tablero.bits["X"], tablero.bits["O"], ficha)
+
+
+def gana_en_una(tablero, ficha):
+    for col in tablero.obtener_columnas_validas():
+        tablero.insertar_ficha(col, ficha)
+        gana = tablero.ganador == ficha
+        tablero.deshacer_ficha(col)
+        if gana:
+            return True
+    return False
+
+
+def finales_al_azar(cantidad, casillas_libres, semilla=0):
+    """
+    Posiciones sin ganador con casillas_libres casillas vacías, y la ficha
+    que mueve. Se saltean las que se ganan en una jugada (el caso trivial).
+    """
+    rng = random.Random(semilla)
+    while cantidad:
+        tablero = Tablero(MOTOR_BITBOARD)
+        ficha = "X"
+        while tablero.ganador is None and tablero.movimientos < CASILLAS - casillas_libres:
+            tablero.insertar_ficha(rng.choice(tablero.obtener_columnas_validas()), ficha)
+            ficha = rival(ficha)
+        if tablero.ganador is None and not gana_en_una(tablero, ficha):
+            cantidad -= 1
+            yield tablero, ficha
+
+
+def test_el_solver_coincide_con_la_fuerza_bruta():
+    solucionador = Solucionador(1 << 16)
+    for tablero, ficha in finales_al_azar(30, casillas_libres=12):
+        esperado = puntaje_fuerza_bruta(tablero, ficha)
+        assert solucionador.resolver(tablero, ficha) == esperado
+        columna, puntaje = solucionador.mejor_jugada(tablero, ficha)
+        assert puntaje == esperado
+        # La jugada elegida alcanza ese puntaje
+        puntajes = solucionador.puntajes_columnas(tablero, ficha)
+        assert puntajes[columna] == esperado == max(p for p in puntajes if p is not None)
+
+
+def test_victoria_inmediata():
+    tablero = Tablero(MOTOR_BITBOARD)
+    for col, ficha in ((0, "X"), (0, "O"), (1, "X"), (1, "O"), (2, "X"), (2, "O")):
+        tablero.insertar_ficha(col, ficha)
+    columna, puntaje = Solucionador(1 << 16).mejor_jugada(tablero, "X")
+    assert columna == 3
+    assert puntaje == (CASILLAS + 1 - tablero.movimientos) // 2
+
+
+def test_el_jugador_solver_marca_si_el_puntaje_es_exacto():
+    tablero, ficha = next(finales_al_azar(1, casillas_libres=12, semilla=5))
+    jugador = Jugador(JUGADOR_SOLVER, ficha, bytes_tt=1 << 16, reportero=REPORTERO_NULO)
+    jugador.elegir_columna(tablero)
+    assert jugador.ultima_busqueda.exacto
+    assert jugador._solucionador.tt is jugador.tt # Una sola tabla por jugador
+
+    # Cortado antes de resolver: recurre a la búsqueda heurística y lo dice
+    detener = threading.Event()
+    detener.set()
+    columna = jugador.elegir_columna(Tablero(MOTOR_BITBOARD), detener=detener)
+    assert 0 <= columna < COLUMNAS
+    assert not jugador.ultima_busqueda.exacto
@@ -0,0 +1,87 @@
+import random
+
+from back_end import Tablero, Jugador, JUGADOR_IA, MOTOR_ARREGLO, MOTOR_BITBOARD
+from reportes import REPORTERO_NULO
+
+
+def partidas_al_azar(cantidad, semilla=0):
+    """Listas de jugadas (X empieza) hasta que alguien gana o se llena el tablero."""
+    rng = random.Random(semilla)
+    for _ in range(cantidad):
+        tablero = Tablero(MOTOR_BITBOARD)
+        jugadas = []
+        ficha = "X"
+        while tablero.ganador is None and not tablero.esta_lleno():
+            col = rng.choice(tablero.obtener_columnas_validas())
+            tablero.insertar_ficha(col, ficha)
+            jugadas.append(col)
+            ficha = "O" if ficha == "X" else "X"
+        yield jugadas
+
+
+def test_bitboard_coincide_con_arreglo():
+    for jugadas in partidas_al_azar(200):
+        arreglo, bitboard = Tablero(MOTOR_ARREGLO), Tablero(MOTOR_BITBOARD)
+        ficha = "X"
+        for col in jugadas:
+            assert arreglo.insertar_ficha(col, ficha) == bitboard.insertar_ficha(col, ficha)
+            assert (arreglo.grid == bitboard.grid).all()
+            assert arreglo.bitboards() == bitboard.bitboards()
+            assert arreglo.hash == bitboard.hash
+            assert arreglo.ganador == bitboard.ganador
+            assert arreglo.esta_lleno() == bitboard.esta_lleno()
+            assert arreglo.obtener_columnas_validas() == bitboard.obtener_columnas_validas()
+            ficha = "O" if ficha == "X" else "X"
+
+
+def test_busqueda_igual_con_ambos_motores():
+    for jugadas in partidas_al_azar(10, semilla=1):
+        jugadas = jugadas[:len(jugadas) // 2]
+        ficha = "X" if len(jugadas) % 2 == 0 else "O"
+        resultados = []
+        for motor in (MOTOR_ARREGLO, MOTOR_BITBOARD):
+            tablero = Tablero(motor)
+            for i, col in enumerate(jugadas):
+                tablero.insertar_ficha(col, "X" if i % 2 == 0 else "O")
+            jugador = Jugador(JUGADOR_IA, ficha, profundidad=4, bytes_tt=1 << 16, reportero=REPORTERO_NULO)
+            resultado = jugador.buscar(tablero)
+            resultados.append((resultado.columna, resultado.puntaje))
+        assert resultados[0] == resultados[1]
+
+
+
+def estado(tablero):
+    """Todo lo que insertar_ficha toca, como valores comparables."""
+    conteo = tablero.conteo
+    return (tablero.grid.tolist(), tablero.hash, tablero.movimientos, tablero.ganador,
+            tablero.obtener_columnas_validas(),
+            None if conteo is None else (repr(conteo.conteos), repr(conteo.puntaje), repr(conteo.centro)))
+
+
+def test_deshacer_restaura_el_estado():
+    for motor in (MOTOR_ARREGLO, MOTOR_BITBOARD):
+        for jugadas in partidas_al_azar(50, semilla=2):
+            tablero = Tablero(motor)
+            tablero.activar_conteo()
+            antes = []
+            ficha = "X"
+            for col in jugadas:
+                antes.append(estado(tablero))
+                tablero.insertar_ficha(col, ficha)
+                ficha = "O" if ficha == "X" else "X"
+            for col in reversed(jugadas):
+                tablero.deshacer_ficha(col)
+                assert estado(tablero) == antes.pop()
+
+
+def test_minimax_deja_el_tablero_como_estaba():
+    for motor in (MOTOR_ARREGLO, MOTOR_BITBOARD):
+        for jugadas in partidas_al_azar(5, semilla=3):
+            tablero = Tablero(motor)
+            for i, col in enumerate(jugadas[:len(jugadas) // 2]):
+                tablero.insertar_ficha(col, "X" if i % 2 == 0 else "O")
+            tablero.activar_conteo()
+            antes = estado(tablero)
+            jugador = Jugador(JUGADOR_IA, "X", bytes_tt=1 << 16, reportero=REPORTERO_NULO)
+            jugador.minimax(tablero, 4, float("-inf"), float("inf"), True)
+            assert estado(tablero) == antes
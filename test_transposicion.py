@@ -0,0 +1,91 @@
+import glob
+import random
+
+from transposicion import (TablaTransposicion, TablaTransposicionPersistente, empacar_entrada, desempacar_entrada,
+                           compactar_cache, _leer_entradas, EXACTA, INFERIOR, SUPERIOR, PUNTAJE_VICTORIA,
+                           FIRMA_DELTA)
+
+
+def test_empacar_y_desempacar_son_inversos():
+    rng = random.Random(0)
+    valores = [0, 1, -1, 123456, -987654, PUNTAJE_VICTORIA, PUNTAJE_VICTORIA + 41, -PUNTAJE_VICTORIA - 17]
+    for valor in valores:
+        for jugada in (None, 0, 3, 6):
+            for bandera in (EXACTA, INFERIOR, SUPERIOR):
+                profundidad = rng.randrange(64)
+                datos = empacar_entrada(profundidad, valor, bandera, jugada, fichas=rng.randrange(43),
+                                        generacion=rng.randrange(32))
+                assert 0 < datos < 1 << 64
+                assert desempacar_entrada(datos) == (profundidad, valor, bandera, jugada)
+
+
+def test_buscar_verifica_la_clave_completa():
+    tabla = TablaTransposicion(1 << 12)
+    clave = 0x123456789ABCDEF0
+    tabla.guardar(clave, 5, 42, EXACTA, 3)
+    assert tabla.buscar(clave) == (5, 42, EXACTA, 3)
+    # Misma cubeta, otra clave: la verificación con clave ^ datos la rechaza
+    assert tabla.buscar(clave ^ (1 << 60)) is None
+
+
+def test_entrada_a_medio_escribir_se_lee_como_fallo():
+    tabla = TablaTransposicion(1 << 12)
+    clave = 0x0FEDCBA987654321
+    tabla.guardar(clave, 5, 42, EXACTA, 3)
+    i = (clave & tabla.mascara) * 4
+    # Otro escritor cambió los datos pero todavía no la palabra de verificación
+    tabla._datos[i + 1] = empacar_entrada(7, -8, INFERIOR, 1)
+    assert tabla.buscar(clave) is None
+
+
+def test_la_profunda_se_conserva_y_la_otra_baja_de_nivel():
+    tabla = TablaTransposicion(1 << 12)
+    cubeta = tabla.mascara + 1
+    profunda, superficial = 5, 5 + cubeta # Misma cubeta
+    tabla.guardar(profunda, 10, 1, EXACTA, 0)
+    tabla.guardar(superficial, 2, 2, EXACTA, 1)
+    assert tabla.buscar(profunda) == (10, 1, EXACTA, 0)
+    assert tabla.buscar(superficial) == (2, 2, EXACTA, 1)
+
+
+def test_volcar_y_compactar_conservan_lo_mas_profundo(tmp_path):
+    ruta = str(tmp_path / "tt.cache")
+    tabla = TablaTransposicionPersistente(ruta, 1 << 12)
+    tabla.guardar(1, 3, 10, EXACTA, 2)
+    tabla.guardar(2, 4, 20, EXACTA, 3)
+    assert tabla.volcar() is not None
+    assert tabla.volcar() is None # Nada nuevo desde el volcado anterior
+    tabla.guardar(1, 6, 11, EXACTA, 4) # Más profunda: reemplaza a la del primer delta
+    tabla.guardar(3, 2, 30, SUPERIOR, None)
+    ruta_delta = tabla.volcar()
+    assert len(_leer_entradas(ruta_delta, FIRMA_DELTA)) == 2
+    tabla.cerrar()
+
+    otra = TablaTransposicionPersistente(ruta, 1 << 12)
+    otra.guardar(2, 1, 99, EXACTA, 0) # Menos profunda que la del primer delta
+    otra.volcar()
+    otra.cerrar()
+
+    assert compactar_cache(ruta, 1 << 12) == 3
+    assert not glob.glob(ruta + ".*.delta")
+    base = TablaTransposicionPersistente(ruta, 1 << 12)
+    assert base.buscar(1) == (6, 11, EXACTA, 4)
+    assert base.buscar(2) == (4, 20, EXACTA, 3)
+    assert base.buscar(3) == (2, 30, SUPERIOR, None)
+    base.cerrar()
+
+
+def test_compactar_deja_las_dos_mas_profundas_de_cada_cubeta(tmp_path):
+    ruta = str(tmp_path / "tt.cache")
+    tabla = TablaTransposicionPersistente(ruta, 1 << 12)
+    cubeta = tabla.mascara + 1
+    for i, profundidad in enumerate((2, 7, 5, 1)):
+        tabla.guardar(9 + i * cubeta, profundidad, i, EXACTA, i) # Todas en la misma cubeta
+        tabla.volcar()
+    tabla.cerrar()
+
+    compactar_cache(ruta, 1 << 12)
+    base = TablaTransposicionPersistente(ruta, 1 << 12)
+    encontradas = [base.buscar(9 + i * cubeta) for i in range(4)]
+    assert encontradas == [None, (7, 1, EXACTA, 1), (5, 2, EXACTA, 2), None]
+    base.cerrar()
@@ -0,0 +1,375 @@
+import glob
+import mmap
+import os
+import struct
+import time
+from array import array
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Tipo de cota guardada en cada entrada
+EXACTA = 0
+INFERIOR = 1 # El valor real es >= al guardado (hubo corte beta)
+SUPERIOR = 2 # El valor real es <= al guardado (ninguna jugada superó alpha)
+
+SIN_JUGADA = 7 # Columna "None" empaquetada en 3 bits
+
+# Puntaje base de una victoria (se le suma la profundidad restante)
+PUNTAJE_VICTORIA = 100000000000000
+
+# Presupuesto de memoria por defecto (8 MB)
+BYTES_TT_POR_DEFECTO = 8 * 1024 * 1024
+
+# Cada cubeta tiene 2 entradas de 2 palabras de 64 bits
+PALABRAS_POR_CUBETA = 4
+BYTES_POR_CUBETA = PALABRAS_POR_CUBETA * 8
+
+# Distribución de los bits de los datos de una entrada:
+# jugada (3) | bandera (2) | profundidad (6) | fichas (6) | generación (5) | valor (42)
+# Los puntajes de victoria (~1e14) se guardan como LIMITE_VALOR + lo que superan
+# a PUNTAJE_VICTORIA; los heurísticos son mucho menores que LIMITE_VALOR.
+BITS_GENERACION = 5
+GENERACIONES = 1 << BITS_GENERACION
+TRAMOS_PODA = 16 # podar recorre un tramo de la tabla por llamada (toda la tabla cada TRAMOS_PODA jugadas)
+DESPLAZAMIENTO_FICHAS = 11
+DESPLAZAMIENTO_GENERACION = 17
+DESPLAZAMIENTO_DATOS_VALOR = 22
+DESPLAZAMIENTO_VALOR = 1 << 41
+LIMITE_VALOR = 1 << 40
+
+# --- Caché persistente en disco ---
+# Encabezado: firma, versión y cantidad (cubetas en la base, entradas en un delta).
+# La base guarda las cubetas tal cual; un delta guarda pares (clave ^ datos, datos).
+FIRMA_CACHE = b"C4TT"
+FIRMA_DELTA = b"C4TD"
+VERSION_CACHE = 2
+ENCABEZADO_CACHE = struct.Struct("<4sB3xQ")
+
+
+def cubetas_para(bytes_maximos):
+    """Cantidad de cubetas (potencia de 2) que caben en el presupuesto de memoria."""
+    cubetas = max(1, bytes_maximos // BYTES_POR_CUBETA)
+    return 1 << (cubetas.bit_length() - 1)
+
+
+def empacar_entrada(profundidad, valor, bandera, jugada, fichas=0, generacion=0):
+    """
+    Empaqueta (profundidad, valor, bandera, jugada) en una palabra de 64 bits,
+    junto con las fichas de la posición y la generación de la búsqueda.
+    """
+    if jugada is None:
+        jugada = SIN_JUGADA
+    valor = int(valor)
+    if valor >= PUNTAJE_VICTORIA:
+        valor = LIMITE_VALOR + valor - PUNTAJE_VICTORIA
+    elif valor <= -PUNTAJE_VICTORIA:
+        valor = -LIMITE_VALOR + valor + PUNTAJE_VICTORIA
+    return (((valor + DESPLAZAMIENTO_VALOR) << DESPLAZAMIENTO_DATOS_VALOR) | (generacion << DESPLAZAMIENTO_GENERACION) |
+            (fichas << DESPLAZAMIENTO_FICHAS) | (profundidad << 5) | (bandera << 3) | jugada)
+
+
+def desempacar_entrada(datos):
+    """Inverso de empacar_entrada. Devuelve (profundidad, valor, bandera, jugada)."""
+    jugada = datos & 7
+    valor = (datos >> DESPLAZAMIENTO_DATOS_VALOR) - DESPLAZAMIENTO_VALOR
+    if valor >= LIMITE_VALOR:
+        valor += PUNTAJE_VICTORIA - LIMITE_VALOR
+    elif valor <= -LIMITE_VALOR:
+        valor -= PUNTAJE_VICTORIA - LIMITE_VALOR
+    return ((datos >> 5) & 63,
+            valor,
+            (datos >> 3) & 3,
+            None if jugada == SIN_JUGADA else jugada)
+
+
+def fichas_de(datos):
+    """Fichas en el tablero de la posición de una entrada empaquetada."""
+    return (datos >> DESPLAZAMIENTO_FICHAS) & 63
+
+
+def generacion_de(datos):
+    return (datos >> DESPLAZAMIENTO_GENERACION) & (GENERACIONES - 1)
+
+
+class TablaTransposicion:
+    """
+    Tabla de transposición de tamaño fijo indexada por clave Zobrist.
+
+    Cada cubeta tiene dos entradas (esquema de dos niveles): la primera
+    prefiere profundidad (solo se reemplaza por búsquedas iguales o más
+    profundas, o si es de una generación anterior) y la segunda se
+    reemplaza siempre. Cada entrada son dos palabras: (clave ^ datos,
+    datos), así una entrada a medio escribir nunca verifica contra la clave.
+
+    La tabla sobrevive entre jugadas de una partida: cada jugada real abre
+    una generación nueva (nueva_generacion) y descarta, de a un tramo, las
+    posiciones con menos fichas que el tablero actual, que ya no pueden
+    repetirse (podar).
+    """
+    def __init__(self, bytes_maximos=BYTES_TT_POR_DEFECTO):
+        cubetas = cubetas_para(bytes_maximos)
+        self.mascara = cubetas - 1
+        self._datos = array('Q', bytes(cubetas * BYTES_POR_CUBETA))
+        self.generacion = 0
+        self._tramo_poda = 0
+        self.reiniciar_contadores()
+
+    def reiniciar_contadores(self):
+        self.aciertos = 0
+        self.fallos = 0
+        self.colisiones = 0 # Fallos con ambas entradas ocupadas por otras claves
+        self.guardados = 0
+        self.podadas = 0 # Entradas descartadas por podar
+
+    @property
+    def bytes_usados(self):
+        return len(self._datos) * self._datos.itemsize
+
+    def limpiar(self):
+        """Vacía la tabla (en el mismo buffer, sin asignar otro) y reinicia los contadores."""
+        np.frombuffer(self._datos, dtype=np.uint64)[:] = 0
+        self.reiniciar_contadores()
+
+    def buscar(self, clave):
+        """Devuelve (profundidad, valor, bandera, jugada) o None si no está."""
+        d = self._datos
+        i = (clave & self.mascara) * PALABRAS_POR_CUBETA
+        datos = d[i + 1]
+        if datos and d[i] ^ datos == clave:
+            self.aciertos += 1
+            return desempacar_entrada(datos)
+        datos_2 = d[i + 3]
+        if datos_2 and d[i + 2] ^ datos_2 == clave:
+            self.aciertos += 1
+            return desempacar_entrada(datos_2)
+        self.fallos += 1
+        if datos and datos_2:
+            self.colisiones += 1
+        return None
+
+    def guardar(self, clave, profundidad, valor, bandera, jugada, fichas=0):
+        """
+        Guarda una entrada según la política de reemplazo de dos niveles.
+        fichas: cantidad de fichas de la posición (ver podar).
+        """
+        d = self._datos
+        i = (clave & self.mascara) * PALABRAS_POR_CUBETA
+        datos = empacar_entrada(profundidad, valor, bandera, jugada, fichas, self.generacion)
+        actual = d[i + 1]
+        self.guardados += 1
+        if not actual or d[i] ^ actual == clave or profundidad >= (actual >> 5) & 63 or \
+                (actual >> DESPLAZAMIENTO_GENERACION) & (GENERACIONES - 1) != self.generacion:
+            if actual and d[i] ^ actual != clave:
+                # La entrada desplazada baja al nivel de reemplazo siempre
+                d[i + 2] = d[i]
+                d[i + 3] = actual
+            d[i] = clave ^ datos
+            d[i + 1] = datos
+        else:
+            d[i + 2] = clave ^ datos
+            d[i + 3] = datos
+
+
+    def nueva_generacion(self):
+        """Marca el comienzo de la búsqueda de una nueva jugada real."""
+        self.generacion = (self.generacion + 1) % GENERACIONES
+
+    def podar(self, fichas_minimas):
+        """
+        Vacía las entradas de posiciones con menos de fichas_minimas fichas
+        (en una partida ya no pueden volver a aparecer). Recorre solo el
+        siguiente de TRAMOS_PODA tramos de la tabla, para no pagar la tabla
+        entera en cada jugada; mientras tanto las entradas viejas igual se
+        reemplazan por generación. Devuelve cuántas vació.
+        """
+        palabras = np.frombuffer(self._datos, dtype=np.uint64).reshape(-1, 2)
+        largo = -(-len(palabras) // TRAMOS_PODA)
+        palabras = palabras[self._tramo_poda * largo:(self._tramo_poda + 1) * largo]
+        self._tramo_poda = (self._tramo_poda + 1) % TRAMOS_PODA
+        datos = palabras[:, 1]
+        viejas = (datos != 0) & (((datos >> DESPLAZAMIENTO_FICHAS) & 63) < fichas_minimas)
+        palabras[viejas] = 0
+        podadas = int(np.count_nonzero(viejas))
+        self.podadas += podadas
+        return podadas
+
+
+class TablaTransposicionCompartida(TablaTransposicion):
+    """
+    Tabla de transposición en memoria compartida entre procesos
+    (multiprocessing.shared_memory), sin locks: cada entrada se verifica con
+    clave ^ datos, así una escritura concurrente a medias se lee como un fallo.
+
+    El proceso que la crea (nombre=None) es su dueño y la libera en cerrar();
+    los demás se conectan con el nombre y el mismo presupuesto de memoria.
+    """
+    def __init__(self, bytes_maximos=BYTES_TT_POR_DEFECTO, nombre=None):
+        cubetas = cubetas_para(bytes_maximos)
+        self.mascara = cubetas - 1
+        self._duena = nombre is None
+        if self._duena:
+            self._memoria = shared_memory.SharedMemory(create=True, size=cubetas * BYTES_POR_CUBETA)
+            self._memoria.buf[:] = bytes(cubetas * BYTES_POR_CUBETA)
+        else:
+            self._memoria = shared_memory.SharedMemory(name=nombre)
+        self.nombre = self._memoria.name
+        self._datos = self._memoria.buf[:cubetas * BYTES_POR_CUBETA].cast('Q')
+        self.generacion = 0
+        self._tramo_poda = 0
+        self.reiniciar_contadores()
+
+    def cerrar(self):
+        """Libera la memoria compartida (solo la dueña la elimina del sistema)."""
+        self._datos.release()
+        self._memoria.close()
+        if self._duena:
+            self._memoria.unlink()
+
+
+class TablaTransposicionPersistente(TablaTransposicion):
+    """
+    Tabla de transposición respaldada por un caché en disco (ruta). Las
+    escrituras van a la tabla en memoria del proceso; las búsquedas que no
+    la encuentran consultan la base del caché, mapeada en solo lectura, así
+    varios procesos pueden compartirla sin locks.
+
+    volcar() escribe las entradas propias escritas desde el volcado
+    anterior (las de las generaciones abiertas desde entonces) a un archivo
+    delta junto a la base, y compactar_cache() mezcla los deltas en una
+    base nueva.
+    """
+    def __init__(self, ruta, bytes_maximos=BYTES_TT_POR_DEFECTO):
+        super().__init__(bytes_maximos)
+        self.ruta = ruta
+        self._archivo = self._mapa = self._base = None
+        self._mascara_base = 0
+        self._generaciones_sucias = 1 # Generaciones abiertas desde el último volcado (incluida la actual)
+        if os.path.exists(ruta):
+            self._archivo = open(ruta, "rb")
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            firma, version, cubetas = ENCABEZADO_CACHE.unpack_from(self._mapa, 0)
+            if firma != FIRMA_CACHE or version != VERSION_CACHE:
+                raise ValueError(f"{ruta} no es un caché de transposición válido")
+            self._base = memoryview(self._mapa)[ENCABEZADO_CACHE.size:].cast('Q')
+            self._mascara_base = cubetas - 1
+
+    def reiniciar_contadores(self):
+        super().reiniciar_contadores()
+        self.aciertos_cache = 0 # Aciertos que vinieron de la base en disco
+
+    def buscar(self, clave):
+        entrada = super().buscar(clave)
+        if entrada is not None or self._base is None:
+            return entrada
+        d = self._base
+        i = (clave & self._mascara_base) * PALABRAS_POR_CUBETA
+        for j in (i, i + 2):
+            datos = d[j + 1]
+            if datos and d[j] ^ datos == clave:
+                # El fallo en memoria pasa a ser un acierto del caché
+                self.fallos -= 1
+                self.aciertos += 1
+                self.aciertos_cache += 1
+                return desempacar_entrada(datos)
+        return None
+
+    def nueva_generacion(self):
+        super().nueva_generacion()
+        self._generaciones_sucias = min(self._generaciones_sucias + 1, GENERACIONES)
+
+    def podar(self, fichas_minimas):
+        """No poda: las posiciones de jugadas pasadas son justo las que el caché guarda para otras partidas."""
+        return 0
+
+    def volcar(self):
+        """
+        Escribe las entradas escritas desde el volcado anterior a un delta
+        nuevo. Devuelve su ruta (None si no hay).
+        """
+        palabras = np.frombuffer(self._datos, dtype=np.uint64).reshape(-1, 2)
+        generaciones = generacion_de(palabras[:, 1]).astype(np.int64)
+        sucias = (self.generacion - generaciones) % GENERACIONES < self._generaciones_sucias
+        ocupadas = palabras[(palabras[:, 1] != 0) & sucias]
+        # Lo que se escriba desde ahora va en una generación nueva
+        super().nueva_generacion()
+        self._generaciones_sucias = 1
+        if not len(ocupadas):
+            return None
+        ruta_delta = f"{self.ruta}.{os.getpid()}-{time.time_ns()}.delta"
+        with open(ruta_delta + ".tmp", "wb") as archivo:
+            archivo.write(ENCABEZADO_CACHE.pack(FIRMA_DELTA, VERSION_CACHE, len(ocupadas)))
+            archivo.write(ocupadas.tobytes())
+        # El delta aparece completo o no aparece (compactar_cache puede correr en paralelo)
+        os.replace(ruta_delta + ".tmp", ruta_delta)
+        return ruta_delta
+
+    def cerrar(self):
+        """Libera el mapeo de la base del caché."""
+        if self._base is not None:
+            self._base.release()
+            self._mapa.close()
+            self._archivo.close()
+            self._archivo = self._mapa = self._base = None
+
+
+def _leer_entradas(ruta, firma_esperada):
+    """Pares (clave ^ datos, datos) ocupados de una base o un delta, como arreglo (n, 2)."""
+    with open(ruta, "rb") as archivo:
+        contenido = archivo.read()
+    firma, version, _ = ENCABEZADO_CACHE.unpack_from(contenido, 0)
+    if firma != firma_esperada or version != VERSION_CACHE:
+        raise ValueError(f"{ruta} no es un archivo de caché válido")
+    palabras = np.frombuffer(contenido, dtype=np.uint64, offset=ENCABEZADO_CACHE.size).reshape(-1, 2)
+    return palabras[palabras[:, 1] != 0]
+
+
+def compactar_cache(ruta, bytes_maximos=BYTES_TT_POR_DEFECTO):
+    """
+    Mezcla la base del caché con todos sus deltas en una base nueva de
+    bytes_maximos y borra los deltas. De cada posición queda la búsqueda
+    más profunda (a igualdad, la más nueva) y de cada cubeta las dos
+    posiciones más profundas, como en la tabla. La base se reemplaza de
+    forma atómica: los procesos que la tengan abierta siguen viendo la
+    anterior. Devuelve la cantidad de entradas de la base nueva.
+    """
+    deltas = sorted(glob.glob(f"{glob.escape(ruta)}.*.delta"))
+    fuentes = [_leer_entradas(ruta, FIRMA_CACHE)] if os.path.exists(ruta) else []
+    fuentes += [_leer_entradas(delta, FIRMA_DELTA) for delta in deltas]
+    entradas = np.concatenate(fuentes) if fuentes else np.zeros((0, 2), dtype=np.uint64)
+
+    # La generación no importa en la base
+    datos = entradas[:, 1] & ~np.uint64((GENERACIONES - 1) << DESPLAZAMIENTO_GENERACION)
+    claves = entradas[:, 0] ^ entradas[:, 1]
+    profundidades = ((datos >> np.uint64(5)) & np.uint64(63)).astype(np.int64)
+    orden = np.arange(len(entradas))
+
+    # Por clave: la última del orden (clave, profundidad, orden de llegada)
+    indices = np.lexsort((orden, profundidades, claves))
+    ultimas = np.ones(len(indices), dtype=bool)
+    ultimas[:-1] = claves[indices[1:]] != claves[indices[:-1]]
+    indices = indices[ultimas]
+
+    # Por cubeta: de la más profunda (y más nueva) a la menos
+    cubetas = cubetas_para(bytes_maximos)
+    cubeta = (claves[indices] & np.uint64(cubetas - 1)).astype(np.int64)
+    por_cubeta = np.lexsort((-orden[indices], -profundidades[indices], cubeta))
+    indices, cubeta = indices[por_cubeta], cubeta[por_cubeta]
+    posiciones = np.arange(len(indices))
+    inicio_cubeta = np.ones(len(indices), dtype=bool)
+    inicio_cubeta[1:] = cubeta[1:] != cubeta[:-1]
+    nivel = posiciones - np.maximum.accumulate(np.where(inicio_cubeta, posiciones, 0))
+    quedan = nivel < 2
+
+    palabras = np.zeros(cubetas * PALABRAS_POR_CUBETA, dtype=np.uint64)
+    destino = cubeta[quedan] * PALABRAS_POR_CUBETA + nivel[quedan] * 2
+    palabras[destino] = claves[indices[quedan]] ^ datos[indices[quedan]]
+    palabras[destino + 1] = datos[indices[quedan]]
+
+    with open(ruta + ".tmp", "wb") as archivo:
+        archivo.write(ENCABEZADO_CACHE.pack(FIRMA_CACHE, VERSION_CACHE, cubetas))
+        palabras.tofile(archivo)
+    os.replace(ruta + ".tmp", ruta)
+    for delta in deltas:
+        os.remove(delta)
+    return int(np.count_nonzero(quedan))